@@ -0,0 +1,244 @@
+"""
+Module Name: autopilot.py
+
+Description:
+    Contains the autopilot, a built-in player for soak tests and attract mode. Instead of
+    simulating ahead, it solves where and when each ball and score object reaches the paddle
+    in closed form (the game integrates a constant acceleration, so positions are a sum with
+    a known formula), then picks the most urgent ball and squeezes in the most valuable score
+    objects that can still be caught on the way.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from math import ceil, sqrt
+from typing import Iterator
+
+from main import BreakoutGame, GameState
+from reward import POWERUP_TYPES
+from runtime import FrameInput, KEY_RETURN, KEY_SPACE, MOUSE_BUTTON_LEFT, PyxelRuntime
+
+                                                                # how much catching each kind of score object is worth
+REWARD_VALUES: dict[str | None, float] = {
+    None: 1.0,
+    "paddle_speed": 1.5,
+    "antigravity": 1.5,
+    "double_points": 2.0,
+    "life_up": 3.0,
+}
+
+
+# +++++++++++++++++++++++++++++++++ PREDICTION METHODS +++++++++++++++++++++++++++++++++
+
+def frames_to_reach(y: float, speed_y: float, accel: float, target_y: float, max_speed: float | None = None) -> int | None:
+    """
+    No. of updates until an object moving down with `speed_y += accel; y += speed_y` reaches target_y.
+    After n updates, y_n = y + n * speed_y + accel * n * (n + 1) / 2 (until the speed cap is reached).
+    """
+    if y >= target_y:
+        return 0
+    if accel <= 0:
+        return ceil((target_y - y) / speed_y) if speed_y > 0 else None
+
+                                                                # smallest n with accel/2 n² + (speed_y + accel/2) n + (y - target_y) >= 0
+    b = speed_y + accel / 2
+    n = max(0, ceil((-b + sqrt(b * b - 2 * accel * (y - target_y))) / accel))
+    if max_speed is None:
+        return n
+    capped_at = ceil((max_speed - speed_y) / accel)             # update on which the speed cap kicks in
+    if n <= capped_at:
+        return n
+    y_cap = y + capped_at * speed_y + accel * capped_at * (capped_at + 1) / 2
+    return capped_at + max(0, ceil((target_y - y_cap) / max_speed))
+
+def frames_to_ceiling(y: float, speed_y: float, accel: float) -> int | None:
+    """ No. of updates until an object moving up reaches y = 0 (None if it turns around first) """
+    if speed_y >= 0:
+        return None
+    if accel <= 0:
+        return ceil(y / -speed_y)
+    b = speed_y + accel / 2
+    disc = b * b - 2 * accel * y                                # y_n <= 0 has no solution if negative
+    if b >= 0 or disc < 0:
+        return None
+    return max(1, ceil((-b - sqrt(disc)) / accel))
+
+def fold(x: float, low: float, high: float) -> float:
+    """ Position after bouncing between two walls, as if the walls were mirrors """
+    span = high - low
+    if span <= 0:
+        return low
+    u = (x - low) % (2 * span)
+    return low + (u if u <= span else 2 * span - u)
+
+def predict_ball(ball, target_y: float, width: int) -> tuple[int, float] | None:
+    """ (no. of updates, x-pos of the center) when a ball's bottom reaches target_y, None if it never does """
+    if ball.out_of_bounds or (ball.speed_x == 0 and ball.speed_y == 0):
+        return None
+    y, speed_y, gravity = ball.y, ball.speed_y, ball.gravity
+    top_y = target_y - 2 * ball.r
+
+    frames = 0
+    ceiling = frames_to_ceiling(y, speed_y, gravity)
+    if ceiling is not None:                                     # bounces off the top wall first
+        frames = ceiling
+        speed_y = -min(speed_y + gravity * ceiling, 5)
+        y = 0
+    falling = frames_to_reach(y, speed_y, gravity, top_y, max_speed=5)
+    if falling is None:
+        return None
+    frames += falling
+    x = fold(ball.x + ball.speed_x * frames, 0, width - 2 * ball.r)
+    return frames, x + ball.r
+
+def _score_objects(game: BreakoutGame) -> Iterator[tuple[float, float, float, float, str | None]]:
+    """ (x, y, speed_y, accel, powerup type) of every score object, whatever the backend """
+    if isinstance(game.score_objects, list):
+        for r in game.score_objects:
+            yield r.x, r.y, r.speed_y, r.accel, r.powerup_type
+        return
+    field, n = game.score_objects, game.score_objects.count
+    for x, y, speed_y, accel, code in zip(field.x[:n].tolist(), field.y[:n].tolist(), field.speed_y[:n].tolist(),
+                                          field.accel[:n].tolist(), field.powerup[:n].tolist()):
+        yield x, y, speed_y, accel, POWERUP_TYPES[code - 1] if code else None
+
+
+class Autopilot:
+    """
+
+    Controller that plays the game on its own (same interface as the headless controllers).
+
+    Attributes:
+        launch_angle (int):                 angle the indicator has to reach before launching
+        aim_offset (float):                 fraction of the half paddle the ball is hit off-center by (steeper bounces if 0)
+        margin (float):                     slack kept when deciding if a target can still be reached (in px)
+        target_x (float | None):            paddle center chosen on the last frame (for debugging)
+
+    Methods:
+        __init__(self, launch_angle: int = 60, aim_offset: float = 0.3, margin: float = 6) -> None:
+            Initializes the autopilot.
+
+            Args:
+                launch_angle (int):         angle the indicator has to reach before launching
+                aim_offset (float):         fraction of the half paddle the ball is hit off-center by
+                margin (float):             slack kept when deciding if a target can still be reached
+
+        choose_target(self, game: BreakoutGame) -> float | None:
+            Picks where the paddle center should go (None if nothing is coming down).
+
+        __call__(self, game: BreakoutGame) -> FrameInput:
+            Decides the input of the next frame.
+
+    """
+    def __init__(self, launch_angle: int = 60, aim_offset: float = 0.3, margin: float = 6) -> None:
+        """ Constructor """
+        self.launch_angle: int = launch_angle
+        self.aim_offset: float = aim_offset
+        self.margin: float = margin
+        self.target_x: float | None = None
+
+    def choose_target(self, game: BreakoutGame) -> float | None:
+        """ Most urgent reachable ball, with a detour for the best score object that still leaves time for it """
+        paddle = game.paddle
+        center = paddle.x + paddle.w / 2
+        reach = paddle.w / 2 - self.margin                      # how far off the center a ball is still hit
+
+        balls = []                                              # (no. of updates, x-pos, falling) per ball
+        for ball in game.balls:
+            if ball.speed_y > 0:                                # exact landing of a falling ball
+                prediction = predict_ball(ball, paddle.y, game.rt.width)
+                if prediction is not None:
+                    balls.append((*prediction, True))
+            elif not ball.out_of_bounds and ball.speed_x != 0:
+                                                                # a brick may send a rising ball back down any time, so it is
+                                                                # shadowed, as urgent as if it bounced back right now
+                frames = frames_to_reach(ball.y, -ball.speed_y, ball.gravity, paddle.y - 2 * ball.r, max_speed=5)
+                if frames is not None:                          # (a level ball without gravity never comes down)
+                    balls.append((frames, ball.x + ball.r, False))
+        balls.sort()
+
+        ball_frames, ball_x, ball_falling = None, None, False
+        for frames, x, falling in balls:                        # earliest ball the paddle can get to
+            if abs(x - center) - reach <= paddle.speed * frames:
+                ball_frames, ball_x, ball_falling = frames, x, falling
+                break
+        if ball_frames is None and balls:
+            ball_frames, ball_x, ball_falling = balls[0]        # nothing reachable, tries the earliest anyway
+
+        best, best_value = None, 0.0
+        for x, y, speed_y, accel, powerup_type in _score_objects(game):
+            if y + 10 > paddle.y + paddle.h:                    # already below the paddle
+                continue
+            frames = frames_to_reach(y, speed_y, accel, paddle.y - 10)
+            if frames is None:
+                continue
+            reward_x = x + 4                                    # center of the score object
+            catch = paddle.w / 2 + 4 - self.margin              # how far off the center it is still caught
+            if abs(reward_x - center) - catch > paddle.speed * frames:
+                continue                                        # can't get there in time
+            if ball_frames is not None and abs(ball_x - reward_x) - reach > paddle.speed * (ball_frames - frames):
+                continue                                        # would miss the ball afterwards
+            value = REWARD_VALUES.get(powerup_type, 1.0) / (1 + frames / 60)   # sooner is safer
+            if value > best_value:
+                best, best_value = reward_x, value
+
+        if best is not None:
+            return best
+        if ball_x is None or not ball_falling:
+            return ball_x
+                                                                # hits the ball a bit off-center so it doesn't just go straight up
+        return ball_x - self.aim_offset * paddle.w / 2
+
+    def __call__(self, game: BreakoutGame) -> FrameInput:
+        """ Clicks through the menus, launches at the chosen angle and plays the running stage """
+        rt = game.rt
+        paddle_center = int(game.paddle.x + game.paddle.w / 2)
+        match game.current_game_state:
+            case GameState.START:                               # clicks the play button
+                return FrameInput.from_keys(rt.width // 2, rt.height // 2 + 57, [MOUSE_BUTTON_LEFT])
+            case GameState.READY:
+                if game.angle == self.launch_angle:
+                    return FrameInput.from_keys(paddle_center, 0, [KEY_SPACE])
+                return FrameInput(mouse_x=paddle_center)
+            case GameState.GAME_OVER | GameState.WIN:
+                return FrameInput.from_keys(paddle_center, 0, [KEY_RETURN])
+            case GameState.RUNNING:
+                self.target_x = self.choose_target(game)
+                if self.target_x is not None:
+                    return FrameInput(mouse_x=int(round(self.target_x)))
+        return FrameInput(mouse_x=paddle_center)
+
+
+class AutopilotRuntime(PyxelRuntime):
+    """
+
+    Pyxel runtime whose input comes from the autopilot instead of the mouse and keyboard (attract mode).
+
+    Attributes:
+        autopilot (Autopilot):              decides the input of every frame
+        game (BreakoutGame | None):         game being played (set once it is created)
+
+    Methods:
+        __init__(self, seed: int | None = None) -> None:
+            Initializes the runtime.
+
+            Args:
+                seed (int | None):          seed of the session, picked from the clock if None
+
+        begin_frame(self) -> None:
+            Asks the autopilot for the input of this update (the player's keys are ignored).
+
+    """
+    def __init__(self, seed: int | None = None) -> None:
+        """ Constructor """
+        super().__init__(seed=seed)
+        self.autopilot: Autopilot = Autopilot()
+        self.game: BreakoutGame | None = None
+
+    def begin_frame(self) -> None:
+        """ Asks the autopilot for this update's input """
+        self.poll()
+        self.pending_buttons = 0                                # the player's keys are ignored
+        if self.game is not None:
+            self.input = self.autopilot(self.game)
@@ -0,0 +1,218 @@
+"""
+Module Name: balance.py
+
+Description:
+    Contains the Monte Carlo stage balancing runner. It plays every stage of a stages file
+    with a scripted paddle, over a grid of P, G, X, Q and launch speed values, spreading the
+    seeded playthroughs across all cores, then reports per-stage clear rates, time-to-clear
+    and score distributions.
+
+    Usage:
+        python balance.py --runs 200 --X 10 15 25 --speed 2.0 2.5 3.0 --out balance.json
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import product
+from random import Random
+from statistics import fmean, quantiles
+
+from headless import STAGES_PATH, HeadlessEngine
+from main import BreakoutGame, GameState
+from runtime import FrameInput, KEY_SPACE
+
+
+@dataclass(frozen=True)
+class Params:
+    """
+
+    One point of the parameter grid.
+
+    Attributes:
+        P (int):                Points Contribution
+        G (int):                Power-Up Duration (in seconds)
+        X (int):                Power-Up Drop Chance (in %)
+        Q (int):                Streak Increment
+        speed (float):          launch speed of the ball
+
+    """
+    P: int
+    G: int
+    X: int
+    Q: int
+    speed: float
+
+@dataclass(frozen=True)
+class Trial:
+    """
+
+    A single seeded playthrough of a stage.
+
+    Attributes:
+        stage (int):            stage no. (1-indexed)
+        params (Params):        values used for the playthrough
+        seed (int):             seed of the playthrough
+        max_frames (int):       frames after which the playthrough is cut off
+        stages_path (str):      path to the stages file
+
+    """
+    stage: int
+    params: Params
+    seed: int
+    max_frames: int
+    stages_path: str
+
+
+class ScriptedPaddle:
+    """
+
+    Scripted player used for the playthroughs.
+
+    Attributes:
+        random (Random):                    randomness of the player (separate from the game's)
+        launch_angle (int):                 angle the player waits for before launching
+        aim_offset (float):                 where on the paddle the player tries to hit the ball
+
+    Methods:
+        __init__(self, seed: int) -> None:
+            Initializes the player.
+
+        __call__(self, game: BreakoutGame) -> FrameInput:
+            Decides the input of the next frame.
+
+    """
+    def __init__(self, seed: int) -> None:
+        """ Constructor """
+        self.random: Random = Random(seed)
+        self.launch_angle: int = self.random.randrange(20, 162, 2)
+        self.aim_offset: float = 0
+
+    def __call__(self, game: BreakoutGame) -> FrameInput:
+        """ Launches at a random angle, then keeps the paddle under the lowest falling ball """
+        paddle_center = int(game.paddle.x + game.paddle.w / 2)
+
+        if game.current_game_state == GameState.READY:
+            if game.angle == self.launch_angle:
+                self.launch_angle = self.random.randrange(20, 162, 2)
+                return FrameInput.from_keys(paddle_center, 0, [KEY_SPACE])
+            return FrameInput(mouse_x=paddle_center)
+
+        falling = [ball for ball in game.balls if ball.speed_y > 0]
+        if not falling:
+            self.aim_offset = self.random.uniform(-0.35, 0.35) * game.paddle.w
+            return FrameInput(mouse_x=paddle_center)
+
+        lowest = max(falling, key=lambda ball: ball.y)
+        return FrameInput(mouse_x=int(lowest.x + lowest.r + self.aim_offset))
+
+
+def run_trial(trial: Trial) -> dict:
+    """ Plays a stage until it is cleared, the game is over, or the frame limit is reached """
+    engine = HeadlessEngine(seed=trial.seed, stages_path=trial.stages_path, controller=ScriptedPaddle(trial.seed))
+    game = engine.game
+    game.profiler.enabled = False                               # timing is not needed for balancing
+    game.P, game.G, game.X, game.Q = trial.params.P, trial.params.G, trial.params.X, trial.params.Q
+    game.g = game.G * 60
+    game.launch_speed = trial.params.speed
+    engine.start_stage(trial.stage)
+
+    cleared = False
+    for frame in range(trial.max_frames):
+        engine.step()
+        if game.current_game_state in {GameState.STAGE_TRANSITION, GameState.WIN}:
+            cleared = True
+            break
+        if game.current_game_state == GameState.GAME_OVER:
+            break
+
+    stats = asdict(game.stats)
+    del stats["stage"], stats["frames"]                         # stage reached and frames played would shadow the trial's
+    return {
+        "stage": trial.stage,
+        "params": asdict(trial.params),
+        "seed": trial.seed,
+        "cleared": cleared,
+        "frames": frame + 1,
+        **stats,
+    }
+
+def _distribution(values: list[float]) -> dict[str, float] | None:
+    """ Mean and p10/p50/p90 of the values """
+    if not values:
+        return None
+    if len(values) == 1:
+        return {"mean": values[0], "p10": values[0], "p50": values[0], "p90": values[0]}
+    deciles = quantiles(values, n=10, method="inclusive")
+    return {"mean": fmean(values), "p10": deciles[0], "p50": deciles[4], "p90": deciles[8]}
+
+def summarize(results: list[dict]) -> list[dict]:
+    """ Groups the playthroughs per stage and parameter set """
+    groups: dict[tuple, list[dict]] = {}
+    for result in results:
+        key = (result["stage"], tuple(result["params"].values()))
+        groups.setdefault(key, []).append(result)
+
+    summary = []
+    for (stage, _), group in sorted(groups.items()):
+        cleared = [r for r in group if r["cleared"]]
+        summary.append({
+            "stage": stage,
+            "params": group[0]["params"],
+            "runs": len(group),
+            "clear_rate": len(cleared) / len(group),
+            "timeouts": sum(1 for r in group if not r["cleared"] and r["lives"] > 0),
+            "time_to_clear_s": _distribution([r["frames"] / 60 for r in cleared]),
+            "score": _distribution([r["score"] for r in group]),
+        })
+    return summary
+
+def build_trials(stages_path: str, grid: list[Params], runs: int, max_frames: int, base_seed: int) -> list[Trial]:
+    """ Every (stage, params, run) combination, each with its own seed """
+    stage_count = len(BreakoutGame._load_stages(stages_path)[4])   # JSON file or level pack
+    return [
+        Trial(stage=stage, params=params, seed=base_seed + i, max_frames=max_frames, stages_path=stages_path)
+        for stage in range(1, stage_count + 1)
+        for params in grid
+        for i in range(runs)
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    defaults = BreakoutGame._load_stages(STAGES_PATH)          # P, G, X, Q of the stages file
+
+    parser = argparse.ArgumentParser(description="Monte Carlo balancing of the stages.")
+    parser.add_argument("--stages", default=STAGES_PATH, help="path to the stages file (JSON or level pack)")
+    parser.add_argument("--P", type=int, nargs="+", default=[defaults[0]], help="Points Contribution values")
+    parser.add_argument("--G", type=int, nargs="+", default=[defaults[1]], help="Power-Up Duration values")
+    parser.add_argument("--X", type=int, nargs="+", default=[defaults[2]], help="Power-Up Drop Chance values")
+    parser.add_argument("--Q", type=int, nargs="+", default=[defaults[3]], help="Streak Increment values")
+    parser.add_argument("--speed", type=float, nargs="+", default=[2.5], help="launch speed values")
+    parser.add_argument("--runs", type=int, default=100, help="playthroughs per stage and parameter set")
+    parser.add_argument("--max-frames", type=int, default=60 * 60 * 5, help="frames before a playthrough is cut off")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first playthrough")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="no. of worker processes")
+    parser.add_argument("--out", help="writes the summary (and raw results) to this JSON file")
+    args = parser.parse_args()
+
+    grid = [Params(*values) for values in product(args.P, args.G, args.X, args.Q, args.speed)]
+    trials = build_trials(args.stages, grid, args.runs, args.max_frames, args.seed)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(run_trial, trials, chunksize=max(1, len(trials) // (args.workers * 8))))
+
+    summary = summarize(results)
+    for row in summary:
+        ttc = row["time_to_clear_s"]
+        print(f"stage {row['stage']} {row['params']}: clear {row['clear_rate']:.0%}, "
+              f"median clear {ttc['p50']:.1f}s" if ttc else f"stage {row['stage']} {row['params']}: clear 0%")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2)
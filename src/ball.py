@@ -8,11 +8,11 @@ Author: Josh Patiño
 Date: January 01, 2025
 """
 
-import pyxel
 from paddle import Paddle
 from brick import Brick
-from math import ceil, radians, cos, sin
-from random import choice
+from runtime import Runtime
+from trails import TRAIL_RENDERER, TrailBuffer
+from math import radians, cos, sin
 
 
 class Ball:
@@ -21,8 +21,11 @@ class Ball:
     A ball object used in the game.
 
     Attributes:
+        rt (Runtime):                           runtime providing the window size and clock
         x (float):                              ball's x-pos
         y (float):                              ball's y-pos
+        prev_x (float):                         ball's x-pos before the last update (for interpolated drawing)
+        prev_y (float):                         ball's y-pos before the last update (for interpolated drawing)
         direction_x (int):                      ball's horizontal direction
         direction_y (int):                      ball's vertical direction
         speed_x (float):                        ball's horizontal speed
@@ -31,9 +34,8 @@ class Ball:
         VELOCITY_INCREASE (float):              amount the speed of the ball increases
         MAX_SPEED (float):                      caps the speed of the ball
         r (int):                                radius of the ball
-        trail (list[tuple[float, float]]):      contains past positions of the ball
-        trail_margin (float):                   trail deviation
-        trail_length (float):                   how many positions are kept track of for the trail
+        trail (TrailBuffer):                    ring buffer of past positions of the ball
+        trail_length (int):                     how many positions are kept track of for the trail
         img (int):                              img bank of the sprite
         sprite_u (int):                         u-pos in resources
         sprite_v (int):                         v-pos in resources
@@ -43,11 +45,12 @@ class Ball:
         out_of_bounds (bool):                   tracks if ball is out of bounds
     
     Methods:
-        __init__(self, gravity: float) -> None:
+        __init__(self, gravity: float, runtime: Runtime) -> None:
             Initializes a Ball object with given gravity value.
             
             Args:
                 gravity (float):                    gravity inputted from the main module
+                runtime (Runtime):                  runtime providing the window size and clock
         
         _handle_collisions(self, obj: Paddle | Brick, contact: float, is_x: bool, is_upper: bool) -> None:
             Manages response to collision with object.
@@ -93,19 +96,25 @@ class Ball:
         _draw_trail(self) -> None:
             Draws the trail.
         
-        _draw_ball(self) -> None:
+        _draw_ball(self, alpha: float = 1.0) -> None:
             Draws the ball with its current sprite.
 
+            Args:
+                alpha (float):                      how far between the previous and current position to draw it (0-1)
+
         draw(self) -> None:
             Draws the ball with its trail.
 
             
     """
-    def __init__(self, gravity: float) -> None:
+    def __init__(self, gravity: float, runtime: Runtime) -> None:
         """ Constructor for ball """
+        self.rt: Runtime = runtime
         # position and movement
         self.x: float = 0                                   
         self.y: float = 0                                   
+        self.prev_x: float = 0
+        self.prev_y: float = 0
         self.direction_x: int = 1                           # 1 for right, -1 for left
         self.direction_y: int = -1                          # 1 for down, -1 for up
         # physics of the ball
@@ -117,9 +126,8 @@ class Ball:
         self.r: int = 4 
         
         # ball trail
-        self.trail: list[tuple[float, float]] = []          # list of past positions of ball for trail
-        self.trail_margin: float = 3                        # how far the randomized particle will be at most
         self.trail_length: int = 10
+        self.trail: TrailBuffer = TrailBuffer(self.trail_length)
 
         # appearance of ball
         self.img: int = 0 
@@ -246,19 +254,9 @@ class Ball:
                     self._handle_collisions(obj=elem, contact=contact_y, is_x=False, is_upper=True)
 
             if isinstance(elem, Brick):
-                                                            # applies health reduction logic
-                if elem.health > 0:
-                    elem.health -= 1                        # reduces health once per collision
-                    if elem.health == 0:
-                        self.destroy_brick = elem.destroy() # calls a method to tell the game to destroy the brick when health reaches 0
-                    elif elem.health > 0:                   # if brick has multiple stages
-                        match elem.brick_type:
-                            case 2:
-                                elem.current_skin = elem.skins_2[elem.health - 1]
-                            case 3:
-                                elem.current_skin = elem.skins_3[elem.health - 1]
-                            case _:
-                                pass
+                                                            # applies health reduction logic (and the brick's skin)
+                if elem.hit():
+                    self.destroy_brick = True               # tells the game to destroy the brick when health reaches 0
 
                                                             # applies speed cap and proportional increase
             curr_magnitude = (self.speed_x**2 + self.speed_y**2)**0.5
@@ -276,28 +274,26 @@ class Ball:
         if self.x <= 0:                                     # left wall
             self.x = 0
             self.speed_x = -self.speed_x
-        elif self.x + 2 * self.r >= pyxel.width:            # right wall
-            self.x = pyxel.width - 2 * self.r
+        elif self.x + 2 * self.r >= self.rt.width:            # right wall
+            self.x = self.rt.width - 2 * self.r
             self.speed_x = -self.speed_x
 
         if self.y <= 0:                                     # top wall
             self.y = 0
             self.speed_y = -self.speed_y
-        elif self.y + 2 * self.r >= pyxel.height:           # bottom (out of bounds)
-            self.y = pyxel.height - 2 * self.r
+        elif self.y + 2 * self.r >= self.rt.height:           # bottom (out of bounds)
+            self.y = self.rt.height - 2 * self.r
             self.out_of_bounds = True
     
 # +++++++++++++++++++++++++++++++++ UPDATE METHODS +++++++++++++++++++++++++++++++++
 
     def _update_trail(self) -> None:
         """ Updates the ball's trail """
-        self.trail.append((self.x, self.y))                 # stores the current position in the trail
-        if len(self.trail) > self.trail_length:
-            self.trail.pop(0)
+        self.trail.push(self.x, self.y)                     # overwrites the oldest position once full
 
     def clear_trails(self) -> None:
         """ Clears all ball trails """
-        self.trail.clear()                                  # clears the trail list
+        self.trail.clear()                                  # empties the ring buffer
             
     def _move_ball(self) -> None:
         """ Moves the ball based on its speed """
@@ -314,8 +310,8 @@ class Ball:
         """ Updates the ball's sprite every few seconds """
 
                                                             # changes the sprite every 300 frames (5 seconds)
-        if pyxel.frame_count - self.last_sprite_change >= self.sprite_change_interval:
-            self.last_sprite_change = pyxel.frame_count
+        if self.rt.frame_count - self.last_sprite_change >= self.sprite_change_interval:
+            self.last_sprite_change = self.rt.frame_count
             self._cycle_sprite()
     
     def _cycle_sprite(self) -> None:
@@ -331,6 +327,7 @@ class Ball:
 
     def update(self) -> None:
         """ Moves the ball, then check if it should bounce """
+        self.prev_x, self.prev_y = self.x, self.y           # kept for interpolated drawing
         self._update_trail()
         self._move_ball()
         self._check_bounds()
@@ -339,20 +336,19 @@ class Ball:
 # +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
 
     def _draw_trail(self) -> None:
-        """ Draws the shimmering trail effect """
-        for trail_x, trail_y in self.trail:
-            pyxel.circb(
-                x=pyxel.rndi(ceil(trail_x - self.trail_margin), ceil(trail_x + self.trail_margin)),
-                y=pyxel.rndi(int(trail_y), ceil(trail_y + self.trail_margin)),
-                r=0.5,
-                col=choice([pyxel.COLOR_ORANGE, pyxel.COLOR_RED, pyxel.COLOR_YELLOW])
-            )
-
-    def _draw_ball(self) -> None:
+        """ Draws the shimmering trail effect (the game draws all trails at once instead) """
+        TRAIL_RENDERER.draw([self.trail], self.rt.frame_count)
+
+    def _draw_ball(self, alpha: float = 1.0) -> None:
         """ Draws the ball itself with its sprite """
+        import pyxel
+        x, y = self.x, self.y
+        if alpha < 1.0 and abs(x - self.prev_x) < 8 and abs(y - self.prev_y) < 8:   # doesn't smooth out teleports (e.g. new balls)
+            x = self.prev_x + (x - self.prev_x) * alpha
+            y = self.prev_y + (y - self.prev_y) * alpha
         pyxel.blt(
-            x=self.x,
-            y=self.y,
+            x=x,
+            y=y,
             img=self.img,
             u=self.sprite_u,
             v=self.sprite_v,
@@ -0,0 +1,400 @@
+"""
+Module Name: ball_pool.py
+
+Description:
+    Contains the "BallPool", an alternative ball backend that keeps the physics state of every
+    ball in contiguous NumPy arrays and moves the whole pool in a single vectorized step.
+    Requires NumPy.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import numpy as np
+from math import floor
+from ball import Ball
+from brick import Brick
+from brick_grid import BrickGrid
+from paddle import Paddle
+from runtime import Runtime
+
+LIMIT: int = 2 ** 30                                        # ball edges are clamped to +-LIMIT before being floored
+NEVER: int = -2 ** 31                                       # brick edge no (clamped) ball edge is <= to
+SIGNS: np.ndarray = np.array([1, -1, 1, -1], dtype=np.int32)   # (left, right, top, bottom) to (left, -right, top, -bottom)
+
+
+class PooledBall(Ball):
+    """
+
+    A ball whose physics state lives inside a BallPool (same interface as Ball).
+
+    Attributes:
+        pool (BallPool):                        pool holding the ball's state
+        index (int):                            slot of the ball in the pool's arrays
+
+    Methods:
+        __init__(self, pool: BallPool, index: int, gravity: float) -> None:
+            Initializes a pooled ball on the given slot.
+
+            Args:
+                pool (BallPool):                pool holding the ball's state
+                index (int):                    slot of the ball in the pool's arrays
+                gravity (float):                gravity inputted from the main module
+
+    """
+    def __init__(self, pool: "BallPool", index: int, gravity: float) -> None:
+        """ Constructor for pooled ball """
+        self.pool = pool                                    # must be set before Ball writes its attributes
+        self.index = index
+        super().__init__(gravity, pool.rt)
+
+    # physics state is read from/written to the pool's arrays
+
+    @property
+    def x(self) -> float:
+        return float(self.pool.x[self.index])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self.pool.x[self.index] = value
+
+    @property
+    def y(self) -> float:
+        return float(self.pool.y[self.index])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.pool.y[self.index] = value
+
+    @property
+    def prev_x(self) -> float:
+        return float(self.pool.prev_x[self.index])
+
+    @prev_x.setter
+    def prev_x(self, value: float) -> None:
+        self.pool.prev_x[self.index] = value
+
+    @property
+    def prev_y(self) -> float:
+        return float(self.pool.prev_y[self.index])
+
+    @prev_y.setter
+    def prev_y(self, value: float) -> None:
+        self.pool.prev_y[self.index] = value
+
+    @property
+    def speed_x(self) -> float:
+        return float(self.pool.speed_x[self.index])
+
+    @speed_x.setter
+    def speed_x(self, value: float) -> None:
+        self.pool.speed_x[self.index] = value
+
+    @property
+    def speed_y(self) -> float:
+        return float(self.pool.speed_y[self.index])
+
+    @speed_y.setter
+    def speed_y(self, value: float) -> None:
+        self.pool.speed_y[self.index] = value
+
+    @property
+    def gravity(self) -> float:
+        return float(self.pool.gravity[self.index])
+
+    @gravity.setter
+    def gravity(self, value: float) -> None:
+        self.pool.gravity[self.index] = value
+
+    @property
+    def direction_x(self) -> int:
+        return int(self.pool.direction_x[self.index])
+
+    @direction_x.setter
+    def direction_x(self, value: int) -> None:
+        self.pool.direction_x[self.index] = value
+
+    @property
+    def direction_y(self) -> int:
+        return int(self.pool.direction_y[self.index])
+
+    @direction_y.setter
+    def direction_y(self, value: int) -> None:
+        self.pool.direction_y[self.index] = value
+
+    @property
+    def out_of_bounds(self) -> bool:
+        return bool(self.pool.out_of_bounds[self.index])
+
+    @out_of_bounds.setter
+    def out_of_bounds(self, value: bool) -> None:
+        self.pool.out_of_bounds[self.index] = value
+
+    @property
+    def last_sprite_change(self) -> int:
+        return int(self.pool.last_sprite_change[self.index])
+
+    @last_sprite_change.setter
+    def last_sprite_change(self, value: int) -> None:
+        self.pool.last_sprite_change[self.index] = value
+
+
+class BallPool:
+    """
+
+    Structure-of-arrays storage for all balls in play.
+
+    Attributes:
+        rt (Runtime):                           runtime providing the window size and clock
+        balls (list[PooledBall]):               balls in the pool (balls[i] lives on slot i)
+        x (np.ndarray):                         x-pos of every slot
+        y (np.ndarray):                         y-pos of every slot
+        prev_x (np.ndarray):                    x-pos of every slot before the last update
+        prev_y (np.ndarray):                    y-pos of every slot before the last update
+        speed_x (np.ndarray):                   horizontal speed of every slot
+        speed_y (np.ndarray):                   vertical speed of every slot
+        gravity (np.ndarray):                   gravity felt by every slot
+        direction_x (np.ndarray):               horizontal direction of every slot
+        direction_y (np.ndarray):               vertical direction of every slot
+        out_of_bounds (np.ndarray):             out of bounds flag of every slot
+        last_sprite_change (np.ndarray):        frame of the last sprite change of every slot
+        SCALAR_BELOW (int):                     below this many balls they are moved and tested one by one (NumPy doesn't pay off)
+        CELL_SIZE (int):                        cell size of the brick table (larger than a ball, so it spans 2x2 cells at most)
+        grid (BrickGrid | None):                grid the brick table was built from
+        grid_order (int):                       next_order of the grid when it was built (changes on insert)
+        grid_bricks (list[Brick]):              bricks of the grid (row i of brick_rects is grid_bricks[i])
+        grid_alive (int):                       no. of bricks of the table not known to have left the grid
+        brick_rects (np.ndarray):               floored (right, -left, bottom, -top) of every brick, NEVER once it left the grid
+        cell_bricks (np.ndarray):               (cells, K) brick rows of every cell, padded with a row that never overlaps
+        cell_stride (np.ndarray):               flat table index step of the column and row of every edge
+        cell_shift (np.ndarray):                cell coords of the table's first cell (for the left, right, top and bottom edges)
+        cell_last (np.ndarray):                 last table coord of every edge (coords are clamped into the table)
+
+    Methods:
+        __init__(self, runtime: Runtime, capacity: int = 16) -> None:
+            Initializes an empty pool.
+
+            Args:
+                runtime (Runtime):              runtime providing the window size and clock
+                capacity (int):                 no. of slots allocated up front
+
+        _grow(self) -> None:
+            Doubles the no. of slots.
+
+        spawn(self, gravity: float) -> PooledBall:
+            Adds a new ball to the pool.
+
+        release(self, ball: PooledBall) -> None:
+            Removes a ball from the pool.
+
+        update(self) -> None:
+            Updates every ball in the pool (same behaviour as Ball.update).
+
+        out_of_bounds_balls(self) -> list[PooledBall]:
+            Returns the balls that went out of bounds.
+
+        _build_cells(self, grid: BrickGrid) -> None:
+            Packs the bricks of a grid into the cell table used by collision_candidates.
+
+        _overlaps(self, box: np.ndarray, near: np.ndarray) -> np.ndarray:
+            Tests the (right, -left, bottom, -top) box of every ball against its nearby bricks.
+
+        collision_candidates(self, paddle: Paddle, grid: BrickGrid) -> set[int]:
+            Returns the slots whose next position overlaps the paddle or a brick (no other ball can collide this frame).
+
+            Args:
+                paddle (Paddle):                the paddle
+                grid (BrickGrid):               grid of the bricks of the current stage
+
+        __len__(self) -> int:
+            Returns the no. of balls in the pool.
+
+    """
+    CELL_SIZE: int = 16
+    SCALAR_BELOW: int = 16
+
+    def __init__(self, runtime: Runtime, capacity: int = 16) -> None:
+        """ Constructor for ball pool """
+        self.rt: Runtime = runtime
+        self.balls: list[PooledBall] = []
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.speed_x = np.zeros(capacity, dtype=np.float64)
+        self.speed_y = np.zeros(capacity, dtype=np.float64)
+        self.gravity = np.zeros(capacity, dtype=np.float64)
+        self.direction_x = np.ones(capacity, dtype=np.int8)
+        self.direction_y = np.ones(capacity, dtype=np.int8)
+        self.out_of_bounds = np.zeros(capacity, dtype=np.bool_)
+        self.last_sprite_change = np.zeros(capacity, dtype=np.int64)
+        self.grid: BrickGrid | None = None
+        self.grid_order: int = 0
+        self.grid_bricks: list[Brick] = []
+        self.grid_alive: int = 0
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+    def _grow(self) -> None:
+        """ Doubles the capacity of every array """
+        for name in ("x", "y", "prev_x", "prev_y", "speed_x", "speed_y", "gravity", "direction_x", "direction_y", "out_of_bounds", "last_sprite_change"):
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def spawn(self, gravity: float) -> PooledBall:
+        """ Adds a ball to the pool """
+        if len(self.balls) == len(self.x):
+            self._grow()
+        ball = PooledBall(self, len(self.balls), gravity)
+        self.balls.append(ball)
+        return ball
+
+    def release(self, ball: PooledBall) -> None:
+        """ Removes a ball from the pool (the last ball takes over its slot) """
+        i, last = ball.index, len(self.balls) - 1
+        if i != last:
+            for arr in (self.x, self.y, self.prev_x, self.prev_y, self.speed_x, self.speed_y, self.gravity, self.direction_x, self.direction_y, self.out_of_bounds, self.last_sprite_change):
+                arr[i] = arr[last]
+            moved = self.balls[last]
+            moved.index = i
+            self.balls[i] = moved
+        self.balls.pop()
+
+# +++++++++++++++++++++++++++++++++ UPDATE METHODS +++++++++++++++++++++++++++++++++
+
+    def update(self) -> None:
+        """ Moves every ball, then checks if they should bounce """
+        n = len(self.balls)
+        if n == 0:
+            return
+        if n < self.SCALAR_BELOW:
+            for ball in self.balls:
+                Ball.update(ball)                           # cheaper than the fixed cost of the NumPy calls below
+            return
+
+        x, y = self.x[:n], self.y[:n]                       # views of the slots in use
+        for ball, bx, by in zip(self.balls, x.tolist(), y.tolist()):
+            ball.trail.push(bx, by)                         # trails are still kept per ball (Ball._update_trail)
+
+        speed_x, speed_y = self.speed_x[:n], self.speed_y[:n]
+        self.prev_x[:n] = x                                 # kept for interpolated drawing
+        self.prev_y[:n] = y
+        d = 2 * self.balls[0].r                             # ball diameter
+
+                                                            # moves the balls (Ball._move_ball)
+        speed_y += self.gravity[:n]                         # applies gravity
+        np.minimum(speed_y, 5, out=speed_y)                 # caps the downward speed
+        x += speed_x
+        y += speed_y
+        self.direction_x[:n] = np.where(speed_x > 0, 1, -1)
+        self.direction_y[:n] = np.where(speed_y > 0, 1, -1)
+
+                                                            # bounces off the walls (Ball._check_bounds)
+        left = x <= 0
+        right = ~left & (x + d >= self.rt.width)
+        x[left] = 0
+        x[right] = self.rt.width - d
+        speed_x[left | right] *= -1
+
+        top = y <= 0
+        bottom = ~top & (y + d >= self.rt.height)
+        y[top] = 0
+        speed_y[top] *= -1
+        y[bottom] = self.rt.height - d
+        self.out_of_bounds[:n] |= bottom
+
+                                                            # changes the sprites that are due (Ball._update_sprite)
+        due = self.rt.frame_count - self.last_sprite_change[:n] >= self.balls[0].sprite_change_interval
+        if due.any():
+            self.last_sprite_change[:n][due] = self.rt.frame_count
+            for i in np.flatnonzero(due):
+                self.balls[i]._cycle_sprite()
+
+    def out_of_bounds_balls(self) -> list[PooledBall]:
+        """ Returns the balls that went out of bounds """
+        return [self.balls[i] for i in np.flatnonzero(self.out_of_bounds[:len(self.balls)]).tolist()]
+
+# +++++++++++++++++++++++++++++++++ COLLISION METHODS +++++++++++++++++++++++++++++++++
+
+    def _build_cells(self, grid: BrickGrid) -> None:
+        """ Packs the bricks of a grid into a (cells, K) table of brick rows on a grid of CELL_SIZE cells """
+        self.grid, self.grid_order = grid, grid.next_order
+        self.grid_bricks = list(grid.order)
+        self.grid_alive = len(self.grid_bricks)
+        m, cs = len(self.grid_bricks), self.CELL_SIZE
+
+                                                            # edges are floored (whole pixels), which never misses an overlap
+        self.brick_rects = np.full((m + 1, 4), NEVER, dtype=np.int32)    # row m never overlaps anything (pads the cells)
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, b in enumerate(self.grid_bricks):
+            left, top, right, bottom = floor(b.x), floor(b.y), floor(b.x + b.w), floor(b.y + b.h)
+            self.brick_rects[i] = right, -left, bottom, -top    # negated left/top edges, so a single <= tests every side
+            for col in range(left // cs, right // cs + 1):
+                for row in range(top // cs, bottom // cs + 1):
+                    cells.setdefault((col, row), []).append(i)
+
+        col0 = min((col for col, _ in cells), default=0) - 1  # an empty border soaks up the balls outside the bricks' cells
+        row0 = min((row for _, row in cells), default=0) - 1
+        cols = max((col for col, _ in cells), default=0) - col0 + 2
+        rows = max((row for _, row in cells), default=0) - row0 + 2
+        self.cell_stride = np.array([[rows], [rows], [1], [1]], dtype=np.int32)
+        self.cell_shift = np.array([[col0], [col0], [row0], [row0]], dtype=np.int32)
+        self.cell_last = np.array([[cols - 1], [cols - 1], [rows - 1], [rows - 1]], dtype=np.int32)
+        self.cell_bricks = np.full((cols * rows, max((len(c) for c in cells.values()), default=1)), m, dtype=np.int32)
+        for (col, row), cell in cells.items():
+            self.cell_bricks[(col - col0) * rows + row - row0, :len(cell)] = cell
+
+    def _overlaps(self, box: np.ndarray, near: np.ndarray) -> np.ndarray:
+        """ (n, K) True where box i overlaps brick near[i, k] (edges included) """
+        n, k = near.shape
+        boxes = np.repeat(box[:, None, :], k, axis=1).reshape(n, 4 * k)   # copied so the compare runs contiguously
+        below = boxes <= np.take(self.brick_rects, near, axis=0).reshape(n, 4 * k)
+        return below.view(np.uint32) == 0x01010101          # all 4 edge tests of a pair passed (4 bytes of 1)
+
+    def collision_candidates(self, paddle: Paddle, grid: BrickGrid) -> set[int]:
+        """ Returns the slots of the balls that may collide this frame (same overlap test as Ball.detect_collision) """
+        n = len(self.balls)
+        if n == 0:
+            return set()
+        d = 2 * self.balls[0].r
+        if n < self.SCALAR_BELOW or d >= self.CELL_SIZE:
+            return set(range(n))                            # too few balls to pay off (or a ball could span more than 2x2 cells)
+        if grid is not self.grid or grid.next_order != self.grid_order:
+            self._build_cells(grid)
+
+                                                            # ball's bounding box at its next position (whole pixels)
+        edges = np.empty((4, n))
+        np.add(self.x[:n], self.speed_x[:n], out=edges[0])
+        np.add(edges[0], d, out=edges[1])
+        np.add(self.y[:n], self.speed_y[:n], out=edges[2])
+        np.add(edges[2], d, out=edges[3])
+        np.clip(edges, -LIMIT, LIMIT, out=edges)            # keeps them inside int32 (without changing any test)
+        edges = np.floor(edges).astype(np.int32)
+        box = np.multiply(edges.T, SIGNS, order="C")        # (left, -right, top, -bottom) of every ball
+
+        paddle_rect = np.array([floor(paddle.x + paddle.w), -floor(paddle.x), floor(paddle.y + paddle.h), -floor(paddle.y)],
+                               dtype=np.int32)
+        flagged = (box <= paddle_rect).view(np.uint32)[:, 0] == 0x01010101
+
+                                                            # gathers the bricks of the (at most 2x2) cells the box touches
+        cell = edges // self.CELL_SIZE - self.cell_shift
+        np.minimum(np.maximum(cell, 0, out=cell), self.cell_last, out=cell)
+        cell *= self.cell_stride
+        ids = cell[[0, 1, 0, 1]] + cell[[2, 2, 3, 3]]       # (c0, r0), (c1, r0), (c0, r1), (c1, r1)
+        near = np.take(self.cell_bricks, ids.T, axis=0).reshape(n, -1)
+
+        overlap = self._overlaps(box, near)
+        if len(grid) < self.grid_alive:                     # some bricks were destroyed since the table was built
+            dead = [i for i in set(near[overlap].tolist()) if self.grid_bricks[i] not in grid.order]
+            if dead:                                        # (they never overlap anything again)
+                self.brick_rects[dead] = NEVER
+                self.grid_alive -= len(dead)
+                overlap = self._overlaps(box, near)
+        flagged |= overlap.any(axis=1)
+        return set(np.flatnonzero(flagged).tolist())
+
+    def __len__(self) -> int:
+        """ Returns the no. of balls in the pool """
+        return len(self.balls)
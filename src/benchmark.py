@@ -0,0 +1,195 @@
+"""
+Module Name: benchmark.py
+
+Description:
+    Contains the benchmark suite for the physics and render hot paths. Micro-benchmarks time
+    single calls (collision checks, brick construction), while macro-benchmarks time whole
+    frames of generated scenarios. Results are written as JSON and can be compared against a
+    stored baseline to flag regressions.
+
+    Usage:
+        python benchmark.py --out baseline.json
+        python benchmark.py --compare baseline.json --threshold 0.10
+        python benchmark.py --draw                      (also times drawing, needs a display)
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from statistics import median
+from time import perf_counter
+from typing import Callable
+
+from ball import Ball
+from brick import Brick
+from headless import STAGES_PATH
+from main import BreakoutGame, GameState
+from paddle import Paddle
+from reward import Reward
+from rng import GameRNG
+from runtime import HeadlessRuntime, Runtime
+
+                                                                # (name, balls, bricks, rewards) of the macro scenarios
+SCENARIOS: list[tuple[str, int, int, int]] = [
+    ("1_ball_60_bricks", 1, 60, 0),
+    ("50_balls_500_bricks", 50, 500, 0),
+    ("500_rewards", 1, 0, 500),
+]
+
+
+def time_call(fn: Callable[[], object], number: int, repeat: int) -> dict[str, float]:
+    """ Times `number` calls of fn, `repeat` times, and returns the per-call time in microseconds """
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((perf_counter() - start) / number * 1e6)
+    return {"unit": "us", "median": median(samples), "min": min(samples), "repeat": repeat, "number": number}
+
+# +++++++++++++++++++++++++++++++++ MICRO BENCHMARKS +++++++++++++++++++++++++++++++++
+
+def micro_benchmarks(rt: Runtime, repeat: int) -> dict[str, dict[str, float]]:
+    """ Times the single-call hot paths """
+    results = {}
+    paddle = Paddle(rt)
+    rng = GameRNG(0)
+
+    ball = Ball(0.010, rt)
+    far_brick = Brick(300, 40, 1, K=2, rng=rng)
+    ball.x, ball.y, ball.speed_x, ball.speed_y = 100, 150, 1.5, -1.5
+    results["ball.detect_collision.miss"] = time_call(lambda: ball.detect_collision(far_brick), 20000, repeat)
+
+    hit_brick = Brick(100, 140, 2, K=2, rng=rng)
+    def hit() -> None:
+        ball.x, ball.y, ball.speed_x, ball.speed_y = 110, 158, 1.5, -1.5
+        hit_brick.health = 2
+        ball.detect_collision(hit_brick)
+    results["ball.detect_collision.hit"] = time_call(hit, 20000, repeat)
+
+    ball.speed_x, ball.speed_y = 1.5, 1.5
+    results["ball._handle_collisions"] = time_call(
+        lambda: ball._handle_collisions(obj=paddle, contact=paddle.x + 10, is_x=True, is_upper=True), 20000, repeat
+    )
+
+    reward = Reward(x=paddle.x, y=paddle.y - 40, points=50, falling_accel=0.010, X=15, runtime=rt)
+    results["reward.collides"] = time_call(lambda: reward.collides(paddle), 20000, repeat)
+
+    results["brick.__init__"] = time_call(lambda: Brick(100, 40, 1, K=2, rng=rng), 20000, repeat)
+    return results
+
+# +++++++++++++++++++++++++++++++++ MACRO BENCHMARKS +++++++++++++++++++++++++++++++++
+
+def build_scenario(rt: Runtime, balls: int, bricks: int, rewards: int, **backends: bool) -> BreakoutGame:
+    """ A RUNNING game with generated balls, bricks and falling rewards (same layout for the same seed) """
+    game = BreakoutGame(runtime=rt, stages_path=STAGES_PATH, **backends)
+    rng = GameRNG(1)
+
+    game.stages = [{"bricks": [                                 # dense grid of bricks over the upper part of the window
+        {"x": (i % 28) * 16, "y": (i // 28) * 8, "brick_type": rng.choice([1, 2, 3, 5])}
+        for i in range(bricks)
+    ]}]
+    game.current_stage = 1
+    game._load_stage(0)
+
+    game._reset_ball()
+    for i in range(balls):
+        ball = game.balls[0] if i == 0 else game._make_ball()
+        ball.x, ball.y = rng.rndf(0, rt.width - 8), rng.rndf(100, 160)
+        ball.speed_x, ball.speed_y = rng.rndf(-2.5, 2.5), rng.rndf(-2.5, -0.5)
+        if i > 0:
+            game.balls.append(ball)
+
+    for i in range(rewards):
+        game._spawn_score_objects(1, Brick(rng.rndf(0, rt.width - 8), rng.rndf(0, 150), 1, K=1, rng=rng))
+
+    game.current_game_state = GameState.RUNNING
+    return game
+
+def macro_benchmarks(repeat: int, frames: int, draw: bool) -> dict[str, dict[str, float]]:
+    """ Times whole frames of the generated scenarios """
+    backends = {"": {}}
+    try:
+        import numpy                                            # noqa: F401 (numpy backends are optional)
+        backends["+numpy"] = {"use_ball_pool": True, "use_reward_field": True}
+    except ImportError:
+        pass
+
+    results = {}
+    for name, balls, bricks, rewards in SCENARIOS:
+        for suffix, flags in backends.items():
+            samples = []
+            for _ in range(repeat):
+                game = build_scenario(HeadlessRuntime(seed=0), balls, bricks, rewards, **flags)
+                start = perf_counter()
+                for _ in range(frames):
+                    game._update_running_state()
+                samples.append((perf_counter() - start) / frames * 1e6)
+            results[f"update_running_state.{name}{suffix}"] = {
+                "unit": "us", "median": median(samples), "min": min(samples), "repeat": repeat, "number": frames
+            }
+
+            if draw:
+                game = build_scenario(HeadlessRuntime(seed=0), balls, bricks, rewards, **flags)
+                results[f"draw_game_elements.{name}{suffix}"] = time_call(game._draw_game_elements, frames, repeat)
+    return results
+
+# +++++++++++++++++++++++++++++++++ REPORTING +++++++++++++++++++++++++++++++++
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """ Returns a line per benchmark that got slower than the baseline by more than the threshold """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["median"], result["median"]
+        change = (new - old) / old
+        if change > threshold:
+            regressions.append(f"{name}: {old:.2f} -> {new:.2f} {result['unit']} (+{change:.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmarks the physics and render hot paths.")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per benchmark (the median is reported)")
+    parser.add_argument("--frames", type=int, default=120, help="frames per macro-benchmark repetition")
+    parser.add_argument("--draw", action="store_true", help="also times drawing (opens a pyxel window)")
+    parser.add_argument("--out", help="writes the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown flagged as a regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.draw:
+        BreakoutGame._init_pyxel()                              # drawing needs the pyxel window and resources
+
+    results = micro_benchmarks(HeadlessRuntime(seed=0), args.repeat)
+    results.update(macro_benchmarks(args.repeat, args.frames, args.draw))
+
+    for name, result in results.items():
+        print(f"{name:<50} {result['median']:>10.2f} {result['unit']}")
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
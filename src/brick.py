@@ -8,71 +8,88 @@ Author: Josh Patiño
 Date: January 01, 2025
 """
 
-import pyxel
-from random import choice
-
-
-BrickType: dict[int, dict[str, int]] = {
-    1: { # book (regular)
-        "img": 0,
-        "w": 32,
-        "h": 16,
-        "health": 1,
-        "colkey": pyxel.COLOR_LIGHT_BLUE,
-    },
-    2: { # bacon (sturdy)
-        "img": 0,
-        "w": 32,
-        "h": 16,
-        "health": 2,
-        "colkey": pyxel.COLOR_LIGHT_BLUE,
-    },
-    3: { # eggs (very sturdy)
-        "img": 0,
-        "w": 16,
-        "h": 16,
-        "health": 3,
-        "colkey": pyxel.COLOR_RED,
-    },
-    4: { # stone slabs (indestructible)
-        "img": 0,
-        "w": 32,
-        "h": 16,
-        "health": -1, # meaning it can't be broken
-        "colkey": pyxel.COLOR_LIGHT_BLUE,
-    },
-    5: { # ball maker
-        "img": 0,
-        "w": 32,
-        "h": 16,
-        "health": 1,
-        "colkey": pyxel.COLOR_LIGHT_BLUE
-    }
-}
+from dataclasses import dataclass
+from rng import GameRNG
 
-class Brick:
+
+@dataclass(frozen=True)
+class BrickSpec:
     """
 
-    A brick object used in the game.
+    Data shared by every brick of the same type (a single instance per type).
 
     Attributes:
         brick_type (int):                               type of brick (1-5)
-        x (float):                                      brick's x-pos
-        y (float):                                      brick's y-pos
         w (int):                                        brick's width
         h (int):                                        brick's height
-        health (int):                                   brick's durability (-1 for indestructible)
+        health (int):                                   starting durability (-1 for indestructible)
         img (int):                                      image bank for sprite
         colkey (int):                                   color key for transparency
-        skins_1 (list[tuple[int, int]]):                containing sprite positions for type 1
-        skins_2 (list[tuple[int, int]]):                containing sprite positions for type 2
-        skins_3 (list[tuple[int, int]]):                containing sprite positions for type 3
-        skins_4 (list[tuple[int, int]]):                containing sprite positions for type 4
-        current_skin (tuple[int, int]):                 current (u,v) sprite position
+        skins (tuple[tuple[int, int], ...]):            (u,v) sprite positions of the type
+        random_skin (bool):                             picks a random skin on creation if True
+        damage_skins (bool):                            skin follows the remaining health if True (skins arranged in reverse)
+
+    """
+    brick_type: int
+    w: int
+    h: int
+    health: int
+    img: int
+    colkey: int
+    skins: tuple[tuple[int, int], ...]
+    random_skin: bool = False
+    damage_skins: bool = False
+
+
+                                                                # colkeys are pyxel palette colors (6 light blue, 8 red)
+BrickType: dict[int, BrickSpec] = {
+    1: BrickSpec( # book (regular)
+        brick_type=1, w=32, h=16, health=1, img=0, colkey=6,
+        skins=((16,0), (16,16), (16,32), (16,48), (16,64), (16,80)),
+        random_skin=True,
+    ),
+    2: BrickSpec( # bacon (sturdy)
+        brick_type=2, w=32, h=16, health=2, img=0, colkey=6,
+        skins=((16, 112), (16,96)),
+        damage_skins=True,
+    ),
+    3: BrickSpec( # eggs (very sturdy)
+        brick_type=3, w=16, h=16, health=3, img=0, colkey=8,
+        skins=((0, 64), (0,48), (0, 32)),
+        damage_skins=True,
+    ),
+    4: BrickSpec( # stone slabs (indestructible)
+        brick_type=4, w=32, h=16, health=-1, img=0, colkey=6, # health -1 meaning it can't be broken
+        skins=((48, 0), (48, 16)),
+        random_skin=True,
+    ),
+    5: BrickSpec( # ball maker
+        brick_type=5, w=32, h=16, health=1, img=0, colkey=6,
+        skins=((48, 112),),
+    ),
+}
+
+class Brick:
+    """
+
+    A brick object used in the game. Only the per-brick state is stored, everything else is read from its BrickSpec.
+
+    Attributes:
+        spec (BrickSpec):                               shared data of the brick's type
+        x (float):                                      brick's x-pos
+        y (float):                                      brick's y-pos
+        health (int):                                   brick's durability (-1 for indestructible)
+        skin_index (int):                               index of the current skin in spec.skins
         K (int):                                        no. of score objects in brick
+        brick_type (int):                               * property, type of brick (1-5)
+        w (int):                                        * property, brick's width
+        h (int):                                        * property, brick's height
+        img (int):                                      * property, image bank for sprite
+        colkey (int):                                   * property, color key for transparency
+        current_skin (tuple[int, int]):                 * property, current (u,v) sprite position
 
     Methods:
-        __init__(self, x: float, y: float, brick_type: int, K: int) -> None:
+        __init__(self, x: float, y: float, brick_type: int, K: int, rng: GameRNG) -> None:
             Initializes a Brick object with position and type.
 
             Args:
@@ -80,6 +97,10 @@ class Brick:
                 y (float):                      y-pos of brick
                 brick_type (int):               brick's type
                 K (int):                        no. of score objects in brick
+                rng (GameRNG):                  randomness used to pick the skin
+
+        hit(self) -> bool:
+            Reduces the health once and updates the skin, returns True if the brick should be destroyed.
 
         destroy(self) -> None:
             Conveys a message to destroy brick.
@@ -88,38 +109,63 @@ class Brick:
             Renders the brick sprite.
 
     """
+    __slots__ = ("spec", "x", "y", "health", "skin_index", "K")
 
-
-    def __init__(self, x: float, y: float, brick_type: int, K: int) -> None:
+    def __init__(self, x: float, y: float, brick_type: int, K: int, rng: GameRNG) -> None:
         """ Constructor for brick """
-        self.brick_type = brick_type
+        self.spec: BrickSpec = BrickType[brick_type]
         self.x = x
         self.y = y
-        self.w = BrickType[brick_type]["w"]
-        self.h = BrickType[brick_type]["h"]
-        self.health = BrickType[self.brick_type]["health"]
-        self.img = BrickType[self.brick_type]["img"]
-        self.colkey = BrickType[brick_type]["colkey"]
-        self.skins_1 = [(16,0), (16,16), (16,32), (16,48), (16,64), (16,80)]        # brick type 1
-        self.skins_2 = [(16, 112), (16,96)]                                         # brick type 2 (arranged in reverse)
-        self.skins_3 = [(0, 64), (0,48), (0, 32)]                                   # brick type 3 (arranged in reverse)
-        self.skins_4 = [(48, 0), (48, 16)]                                          # brick type 4
-        self.current_skin: tuple[int, int]                                          # (u, v)
+        self.health: int = self.spec.health
         self.K = K
 
-        match brick_type:
-            case 1:
-                self.current_skin = choice(self.skins_1)
-            case 2:
-                self.current_skin = self.skins_2[self.health - 1]                   # uses the first stage of brick type 2
-            case 3:
-                self.current_skin = self.skins_3[self.health - 1]                   # uses the first stage of brick type 3
-            case 4:
-                self.current_skin = choice(self.skins_4)                            # random choice
-            case 5:
-                self.current_skin = 48, 112                                         # (u, v)
-            case _:                                                            
-                pass                                                                # shouldn't happen
+        if self.spec.random_skin:
+            self.skin_index: int = rng.choice(range(len(self.spec.skins)))          # random choice
+        elif self.spec.damage_skins:
+            self.skin_index = self.health - 1                                       # uses the first stage of the brick type
+        else:
+            self.skin_index = 0
+
+    # read-only data of the type
+
+    @property
+    def brick_type(self) -> int:
+        return self.spec.brick_type
+
+    @property
+    def w(self) -> int:
+        return self.spec.w
+
+    @property
+    def h(self) -> int:
+        return self.spec.h
+
+    @property
+    def img(self) -> int:
+        return self.spec.img
+
+    @property
+    def colkey(self) -> int:
+        return self.spec.colkey
+
+    @property
+    def current_skin(self) -> tuple[int, int]:
+        return self.spec.skins[self.skin_index]
+
+    @current_skin.setter
+    def current_skin(self, value: tuple[int, int]) -> None:
+        self.skin_index = self.spec.skins.index(value)
+
+    def hit(self) -> bool:
+        """ Takes a hit from a ball (indestructible bricks are unaffected) """
+        if self.health <= 0:
+            return False
+        self.health -= 1                                                            # reduces health once per collision
+        if self.health == 0:
+            return self.destroy()
+        if self.spec.damage_skins:                                                  # if brick has multiple stages
+            self.skin_index = self.health - 1
+        return False
 
     def destroy(self) -> bool:
         """ Conveys message to destroy brick -> ball -> game """
@@ -127,6 +173,7 @@ class Brick:
 
     def draw(self) -> None:
         """ Drawing method for brick """
+        import pyxel
         pyxel.blt(
             self.x,
             self.y,
@@ -136,4 +183,4 @@ class Brick:
             self.w,
             self.h,
             self.colkey
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,113 @@
+"""
+Module Name: brick_grid.py
+
+Description:
+    Contains a uniform grid (spatial hash) of bricks used as a broadphase for
+    ball-vs-brick collisions, so each ball only inspects the bricks near it.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from brick import Brick
+
+
+class BrickGrid:
+    """
+
+    A uniform grid of bricks keyed by cell coordinates.
+
+    Attributes:
+        cell_size (int):                                    width and height of a single cell (in pixels)
+        cells (dict[tuple[int, int], list[Brick]]):         bricks overlapping each occupied cell
+        order (dict[Brick, int]):                           load order of each brick (mirrors its position in the stage list)
+        next_order (int):                                   load order given to the next inserted brick
+
+    Methods:
+        __init__(self, bricks: list[Brick], cell_size: int = 32) -> None:
+            Builds the grid from the given bricks.
+
+            Args:
+                bricks (list[Brick]):                       the bricks of the current stage
+                cell_size (int):                            width and height of a single cell
+
+        _cell_range(self, left: float, top: float, right: float, bottom: float) -> tuple[int, int, int, int]:
+            Converts a bounding box into an inclusive range of cells.
+
+        insert(self, brick: Brick) -> None:
+            Adds a brick to every cell its bounding box touches.
+
+        remove(self, brick: Brick) -> None:
+            Removes a brick from every cell its bounding box touches.
+
+        query(self, left: float, top: float, right: float, bottom: float) -> list[Brick]:
+            Returns the bricks near a bounding box, latest loaded first.
+
+        __len__(self) -> int:
+            Returns the no. of bricks in the grid.
+
+    """
+    def __init__(self, bricks: list[Brick], cell_size: int = 32) -> None:
+        """ Constructor for brick grid """
+        self.cell_size: int = cell_size
+        self.cells: dict[tuple[int, int], list[Brick]] = {}
+        self.order: dict[Brick, int] = {}
+        self.next_order: int = 0
+
+        for brick in bricks:
+            self.insert(brick)
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+    def _cell_range(self, left: float, top: float, right: float, bottom: float) -> tuple[int, int, int, int]:
+        """ Returns the (first column, first row, last column, last row) covered by a bounding box """
+                                                            # edges are inclusive, just like the overlap check of the ball
+        return (
+            int(left // self.cell_size),
+            int(top // self.cell_size),
+            int(right // self.cell_size),
+            int(bottom // self.cell_size)
+        )
+
+    def insert(self, brick: Brick) -> None:
+        """ Adds a brick to the grid """
+        self.order[brick] = self.next_order
+        self.next_order += 1
+
+        first_col, first_row, last_col, last_row = self._cell_range(brick.x, brick.y, brick.x + brick.w, brick.y + brick.h)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                self.cells.setdefault((col, row), []).append(brick)
+
+    def remove(self, brick: Brick) -> None:
+        """ Removes a brick from the grid """
+        if self.order.pop(brick, None) is None:
+            return                                          # brick isn't tracked by the grid
+
+        first_col, first_row, last_col, last_row = self._cell_range(brick.x, brick.y, brick.x + brick.w, brick.y + brick.h)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.cells.get((col, row))
+                if cell is None:
+                    continue
+                cell.remove(brick)
+                if not cell:
+                    del self.cells[(col, row)]              # drops empty cells so lookups stay cheap
+
+    def query(self, left: float, top: float, right: float, bottom: float) -> list[Brick]:
+        """ Returns all bricks sharing a cell with the bounding box, latest loaded first """
+        first_col, first_row, last_col, last_row = self._cell_range(left, top, right, bottom)
+
+        found: set[Brick] = set()
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.cells.get((col, row))
+                if cell:
+                    found.update(cell)
+
+                                                            # same order as a reversed scan of the stage's brick list
+        return sorted(found, key=self.order.__getitem__, reverse=True)
+
+    def __len__(self) -> int:
+        """ Returns the no. of bricks in the grid """
+        return len(self.order)
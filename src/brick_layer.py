@@ -0,0 +1,168 @@
+"""
+Module Name: brick_layer.py
+
+Description:
+    Contains the cached brick layer. The bricks of a stage are rendered once into an
+    offscreen image, only the rectangles of damaged or destroyed bricks are re-rendered,
+    and the whole layer is blitted with a single call per frame.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from brick import Brick
+from brick_grid import BrickGrid
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyxel
+
+
+class BrickLayer:
+    """
+
+    Offscreen image holding the rendered bricks of the current stage.
+
+    Attributes:
+        width (int):                                    width of the layer (same as the window)
+        height (int):                                   height of the layer (same as the window)
+        image (pyxel.Image | None):                     rendered bricks (created on the first draw)
+        needs_rebuild (bool):                           re-renders every brick on the next draw if True
+        dirty (list[tuple[int, int, int, int]]):        (x, y, w, h) rectangles to re-render on the next draw
+        rendered (int):                                 no. of bricks (in load order) already rendered since the last rebuild
+        COLKEY (int):                                   transparent color of the layer (not used by any brick sprite)
+        MAX_DIRTY (int):                                no. of dirty rectangles after which a full rebuild is cheaper
+
+    Methods:
+        __init__(self, width: int, height: int) -> None:
+            Initializes an empty layer.
+
+            Args:
+                width (int):                            width of the layer
+                height (int):                           height of the layer
+
+        invalidate_all(self) -> None:
+            Marks the whole layer for re-rendering (e.g. a new stage was loaded).
+
+        invalidate(self, brick: Brick) -> None:
+            Marks the rectangle of a damaged or destroyed brick for re-rendering.
+
+            Args:
+                brick (Brick):                          the brick that was hit
+
+        _render(self, brick: Brick) -> None:
+            Renders a single brick into the layer.
+
+        _rebuild(self, bricks: list[Brick]) -> None:
+            Re-renders every brick.
+
+        _flush(self, grid: BrickGrid) -> None:
+            Re-renders the dirty rectangles, including the parts of neighbouring bricks inside them.
+
+        prerender(self, bricks: list[Brick]) -> None:
+            Renders the bricks added since the last call (used while a stage is built incrementally).
+
+            Args:
+                bricks (list[Brick]):                   the bricks of the stage being built
+
+        draw(self, bricks: list[Brick], grid: BrickGrid) -> None:
+            Brings the layer up to date and blits it.
+
+            Args:
+                bricks (list[Brick]):                   the bricks of the current stage
+                grid (BrickGrid):                       spatial index of the bricks
+
+    """
+    COLKEY: int = 1                                             # pyxel navy, the only color no brick sprite uses
+    MAX_DIRTY: int = 64
+
+    def __init__(self, width: int, height: int) -> None:
+        """ Constructor """
+        self.width: int = width
+        self.height: int = height
+        self.image: "pyxel.Image | None" = None
+        self.needs_rebuild: bool = True
+        self.dirty: list[tuple[int, int, int, int]] = []
+        self.rendered: int = 0
+
+    def invalidate_all(self) -> None:
+        """ Re-renders the whole layer on the next draw """
+        self.needs_rebuild = True
+        self.dirty.clear()
+
+    def invalidate(self, brick: Brick) -> None:
+        """ Re-renders the brick's rectangle on the next draw """
+        if self.needs_rebuild:
+            return                                              # already re-rendered as a whole
+        if len(self.dirty) >= self.MAX_DIRTY:
+            self.invalidate_all()                               # e.g. many frames without drawing (headless)
+            return
+        self.dirty.append((int(brick.x), int(brick.y), brick.w, brick.h))
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+    def _render(self, brick: Brick) -> None:
+        """ Renders a brick, same as Brick.draw but into the layer """
+        self.image.blt(
+            brick.x,
+            brick.y,
+            brick.img,
+            brick.current_skin[0],
+            brick.current_skin[1],
+            brick.w,
+            brick.h,
+            brick.colkey
+        )
+
+    def _rebuild(self, bricks: list[Brick]) -> None:
+        """ Re-renders every brick (in load order, so later bricks stay on top) """
+        self.image.cls(self.COLKEY)
+        for brick in bricks:
+            self._render(brick)
+        self.needs_rebuild = False
+        self.rendered = len(bricks)
+        self.dirty.clear()
+
+    def _flush(self, grid: BrickGrid) -> None:
+        """ Re-renders only the dirty rectangles """
+        for x, y, w, h in self.dirty:
+            self.image.clip(x, y, w, h)                         # neighbours are only redrawn inside the rectangle
+            self.image.rect(x, y, w, h, self.COLKEY)
+                                                                # query is latest loaded first, so it is drawn reversed
+            for brick in reversed(grid.query(left=x, top=y, right=x + w, bottom=y + h)):
+                self._render(brick)
+        self.image.clip()
+        self.dirty.clear()
+
+    def prerender(self, bricks: list[Brick]) -> None:
+        """ Renders only the bricks that were appended since the last call """
+        import pyxel
+        if self.image is None:
+            self.image = pyxel.Image(self.width, self.height)
+            self.needs_rebuild = True
+        if self.needs_rebuild:
+            self.image.cls(self.COLKEY)                         # starts from an empty layer
+            self.needs_rebuild = False
+            self.rendered = 0
+        for brick in bricks[self.rendered:]:
+            self._render(brick)
+        self.rendered = max(self.rendered, len(bricks))
+
+# +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
+
+    def draw(self, bricks: list[Brick], grid: BrickGrid) -> None:
+        """ Brings the layer up to date, then blits it in one call """
+        import pyxel
+        if self.image is None:
+            self.image = pyxel.Image(self.width, self.height)
+            self.needs_rebuild = True
+
+        if self.needs_rebuild:
+            self._rebuild(bricks)
+        else:
+            if self.rendered < len(bricks):
+                self.prerender(bricks)                          # finishes a stage that was only partly pre-rendered
+            if self.dirty:
+                self._flush(grid)
+
+        pyxel.blt(0, 0, self.image, 0, 0, self.width, self.height, self.COLKEY)
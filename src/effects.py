@@ -0,0 +1,139 @@
+"""
+Module Name: effects.py
+
+Description:
+    Contains the effect scheduler, which tracks timed effects (e.g. powerups) on a timing
+    wheel keyed by the frame they expire on. Starting, stacking and expiring an effect is
+    O(1), and expiry callbacks run from the update step, so effect timing is part of the
+    deterministic game logic.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from typing import Callable, Hashable
+
+
+class EffectScheduler:
+    """
+
+    Timing wheel of active effects. The clock is advanced by the game (e.g. once per RUNNING update),
+    so effects are paused whenever the clock is.
+
+    Attributes:
+        clock (int):                                        current frame of the scheduler
+        expired_through (int):                              last frame whose effects were expired
+        expiry (dict[Hashable, int]):                       frame each active effect expires on
+        duration (dict[Hashable, int]):                     full duration of each active effect (including stacked time)
+        callbacks (dict[Hashable, Callable[[], None]]):     called when an effect expires
+        wheel (dict[int, set[Hashable]]):                   effects expiring on each frame
+
+    Methods:
+        __init__(self) -> None:
+            Initializes an empty scheduler.
+
+        start(self, key: Hashable, duration: int, on_expire: Callable[[], None] | None = None) -> None:
+            Starts an effect, or stacks the duration onto it if it is already active.
+
+            Args:
+                key (Hashable):                             identifies the effect (e.g. "antigravity" or ("slow", ball_id)),
+                                                            a literal so snapshots can store it
+                duration (int):                             no. of frames the effect lasts
+                on_expire (Callable | None):                called when the effect expires
+
+        active(self, key: Hashable) -> bool:
+            Checks if an effect is active.
+
+        remaining(self, key: Hashable) -> int:
+            No. of frames left on an effect (0 if inactive).
+
+        advance(self) -> None:
+            Advances the clock by one frame.
+
+        expire_due(self) -> None:
+            Expires every effect whose time ran out and runs its callback.
+
+        expire(self, key: Hashable) -> None:
+            Expires an effect right away (runs its callback).
+
+        expire_all(self) -> None:
+            Expires every active effect right away.
+
+        __len__(self) -> int:
+            Returns the no. of active effects.
+
+    """
+    def __init__(self) -> None:
+        """ Constructor """
+        self.clock: int = 0
+        self.expired_through: int = 0
+        self.expiry: dict[Hashable, int] = {}
+        self.duration: dict[Hashable, int] = {}
+        self.callbacks: dict[Hashable, Callable[[], None]] = {}
+        self.wheel: dict[int, set[Hashable]] = {}
+
+    def _schedule(self, key: Hashable, frame: int) -> None:
+        """ Puts an effect into the slot of the frame it expires on """
+        self.expiry[key] = frame
+        self.wheel.setdefault(frame, set()).add(key)
+
+    def _unschedule(self, key: Hashable) -> None:
+        """ Takes an effect out of its slot """
+        frame = self.expiry.pop(key)
+        slot = self.wheel[frame]
+        slot.discard(key)
+        if not slot:
+            del self.wheel[frame]
+
+    def start(self, key: Hashable, duration: int, on_expire: Callable[[], None] | None = None) -> None:
+        """ Starts (or stacks) an effect """
+        if key in self.expiry:                                  # stacks: moves the effect to a later slot
+            frame = self.expiry[key] + duration
+            self._unschedule(key)
+            self.duration[key] += duration
+        else:
+            frame = self.clock + duration
+            self.duration[key] = duration
+        self._schedule(key, frame)
+        if on_expire is not None:
+            self.callbacks[key] = on_expire
+
+    def active(self, key: Hashable) -> bool:
+        """ Checks if an effect is active """
+        return key in self.expiry
+
+    def remaining(self, key: Hashable) -> int:
+        """ No. of frames left on an effect """
+        if key not in self.expiry:
+            return 0
+        return max(0, self.expiry[key] - self.clock)
+
+    def advance(self) -> None:
+        """ Advances the clock by one frame """
+        self.clock += 1
+
+    def expire_due(self) -> None:
+        """ Expires the effects of every slot the clock went past """
+        while self.expired_through < self.clock:
+            self.expired_through += 1
+            for key in sorted(self.wheel.get(self.expired_through, ()), key=repr):   # fixed order for replays
+                self.expire(key)
+
+    def expire(self, key: Hashable) -> None:
+        """ Expires an effect right away """
+        if key not in self.expiry:
+            return
+        self._unschedule(key)
+        del self.duration[key]
+        callback = self.callbacks.pop(key, None)
+        if callback is not None:
+            callback()
+
+    def expire_all(self) -> None:
+        """ Expires every active effect right away """
+        for key in sorted(self.expiry, key=repr):
+            self.expire(key)
+
+    def __len__(self) -> int:
+        """ Returns the no. of active effects """
+        return len(self.expiry)
@@ -0,0 +1,133 @@
+"""
+Module Name: events.py
+
+Description:
+    Contains the collision event bus. Collision checks only emit typed events into a
+    per-frame buffer, and the consumers (sound, score and streak, analytics) drain the
+    whole buffer once per frame, so side effects like sounds can be coalesced.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Callable
+
+
+class EventType(Enum):
+    """
+
+    Kinds of collision events.
+
+    Types:
+        PADDLE_HIT:             Ball bounced off the paddle
+        BRICK_HIT:              Ball hit a brick (destroyed or not)
+        BRICK_DESTROYED:        Ball destroyed a brick
+        REWARD_CAUGHT:          Score object landed on the paddle
+        REWARD_MISSED:          Score object fell past the paddle
+    """
+    PADDLE_HIT = auto()
+    BRICK_HIT = auto()
+    BRICK_DESTROYED = auto()
+    REWARD_CAUGHT = auto()
+    REWARD_MISSED = auto()
+
+@dataclass(slots=True)
+class CollisionEvent:
+    """
+
+    A single collision of the frame.
+
+    Attributes:
+        type (EventType):               kind of collision
+        brick_type (int):               type of the brick involved (0 if none)
+        points (int):                   points of the score object involved (0 if none)
+        powerup_type (str | None):      powerup type of the score object involved (None if none)
+
+    """
+    type: EventType
+    brick_type: int = 0
+    points: int = 0
+    powerup_type: str | None = None
+
+Consumer = Callable[[list[CollisionEvent]], None]              # handles all events of a frame at once
+
+
+class EventBus:
+    """
+
+    Per-frame buffer of collision events.
+
+    Attributes:
+        events (list[CollisionEvent]):      events emitted this frame (in emission order)
+        consumers (list[Consumer]):         called with the frame's events, in subscription order
+
+    Methods:
+        __init__(self) -> None:
+            Initializes an empty bus.
+
+        subscribe(self, consumer: Consumer) -> None:
+            Adds a consumer.
+
+        emit(self, event: CollisionEvent) -> None:
+            Buffers an event.
+
+        drain(self) -> None:
+            Hands the buffered events to every consumer, then clears the buffer.
+
+    """
+    def __init__(self) -> None:
+        """ Constructor """
+        self.events: list[CollisionEvent] = []
+        self.consumers: list[Consumer] = []
+
+    def subscribe(self, consumer: Consumer) -> None:
+        """ Adds a consumer """
+        self.consumers.append(consumer)
+
+    def emit(self, event: CollisionEvent) -> None:
+        """ Buffers an event until the end of the frame """
+        self.events.append(event)
+
+    def drain(self) -> None:
+        """ Hands the frame's events to every consumer """
+        if not self.events:
+            return
+        events, self.events = self.events, []                   # consumers may emit events for the next frame
+        for consumer in self.consumers:
+            consumer(events)
+
+
+class EventCounter:
+    """
+
+    Analytics consumer counting the events of each type.
+
+    Attributes:
+        counts (dict[EventType, int]):      no. of events of each type so far
+
+    Methods:
+        __init__(self) -> None:
+            Initializes every count to 0.
+
+        __call__(self, events: list[CollisionEvent]) -> None:
+            Counts the events of a frame.
+
+        reset(self) -> None:
+            Sets every count back to 0.
+
+    """
+    def __init__(self) -> None:
+        """ Constructor """
+        self.counts: dict[EventType, int] = {event_type: 0 for event_type in EventType}
+
+    def __call__(self, events: list[CollisionEvent]) -> None:
+        """ Counts the events of a frame """
+        for event in events:
+            self.counts[event.type] += 1
+
+    def reset(self) -> None:
+        """ Sets every count back to 0 """
+        for event_type in self.counts:
+            self.counts[event_type] = 0
@@ -0,0 +1,143 @@
+"""
+Module Name: headless.py
+
+Description:
+    Contains the headless engine, which steps the game logic of "CALCIFER'S COOKOUT"
+    without a window: no rendering, no fps throttle, and injected input, clock, and randomness.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import os
+from time import perf_counter
+from typing import Callable
+
+from main import BreakoutGame, GameState
+from runtime import FrameInput, HeadlessRuntime, KEY_RETURN, KEY_SPACE, MOUSE_BUTTON_LEFT
+
+STAGES_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stages.json")
+
+Controller = Callable[[BreakoutGame], FrameInput]              # decides the input of the next frame
+
+
+def follow_ball_controller(game: BreakoutGame) -> FrameInput:
+    """ Simple scripted player: clicks through menus, launches right away and follows the lowest ball """
+    rt = game.rt
+    match game.current_game_state:
+        case GameState.START:                                   # clicks the play button
+            return FrameInput.from_keys(rt.width // 2, rt.height // 2 + 57, [MOUSE_BUTTON_LEFT])
+        case GameState.READY:
+            return FrameInput.from_keys(int(game.paddle.x + game.paddle.w / 2), 0, [KEY_SPACE])
+        case GameState.GAME_OVER | GameState.WIN:
+            return FrameInput.from_keys(rt.mouse_x, 0, [KEY_RETURN])
+        case _:
+            lowest = max(game.balls, key=lambda ball: ball.y)
+            return FrameInput(mouse_x=int(lowest.x + lowest.r), mouse_y=0)
+
+
+class HeadlessEngine:
+    """
+
+    Steps a BreakoutGame as a plain Python object, as fast as the CPU allows.
+
+    Attributes:
+        runtime (HeadlessRuntime):                  runtime with injected input, clock and randomness
+        game (BreakoutGame):                        game being simulated
+        controller (Controller | None):             decides the input of each frame (idle if None)
+
+    Methods:
+        __init__(self, seed: int = 0, stages_path: str = STAGES_PATH, controller: Controller | None = None) -> None:
+            Initializes the engine with a fresh game.
+
+            Args:
+                seed (int):                         seed of the game's random number generator
+                stages_path (str):                  path to the stages file
+                controller (Controller | None):     decides the input of each frame
+
+        frame_count(self) -> int:
+            * property
+            No. of frames simulated so far.
+
+        start_stage(self, stage: int) -> None:
+            Skips the menus and waits for launch on the given stage.
+
+            Args:
+                stage (int):                        stage no. (1-indexed)
+
+        step(self, frame_input: FrameInput | None = None) -> None:
+            Simulates a single frame.
+
+            Args:
+                frame_input (FrameInput | None):    input of the frame, asks the controller if None
+
+        run(self, frames: int, until: Callable[[BreakoutGame], bool] | None = None) -> int:
+            Simulates up to `frames` frames and returns how many were simulated.
+
+            Args:
+                frames (int):                       max no. of frames to simulate
+                until (Callable | None):            stops early once this returns True
+
+    """
+    def __init__(self, seed: int = 0, stages_path: str = STAGES_PATH, controller: Controller | None = None) -> None:
+        """ Constructor """
+        self.runtime: HeadlessRuntime = HeadlessRuntime(seed=seed)
+        self.game: BreakoutGame = BreakoutGame(runtime=self.runtime, stages_path=stages_path)
+        self.controller: Controller | None = controller
+
+    @property
+    def frame_count(self) -> int:
+        """ No. of frames simulated so far """
+        return self.runtime.frame_count
+
+    def start_stage(self, stage: int) -> None:
+        """ Skips the menus and waits for launch on the given stage (same as the end of STAGE_TRANSITION) """
+        self.game.current_stage = stage
+        self.game.stats.stage = stage
+        self.game._load_stage(stage - 1)
+        self.game._reset_ball()
+        self.game.current_game_state = GameState.READY
+
+    def step(self, frame_input: FrameInput | None = None) -> None:
+        """ Simulates a single frame """
+        if frame_input is None:
+            frame_input = self.controller(self.game) if self.controller is not None else FrameInput()
+        self.runtime.input = frame_input                        # injects the input
+        self.game._update()                                     # same update logic as the pyxel game loop
+
+    def run(self, frames: int, until: Callable[[BreakoutGame], bool] | None = None) -> int:
+        """ Simulates frames until the limit (or the stop condition) is reached """
+        for i in range(frames):
+            if until is not None and until(self.game):
+                return i
+            self.step()
+        return frames
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Runs the game headless and reports the simulation speed.")
+    parser.add_argument("--frames", type=int, default=100_000, help="no. of frames to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random number generator")
+    parser.add_argument("--stages", default=STAGES_PATH, help="path to the stages file")
+    parser.add_argument("--controller", choices=("follow", "autopilot"), default="follow", help="who plays the game")
+    parser.add_argument("--profile", metavar="FILE", help="exports the update times of the last frames as JSONL")
+    args = parser.parse_args()
+
+    if args.controller == "autopilot":
+        from autopilot import Autopilot
+        controller: Controller = Autopilot()
+    else:
+        controller = follow_ball_controller
+    engine = HeadlessEngine(seed=args.seed, stages_path=args.stages, controller=controller)
+    start = perf_counter()
+    engine.run(args.frames)
+    elapsed = perf_counter() - start
+
+    print(f"{args.frames} frames in {elapsed:.2f}s ({args.frames / elapsed:,.0f} frames/s)")
+    print(f"stage {engine.game.current_stage}, state {engine.game.current_game_state.name}, score {engine.game.stats.score}")
+    print(f"sounds played {engine.game.sound.channels.played}, suppressed {engine.game.sound.channels.suppressed}")
+
+    if args.profile:
+        engine.game.profiler.export_jsonl(args.profile)
@@ -9,19 +9,36 @@ Author: Josh Patiño
 Date: January 01, 2025
 """
 
-import pyxel
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from math import radians, sin, cos
-from random import choice
 
                                                                 # all imported modules
 from reward import Reward
 from ball import Ball
 from paddle import Paddle 
 from brick import Brick
+from brick_grid import BrickGrid
+from brick_layer import BrickLayer
 from sounds import Sounds
+from trails import TRAIL_RENDERER
+from timestep import FixedStepLoop
+from quality import QualityGovernor
+from effects import EffectScheduler
+from events import CollisionEvent, EventBus, EventCounter, EventType
+from profiler import FrameProfiler
+from runtime import KEY_RETURN, KEY_SPACE, MOUSE_BUTTON_LEFT, Runtime, PyxelRuntime
+from stage_pack import StagePack, is_stage_pack
+from stage_prefetch import StagePrefetch
+from snapshot import take_snapshot, restore_snapshot
+from rewind import RewindBuffer
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ball_pool import BallPool
+    from session_store import SessionStore
+    from reward_field import RewardField
 
 class GameState(Enum):
     """ 
@@ -54,10 +71,16 @@ class GameStats:
     Attributes:
         score (int):            Current player score
         lives (int):            Remaining player lives
+        stage (int):            Furthest stage reached (1-indexed)
+        frames (int):           No. of updates played so far (menus and end screens excluded)
+        powerups (dict[str, int]):  No. of powerups collected of each type
 
     """
     score: int = 0                                              # score tracker
     lives: int = 3                                              # lives tracker
+    stage: int = 1                                              # stage tracker
+    frames: int = 0                                             # duration tracker
+    powerups: dict[str, int] = field(default_factory=dict)      # powerup tracker
 
 class BreakoutGame:
     """
@@ -65,21 +88,27 @@ class BreakoutGame:
     Main game controller class for Breakout implementation.
     
     Attributes:
+        rt (Runtime):                                           runtime providing input, clock, randomness and audio
         gravity (float):                                        gravity felt by game elements
         paddle (Paddle):                                        player-controlled paddle object
         original_paddle_speed (float):                          tracks original paddle speed
         angle (float):                                          tracks angle for the indicator used in READY state
         angle_direction (float):                                tracker for indicator (going left or right)
         angle_cycle_speed (float):                              how fast the degrees are changing per frame
+        launch_speed (float):                                   speed of the ball when launched
         balls (list[Ball]):                                     contains list of active balls
+        ball_pool (BallPool | None):                            NumPy storage moving all balls at once (None uses plain Ball objects)
         P (int):                                                contains the "weight" of each score object's contribution to points from stages.json file
         G (int):                                                contains the duration of the powerups (in seconds)
         X (int):                                                contains the % chance of a score object being a powerup
         Q (int):                                                contains the bonus point increment used in streak logic
-        stages (list[dict[str, list[dict[str, int]]]]):         contains all the predefined stages
+        stages (list[dict[str, list[dict[str, int]]]] | StagePack):  contains all the predefined stages (decoded one at a time from a level pack)
         g (int):                                                redefined G to match fps
         bricks (list[Brick]):                                   contains all bricks loaded from a stage                                       
-        score_objects (list[Reward]):                           contains all score objects that were generated
+        brick_grid (BrickGrid):                                 uniform grid of the bricks used as a collision broadphase
+        brick_layer (BrickLayer):                               cached rendering of the bricks, re-rendered only where bricks were hit
+        stage_prefetch (StagePrefetch | None):                  next stage being built during STAGE_TRANSITION
+        score_objects (list[Reward] | RewardField):             contains all score objects that were generated
         current_game_state (GameState):                         tracks the current game state
         sound (Sounds):                                         sound player for sfx and bgm
         dropped_timer (float):                                  timer for DROPPED state
@@ -90,21 +119,64 @@ class BreakoutGame:
         chosen_msg (str):                                       holds the chosen "message" from dropped_msgs
         streak_count(int):                                      tracks the no. of score objects continuously captured without dropping
         streak_timer(int):                                      tracks remaining duration for streak msg
+        effects (EffectScheduler):                              timed powerups (clock runs only in RUNNING state)
+        collision_events (EventBus):                            collisions of the current frame, drained once per frame
+        collision_counts (EventCounter):                        no. of collision events of each type so far (analytics)
+        loop (FixedStepLoop | None):                            fixed-timestep loop driving the updates (None until run)
+        rewind (RewindBuffer | None):                           snapshots of the last 60 seconds of the stage (None if rewinding is off)
+        rewinding (bool):                                       True while the rewind key (R) is held
+        quality (QualityGovernor):                              lowers the cosmetic quality while frames run over budget
+        profiler (FrameProfiler):                               times each update and draw section (F1 shows it, F2 exports it)
+        session_store (SessionStore | None):                    log every finished game is recorded into (None if not recorded)
         
     Methods:
-        __init__(self) -> None:
+        __init__(self, runtime: Runtime | None = None, stages_path: str = "../src/stages.json", use_ball_pool: bool = False, use_reward_field: bool = False, render_fps: int = 60) -> None:
             Initializes a BreakoutGame object when BreakoutGame is called.
 
-        _init_pyxel(cls) -> None:
+            Args:
+                runtime (Runtime | None):                       runtime to use, opens the pyxel window if None
+                stages_path (str):                              path to the stages file
+                use_ball_pool (bool):                           moves the balls with the NumPy BallPool backend
+                use_reward_field (bool):                        keeps the score objects in the NumPy RewardField
+                render_fps (int):                               frames drawn per second, sets the profiler and quality budgets
+
+        run(self, rewind: bool = True) -> None:
+            Runs the pyxel game loop, with the game logic on a fixed 60 Hz timestep.
+
+            Args:
+                rewind (bool):                                  keeps the last 60 seconds so they can be rewound (R)
+
+        _tick(self) -> None:
+            Runs the game logic steps that are due for the current pyxel frame.
+
+        _step(self) -> None:
+            Runs a single logic step, or goes a frame back while rewinding.
+
+        _rewind_frame(self) -> None:
+            Restores the frame before the current one from the rewind buffer.
+
+        _init_pyxel(cls, fps: int = 60) -> None:
             * class method
             Initializes pyxel engine.
 
-        _load_stages(cls, file_path: str) -> tuple[int, int, int, int, list[dict[str, list[dict[str, int]]]]]:     
+            Args:
+                fps (int):                                      render rate (above 60 for high-refresh monitors)
+
+        _load_stages(cls, file_path: str) -> tuple[int, int, int, int, list[dict[str, list[dict[str, int]]]] | StagePack]:     
             * class method
-            Reads the json file and returns data read.
+            Reads the json file (or maps the level pack) and returns data read.
 
             Args:
-                file_path (str):                                a string containing the path to the json file
+                file_path (str):                                a string containing the path to the json file or level pack
+
+        _load_stage(self, stage_index: int) -> None:
+            Builds a stage right away.
+
+        _prefetch_stage(self) -> None:
+            Starts building the current stage in the background of STAGE_TRANSITION.
+
+        _swap_stage(self, prefetch: StagePrefetch) -> None:
+            Makes a fully built stage the current one.
 
         _next_stage(self) -> None:
             Transitions to next stage.
@@ -112,6 +184,12 @@ class BreakoutGame:
         _start_new_game(self) -> None:
             Starts a new game.
 
+        _make_ball(self) -> Ball:
+            Creates a ball using the selected ball backend.
+
+        _update_balls(self) -> None:
+            Moves all balls.
+
         _reset_ball(self) -> None:
             Prepares ball for launch.
         
@@ -119,8 +197,23 @@ class BreakoutGame:
             Launches the ball.
         
         _check_collision(self) -> None:
-            Handles all collisions.
+            Handles all collisions, emitting an event for each into collision_events.
+
+        _score_collision_events(self, events: list[CollisionEvent]) -> None:
+            Applies the score, streak, and powerups of the score objects caught (or missed) this frame.
+
+            Args:
+                events (list[CollisionEvent]):                  collision events of the frame
+
+        _play_collision_sounds(self, events: list[CollisionEvent]) -> None:
+            Plays a single sound for all collisions of the frame (a catch takes priority over a hit).
+
+            Args:
+                events (list[CollisionEvent]):                  collision events of the frame
         
+        _collect_score_objects(self) -> list[tuple[str, int, str | None]]:
+            Removes the score objects that hit the paddle or the bottom, and returns (collision type, points, powerup type) for each.
+
         _check_input(self) -> None:
             Handles user input (depending on the game state).
         
@@ -152,14 +245,11 @@ class BreakoutGame:
         _update_stage_transition_state(self) -> None:
             Handles "stage transition" display and transitioning to next state.
         
-        _update_timers(self) -> None:
-            Handles running of power up timers.
-        
-        _disable_double_points(self) -> None:
-            Disables double points power up.
-        
         _disable_antigravity(self) -> None:
-            Disables antigravity power up.
+            Disables antigravity power up (called by the effect scheduler when it expires).
+
+        _record_session(self) -> None:
+            Hands the stats of the finished game to the session store (written in the background).
         
         _update(self) -> None:
             Handles inputs and paddle movement by player, and which updates to run based on current game state.
@@ -211,90 +301,189 @@ class BreakoutGame:
         
         _draw_streak(self) -> None:
             Displays the current streak no. and the added points.
+
+        snapshot(self) -> bytes:
+            Packs the whole simulation state (including the rng) into a compact blob.
+
+        restore(self, blob: bytes) -> None:
+            Restores the simulation state from a blob made by snapshot.
+
+            Args:
+                blob (bytes):                                   snapshot to restore
+
+        _check_profiler_keys(self) -> None:
+            Toggles the profiler overlay and quality readout (F1) and exports the profiled frames (F2).
         
         _draw(self) -> None:
             Draws the background and calls the appropriate drawing method based on the current game state.
         
     
     """
-    def __init__(self) -> None:
+    def __init__(self, runtime: Runtime | None = None, stages_path: str = "../src/stages.json", use_ball_pool: bool = False, use_reward_field: bool = False, render_fps: int = 60) -> None:
         """ Constructor """
-        self._init_pyxel()                                      # initializes pyxel settings
+        if runtime is None:
+            self._init_pyxel(fps=render_fps)                    # initializes pyxel settings
+            runtime = PyxelRuntime()
+        budget_ms = 1000 / render_fps                           # time available per rendered frame
+        self.rt: Runtime = runtime                              # source of input, clock, randomness and audio
+        self.profiler: FrameProfiler = FrameProfiler(budget_ms=budget_ms)    # frame-time instrumentation
+        self.loop: FixedStepLoop | None = None                  # created by run (headless runs call _update directly)
+        self.rewind: RewindBuffer | None = None                 # created by run
+        self.rewinding: bool = False
+        self.quality: QualityGovernor = QualityGovernor(budget_ms=budget_ms)    # adapts trails and background to the frame budget
+        self.session_store: "SessionStore | None" = None        # set by the caller to keep finished games
         self.gravity: float = 0.010
-        self.paddle: Paddle = Paddle()                          # initializes a paddle
+        self.paddle: Paddle = Paddle(self.rt)                   # initializes a paddle
         self.original_paddle_speed: float = self.paddle.speed
         
         # relates to the indicator when game starts
         self.angle: float                                       # angle tracker for indicator
         self.angle_direction: float                             # 1 is left to right, -1 is right to left
         self.angle_cycle_speed: float                           
+        self.launch_speed: float = 2.5                          # speed given to the ball on launch
 
-        self.balls: list[Ball] = [Ball(self.gravity)]           # initially puts a single ball inside list
+        self.ball_pool: "BallPool | None" = None
+        if use_ball_pool:
+            from ball_pool import BallPool                      # NumPy is only needed for this backend
+            self.ball_pool = BallPool(self.rt)
+        self.balls: list[Ball] = [self._make_ball()]            # initially puts a single ball inside list
         self._reset_ball()                                      # makes sure that ball starts at paddle 
 
         self.bricks: list[Brick] = []                           # tracks the list of bricks imported from the current stage
-        self.score_objects: list[Reward] = []                   # tracks the list of score objects currently at play
+        self.brick_grid: BrickGrid = BrickGrid(self.bricks)     # spatial index of the bricks (rebuilt per stage)
+        self.brick_layer: BrickLayer = BrickLayer(self.rt.width, self.rt.height)
+        self.stage_prefetch: StagePrefetch | None = None        # stage built during STAGE_TRANSITION
+        self.score_objects: "list[Reward] | RewardField" = []   # tracks the list of score objects currently at play
+        if use_reward_field:
+            from reward_field import RewardField                # NumPy is only needed for this backend
+            self.score_objects = RewardField(self.rt)
 
         # relates to stage management
-        self.P, self.G, self.X, self.Q, self.stages = self._load_stages("../src/stages.json")
+        self.P, self.G, self.X, self.Q, self.stages = self._load_stages(stages_path)
         self.g = self.G * 60                                    # redefines G (60 fps)
         self.current_stage: int                                 # tracks the current stage no. 
         
         self.current_game_state: GameState                      # game state tracker
-        self.sound: Sounds = Sounds()                           # sound player
+        self.sound: Sounds = Sounds(self.rt)                    # sound player
+        self.effects: EffectScheduler = EffectScheduler()       # timed powerups
+        self.collision_events: EventBus = EventBus()            # collisions are handled once per frame
+        self.collision_counts: EventCounter = EventCounter()
+        self.collision_events.subscribe(self._score_collision_events)
+        self.collision_events.subscribe(self._play_collision_sounds)
+        self.collision_events.subscribe(self.collision_counts)
         self.dropped_timer: float = 0                           # timer for DROPPED state
         self.transition_timer: float = 0                        # timer for STAGE_TRANSITION state
         self._start_new_game()                                  # starts a new game
         
         # dropped state prompts
         self.calcifer_sprites: list[tuple[int, int]] = [(48,64), (88, 64)]
-        self.chosen_skin: tuple[int, int]                       # tracks calcifer sprite
+        self.chosen_skin: tuple[int, int] = self.calcifer_sprites[0]    # tracks calcifer sprite (picked on each drop)
         self.dropped_msgs: list[str] = [
             "Don't do that again, unless you want to feel my wrath. (T-T)",
             "I am an extremely powerful fire demon, I won't let you humiliate me.",
             "Please, don't drop me again.",
             "What are you doing?!?!?",
             ]
-        self.chosen_msg: str
+        self.chosen_msg: str = self.dropped_msgs[0]
 
         # relates to streak
         self.streak_count: int = 0
         self.streak_timer: int = 0
 
-        pyxel.run(update=self._update, draw=self._draw)                     # runs game loop
-  
+    def run(self, rewind: bool = True) -> None:
+        """ Runs the pyxel game loop """
+        import pyxel
+        if rewind:
+            self.rewind = RewindBuffer(seconds=60)              # a few MB, even with multiball
+        self.loop = FixedStepLoop(self._step)                   # 60 logic steps per second, whatever the render rate
+        pyxel.run(update=self._tick, draw=self._draw)           # runs game loop
+
+    def _tick(self) -> None:
+        """ Runs zero or more logic steps for this pyxel frame """
+        import pyxel
+        self.quality.begin_frame()                              # frame work = this tick and the following draw
+        self.rt.poll()                                          # keeps key presses of frames without a step
+                                                                # read straight from pyxel, like the profiler keys
+        self.rewinding = self.rewind is not None and pyxel.btn(pyxel.KEY_R)
+        self.loop.tick()
+
+    def _step(self) -> None:
+        """ Runs a logic step, or goes one frame back while rewinding """
+        if self.rewinding and self.current_game_state in {GameState.READY, GameState.RUNNING, GameState.DROPPED}:
+            self._rewind_frame()
+            return
+        self._update()
+        if self.rewind is not None and self.current_game_state == GameState.RUNNING:
+            self.rewind.push(self.snapshot())
+
+    def _rewind_frame(self) -> None:
+        """ Restores the previous frame (without re-simulating anything) """
+        if self.current_game_state == GameState.RUNNING:
+            if len(self.rewind) < 2:
+                return                                          # oldest frame kept
+            self.rewind.pop()                                   # the frame currently shown
+        blob = self.rewind.latest()                             # after a drop, the last frame before it
+        if blob is not None:
+            self.restore(blob)
+
+    def snapshot(self) -> bytes:
+        """ Packs the simulation state into a blob (e.g. for quick saves or bots searching ahead) """
+        return take_snapshot(self)
+
+    def restore(self, blob: bytes) -> None:
+        """ Restores the simulation state from a snapshot blob """
+        restore_snapshot(self, blob)
+
     @classmethod
-    def _init_pyxel(cls) -> None:
+    def _init_pyxel(cls, fps: int = 60) -> None:
         """ Initializes Pyxel engine settings """
+        import pyxel
 
-        pyxel.init(width=450, height=200, display_scale=3, title="Breakout Game", fps=60)
+        pyxel.init(width=450, height=200, display_scale=3, title="Breakout Game", fps=fps)
         pyxel.load(filename="../src/resources.pyxres")                # our resource file
 
     # +++++++++++++++++++++++++++++++++ STAGE MANAGEMENT +++++++++++++++++++++++++++++++++
 
     @classmethod
-    def _load_stages(cls, file_path: str) -> tuple[int, int, int, int, list[dict[str, list[dict[str, int]]]]]:
-        """ Load stages from JSON file """
+    def _load_stages(cls, file_path: str) -> tuple[int, int, int, int, list[dict[str, list[dict[str, int]]]] | StagePack]:
+        """ Load stages from JSON file or level pack """
+        if is_stage_pack(file_path):                            # stages are decoded lazily, one per _load_stage
+            pack = StagePack(file_path)
+            return pack.P, pack.G, pack.X, pack.Q, pack
         with open(file_path, "r") as f:
             data = json.load(f)
         return data["P"], data["G"], data["X"], data["Q"], data["stages"]
 
     def _load_stage(self, stage_index: int) -> None:
         """ Load a specific stage """
-        stage = self.stages[stage_index]                        # stages is 0-indexed
-        self.bricks = [
-            Brick(brick["x"], brick["y"], brick["brick_type"], K=pyxel.rndi(a=2,b=4))
-            for brick in stage["bricks"]
-        ]
+        stage = self.stages[stage_index]                        # stages is 0-indexed (a pack only decodes this stage)
+        self._swap_stage(StagePrefetch(stage, self.rt, self.brick_layer).finish())
+
+    def _prefetch_stage(self) -> None:
+        """ Builds the current stage over the frames of STAGE_TRANSITION """
+        stage = self.stages[self.current_stage - 1]
+                                                                # spread over 100 frames, done well before the 120 frame wait ends
+        self.stage_prefetch = StagePrefetch(stage, self.rt, self.brick_layer, steps=100)
+
+    def _swap_stage(self, prefetch: StagePrefetch) -> None:
+        """ Makes the built stage the current one """
+        self.bricks = prefetch.bricks
+        self.brick_grid = prefetch.grid                         # indexes the bricks for collision checks
+        self.brick_layer = prefetch.layer                       # (pre-)rendered bricks
+        self.stage_prefetch = None
+        if self.rewind is not None:
+            self.rewind.clear()                                 # never rewinds into the previous stage
 
     def _next_stage(self) -> None:
         """ Move to the next stage """
         if self.current_stage < len(self.stages):
             self.current_stage += 1
-            self.transition_timer = pyxel.frame_count           # snapshot of frame count
+            self.stats.stage = self.current_stage
+            self.transition_timer = self.rt.frame_count         # snapshot of frame count
             self.streak_count = 0                               # resets streak after each stage cleared
             self.streak_timer = 0 
             self.current_game_state = GameState.STAGE_TRANSITION
+            self._prefetch_stage()                              # builds the next stage during the transition
         else:
             self.current_game_state = GameState.WIN
 
@@ -302,25 +491,44 @@ class BreakoutGame:
 
     def _start_new_game(self) -> None:
         """ Starts a new game """
-        pyxel.stop(ch=1)                                        # mutes channel 1 sounds that were still playing (sound fx)
+        for ch in self.sound.channels.channels:
+            self.rt.stop(ch=ch)                                 # mutes sound fx and cues that were still playing
+        self.sound.channels.reset()                             # every effect channel is free again
         self.stats = GameStats()
         self.paddle.speed = self.original_paddle_speed          # resets paddle speed
         self.score_objects.clear()                              # resets score objects tracker
         self.bricks.clear()                                     # resets old bricks (if there are any)
         self.current_stage = 1                                  # sets the current stage to the first one (1-indexed)
         self.transition_timer = 0                               
+        self.stage_prefetch = None                              # drops a stage that was still being built
         self._load_stage(self.current_stage - 1)                # loads the current stage
         self._reset_ball()                                      # resets ball position to paddle
         self.current_game_state = GameState.START 
         self.sound.game_over_played = False 
         self.sound.win_played = False 
-        pyxel.mouse(visible=True)                                       # enables mouse cursor view
-        pyxel.playm(msc=0, loop=True)                               # plays bgm
+        self.rt.mouse(visible=True)                             # enables mouse cursor view
+        self.rt.playm(msc=0, loop=True)                         # plays bgm
         
+    def _make_ball(self) -> Ball:
+        """ Creates a ball with the selected backend """
+        if self.ball_pool is not None:
+            return self.ball_pool.spawn(self.gravity)
+        return Ball(self.gravity, self.rt)
+
+    def _update_balls(self) -> None:
+        """ Moves all balls """
+        if self.ball_pool is not None:
+            self.ball_pool.update()                             # moves the whole pool at once
+        else:
+            for ball in self.balls:
+                ball.update()                                   # moves the ball
+
     def _reset_ball(self):
         """ Resets the ball to paddle """
         while len(self.balls) > 1:
-            self.balls.pop()                                    # leaves a single ball
+            ball = self.balls.pop()                             # leaves a single ball
+            if self.ball_pool is not None:
+                self.ball_pool.release(ball)
         
         self.balls[0].clear_trails()                            # removes trails that could still be up
         self.balls[0].x = self.paddle.x + self.paddle.w / 2 - self.balls[0].r 
@@ -340,34 +548,48 @@ class BreakoutGame:
     def _launch_ball(self):
         """ Launches the ball based on the current angle """
         angle_rad: float = radians(self.angle)
-        self.balls[0].speed_x = cos(angle_rad) * 2.5
-        self.balls[0].speed_y = -sin(angle_rad) * 2.5
+        self.balls[0].speed_x = cos(angle_rad) * self.launch_speed
+        self.balls[0].speed_y = -sin(angle_rad) * self.launch_speed
 
         # transitions to running state
         self.current_game_state = GameState.RUNNING
 
     def _check_collision(self) -> None:
         """ Checks for all kinds of collisions """
+        candidates, n = None, 0
+        if self.ball_pool is not None:                          # the pool rules out the balls touching nothing at once
+            candidates, n = self.ball_pool.collision_candidates(self.paddle, self.brick_grid), len(self.ball_pool)
+
         # Ball vs Paddle
         for ball in self.balls: # loop through all balls in stage currently
+            if candidates is not None and ball.index < n and ball.index not in candidates:
+                continue                                        # (balls made below weren't tested, so they always are)
             paddle_collision = ball.detect_collision(self.paddle)
             if paddle_collision:
-                self.sound.play_ball_hit_sound()
+                self.collision_events.emit(CollisionEvent(EventType.PADDLE_HIT))
 
             # Ball vs Bricks
-            for i in reversed(range(len(self.bricks))):         # checks all bricks for collisions
-                b: Brick = self.bricks[i]
-
+            next_x = ball.x + ball.speed_x                      # only bricks near the ball's swept bounding box are checked
+            next_y = ball.y + ball.speed_y
+            nearby_bricks = self.brick_grid.query(
+                left=min(ball.x, next_x),
+                top=min(ball.y, next_y),
+                right=max(ball.x, next_x) + 2 * ball.r,
+                bottom=max(ball.y, next_y) + 2 * ball.r
+            )
+            for b in nearby_bricks:                             # checks the nearby bricks for collisions
                 brick_collision = ball.detect_collision(b)
                 if brick_collision:
-                    self.sound.play_ball_hit_sound()
+                    self.collision_events.emit(CollisionEvent(EventType.BRICK_HIT, brick_type=b.brick_type))
+                    if b.health != -1:                          # damaged or destroyed, so its sprite changes
+                        self.brick_layer.invalidate(b)
                     
                     if ball.destroy_brick:
                         if b.brick_type == 5:                   # if it is a ball maker   
-                            new_ball = Ball(self.gravity)       # new ball is made
+                            new_ball = self._make_ball()        # new ball is made
                             # angle in radians
-                            angle = radians(pyxel.rndi(a=0, b=360))
-                            speed = pyxel.rndf(a=1,b=new_ball.MAX_SPEED)
+                            angle = radians(self.rt.rndi(a=0, b=360))
+                            speed = self.rt.rndf(a=1,b=new_ball.MAX_SPEED)
 
                             # sets speed in the x and y direction
                             new_ball.speed_x = speed * cos(angle)
@@ -382,48 +604,72 @@ class BreakoutGame:
                         else:
                             # if not a ball maker, spawns K score objects
                             self._spawn_score_objects(b.K, b)
-                        del self.bricks[i]                      # removes collided with destructible bricks
+                        self.bricks.remove(b)                   # removes collided with destructible bricks
+                        self.brick_grid.remove(b)
+                        self.collision_events.emit(CollisionEvent(EventType.BRICK_DESTROYED, brick_type=b.brick_type))
                         ball.destroy_brick = False              # reset
                     break
     
         # Reward vs World (Paddle and Bottom)
+        for collision_type, points, powerup_type in self._collect_score_objects():
+            event_type = EventType.REWARD_CAUGHT if collision_type == "paddle" else EventType.REWARD_MISSED
+            self.collision_events.emit(CollisionEvent(event_type, points=points, powerup_type=powerup_type))
+
+    def _score_collision_events(self, events: list[CollisionEvent]) -> None:
+        """ Applies score, streak, and powerups of the score objects (in the order they were collected) """
+        for event in events:
+            if event.type == EventType.REWARD_CAUGHT:
+                self.streak_count += 1
+                self.streak_timer = 60                          # displays streak message for 1 second (60 frames)
+
+                # calculates added points with streak multiplier
+                streak_bonus = (self.streak_count - 1) * self.Q  
+                added_points = event.points + streak_bonus
+                
+                if event.powerup_type: # if it is a powerup
+                    self._apply_powerup(event.powerup_type)
+                # checks if double points is active
+                if self.effects.active("double_points"):
+                    added_points *= 2                           # doubles the points of objects collided with (including the added bonus)
+                self.stats.score += added_points
+            elif event.type == EventType.REWARD_MISSED:
+                self.streak_count = 0                           # resets streak
+                self.streak_timer = 0                           # clears streak display
+
+    def _play_collision_sounds(self, events: list[CollisionEvent]) -> None:
+        """ Plays one sound per frame instead of one per collision """
+        if any(event.type == EventType.REWARD_CAUGHT for event in events):
+            self.sound.play_reward_sound()                      # the same channel would cut a hit sound off anyway
+        elif any(event.type in {EventType.PADDLE_HIT, EventType.BRICK_HIT} for event in events):
+            self.sound.play_ball_hit_sound()
+
+    def _collect_score_objects(self) -> list[tuple[str, int, str | None]]:
+        """ Removes score objects that hit the paddle or the bottom of the window (latest spawned first) """
+        if not isinstance(self.score_objects, list):
+            return self.score_objects.collect(self.paddle)      # whole field is tested at once
+
+        collisions: list[tuple[str, int, str | None]] = []
         for i in reversed(range(len(self.score_objects))):
             r = self.score_objects[i]
             collision_type, points = r.collides(self.paddle)
             if collision_type is not None: # if it collides
-                if collision_type == "paddle":
-                    self.sound.play_reward_sound()
-                    self.streak_count += 1
-                    self.streak_timer = 60                      # displays streak message for 1 second (60 frames)
-
-                    # calculates added points with streak multiplier
-                    streak_bonus = (self.streak_count - 1) * self.Q  
-                    added_points = points + streak_bonus
-                    
-                    if r.powerup_type: # if it is a powerup
-                        self._apply_powerup(r.powerup_type)
-                    # checks if the timer is there and double points is set to True
-                    if hasattr(self, "double_points_timer") and self.double_points:
-                        added_points *= 2                       # doubles the points of objects collided with (including the added bonus)
-                    self.stats.score += added_points
-                else:
-                    self.streak_count = 0                       # resets streak
-                    self.streak_timer = 0                       # clears streak display
+                collisions.append((collision_type, points, r.powerup_type))
                 del self.score_objects[i]
+        return collisions
                 
     def _check_input(self) -> None:
         """ Checks for inputs by user (depending on the game state)"""
         if self.current_game_state == GameState.READY:
              # press left mouse click or space bar to launch ball
-            if pyxel.btnp(key=pyxel.MOUSE_BUTTON_LEFT) or pyxel.btnp(key=pyxel.KEY_SPACE):
+            if self.rt.btnp(key=MOUSE_BUTTON_LEFT) or self.rt.btnp(key=KEY_SPACE):
                 self.sound.play_launch_sound()
                 self._launch_ball()                             # launches the ball
     
         if self.current_game_state in {GameState.GAME_OVER, GameState.WIN}:
             # press enter to start a new game
-            if pyxel.btnp(key=pyxel.KEY_RETURN): 
+            if self.rt.btnp(key=KEY_RETURN): 
                 self._start_new_game()
-                pyxel.playm(msc=0, loop=True)                       # restarts background music
+                self.rt.playm(msc=0, loop=True)                 # restarts background music
 
     def _spawn_score_objects(self, K: int, brick: Brick) -> None:
         """ Spawns K rectangular score objects within the bounds of a hit brick """
@@ -448,6 +694,10 @@ class BreakoutGame:
         for i in range(K):
             spawn_x, spawn_y = positions[i]                     # uses predefined positions directly
 
+            if not isinstance(self.score_objects, list):        # packs the object into the reward field
+                self.score_objects.spawn(x=spawn_x, y=spawn_y, points=self.P, falling_accel=self.gravity, X=self.X)
+                continue
+
             # appends reward object  
             self.score_objects.append(
                 Reward(
@@ -455,46 +705,43 @@ class BreakoutGame:
                     y=spawn_y,
                     points=self.P,
                     falling_accel=self.gravity,
-                    X=self.X
+                    X=self.X,
+                    runtime=self.rt
                 )
             )
         
     def _apply_powerup(self, powerup_type: str) -> None:
         """ Applies the effect of a power-up based on its type """
+        self.stats.powerups[powerup_type] = self.stats.powerups.get(powerup_type, 0) + 1
         if powerup_type == "life_up":                           # (*carries over)
             self.stats.lives += 1                               
         elif powerup_type == "antigravity":                     # has duration G (*doesn't carry over)
             for ball in self.balls:
                 ball.gravity = 0                                
-            if hasattr(self, "antigravity_timer"):              
-                self.antigravity_timer += self.g
-            else:                
-                self.antigravity_timer = self.g                 
+                                                                # stacks if already active
+            self.effects.start("antigravity", self.g, on_expire=self._disable_antigravity)
         elif powerup_type == "paddle_speed":                    # (*carries over)
             self.paddle.speed += 0.20              
         elif powerup_type == "double_points":                   # has duration G (*doesn't carry over)
-            self.double_points = True                           
-            if hasattr(self, "double_points_timer"):
-                self.double_points_timer += self.g              
-            else:
-                self.double_points_timer = self.g  
+            self.effects.start("double_points", self.g)         # stacks if already active
 
 # +++++++++++++++++++++++++++++++++ UPDATE METHODS +++++++++++++++++++++++++++++++++
 
     def _update_start_state(self) -> None:
         """ Update logic for START state """
         # transitions to READY state when the player presses the Play button
-        if pyxel.btnp(key=pyxel.MOUSE_BUTTON_LEFT):                 # left mouse click on button to start
-            mouse_x, mouse_y = pyxel.mouse_x, pyxel.mouse_y
+        if self.rt.btnp(key=MOUSE_BUTTON_LEFT):                 # left mouse click on button to start
+            mouse_x, mouse_y = self.rt.mouse_x, self.rt.mouse_y
 
                                                                 # checks if the mouse is within the Play button areas
-            button_x, button_y = pyxel.width // 2 - 30, pyxel.height // 2 + 50
+            button_x, button_y = self.rt.width // 2 - 30, self.rt.height // 2 + 50
             button_width, button_height = 60, 15
 
             if button_x <= mouse_x <= button_x + button_width and button_y <= mouse_y <= button_y + button_height:
-                pyxel.mouse(visible=False) 
-                self.transition_timer = pyxel.frame_count
+                self.rt.mouse(visible=False) 
+                self.transition_timer = self.rt.frame_count
                 self.current_game_state = GameState.STAGE_TRANSITION
+                self._prefetch_stage()                          # builds the first stage during the transition
                 self.sound.play_clicked_button_sound()
                 
     def _update_ready_state(self) -> None:
@@ -514,53 +761,65 @@ class BreakoutGame:
         if self.streak_timer > 0:
             self.streak_timer -= 1
 
-        self._update_timers()
+        self.effects.advance()                                  # powerup time only passes while RUNNING
+        self.profiler.lap("timers")
 
-        for ball in self.balls:
-            ball.update()                                       # moves the ball
+        self._update_balls()                                    # moves the balls
+        self.profiler.lap("balls")
         
-        for r in self.score_objects:                            # moves the score objects
-            r.update()
+        if isinstance(self.score_objects, list):
+            for r in self.score_objects:                        # moves the score objects
+                r.update()
+        else:
+            self.score_objects.update()                         # moves the whole field at once
+        self.profiler.lap("rewards")
 
         self._check_collision()                                 # checks for collisions
+        self.collision_events.drain()                           # scores, sounds, and counts this frame's collisions
+        self.profiler.lap("collision")
         
         # if all bricks cleared not including indestructible brick (stage cleared)
         if not self.bricks or all(brick.brick_type == 4 for brick in self.bricks): 
             if not self.score_objects:                          # if there are no score objects in the screen
-                if hasattr(self, "antigravity_timer"):
-                    self._disable_antigravity()
-                if hasattr(self, "double_points"):
-                    self._disable_double_points()
+                self.effects.expire_all()                       # powerups don't carry over to the next stage
                 if self.current_stage == len(self.stages):      # last stage cleared
                     self.current_game_state = GameState.WIN
-                    pyxel.stop()
+                    self.rt.stop()
                 else:
                     self._next_stage()
 
                                                                 # removes all balls that are out of bounds
         if len(self.balls) > 1:
-            self.balls = [ball for ball in self.balls if not ball.out_of_bounds]
+            if self.ball_pool is not None:
+                dropped_balls = self.ball_pool.out_of_bounds_balls()    # read from the pool's flags at once
+                if dropped_balls:
+                    dropped = set(dropped_balls)
+                    self.balls = [ball for ball in self.balls if ball not in dropped]
+                    for ball in dropped_balls:
+                        self.ball_pool.release(ball)            # frees their slots in the pool
+            else:
+                self.balls = [ball for ball in self.balls if not ball.out_of_bounds]
 
                                                                 # checks if all balls are out of bounds
         if len(self.balls) == 1:                                # checks if there is only one ball left
             if self.balls[0].out_of_bounds:                     # checks if that singular ball is out of bounds
-                self.chosen_skin = choice(self.calcifer_sprites)  
-                self.chosen_msg = choice(self.dropped_msgs)  
+                self.chosen_skin = self.rt.choice(self.calcifer_sprites)  
+                self.chosen_msg = self.rt.choice(self.dropped_msgs)  
                 self.stats.lives -= 1
                 if self.stats.lives > 0:
                     self.current_game_state = GameState.DROPPED
                 else:
                     self.current_game_state = GameState.GAME_OVER
-                    pyxel.stop()  
+                    self.rt.stop()  
                  
     def _update_dropped_state(self) -> None:
         """ Updates logic for DROPPED state """
                                                                 # shows DROPPED screen and resets the ball after a delay
         if self.dropped_timer == 0:
-            self.dropped_timer = pyxel.frame_count  
+            self.dropped_timer = self.rt.frame_count  
 
                                                                 # waits for 120 frames (2 seconds at 60 FPS)
-        if pyxel.frame_count - self.dropped_timer > 120:
+        if self.rt.frame_count - self.dropped_timer > 120:
             # resets
             self.dropped_timer = 0 
             self._reset_ball()  
@@ -568,38 +827,42 @@ class BreakoutGame:
 
     def _update_stage_transition_state(self) -> None:
         """ Update logic for STAGE_TRANSITION state """
+        if self.stage_prefetch is not None:
+            self.stage_prefetch.step()                          # builds a few more bricks of the next stage
+
                                                                 # waits for 120 frames (2 seconds at 60 FPS)
-        if pyxel.frame_count - self.transition_timer > 120:
-            self._load_stage(self.current_stage - 1)            # loads the next stage
+        if self.rt.frame_count - self.transition_timer > 120:
+            if self.stage_prefetch is not None:
+                self._swap_stage(self.stage_prefetch.finish())  # next stage is already built
+            else:
+                self._load_stage(self.current_stage - 1)        # loads the next stage
             self._reset_ball()
             self.current_game_state = GameState.READY
     
-    def _update_timers(self) -> None:
-        """ Update timers based on game state """
-        if self.current_game_state == GameState.RUNNING:
-            if hasattr(self, "double_points_timer"):
-                self.double_points_timer -= 1                   # decrements timer in RUNNING state
-            if hasattr(self, "antigravity_timer"):
-                self.antigravity_timer -= 1                     # decrements timer in RUNNING state
-    
-    def _disable_double_points(self) -> None:
-        """ Disables double points power up"""
-        self.double_points = False                              # deactivates double points
-        if hasattr(self, "double_points_timer"):
-            del self.double_points_timer                        # removes the timer
-    
     def _disable_antigravity(self) -> None:
         """ Disables antigravity power up """
         for ball in self.balls:
             ball.gravity = self.gravity                         # restores gravity for all balls
-        if hasattr(self, "antigravity_timer"):
-            del self.antigravity_timer                          # removes the timer
+
+    def _record_session(self) -> None:
+        """ Records the finished game (queued, so the frame never waits for the disk) """
+        if self.session_store is not None:
+            from session_store import SessionRecord             # NumPy is only needed when games are recorded
+            won = self.current_game_state == GameState.WIN
+            self.session_store.append(SessionRecord.from_stats(self.stats, won=won, seed=self.rt.seed))
 
     def _update(self) -> None:
         """ General update method """
+        self.profiler.begin_frame(self.rt.frame_count)
+        self.rt.begin_frame()                                   # reads this frame's input
         self._check_input()
+        self.profiler.lap("input")
         self.paddle.update()
+        self.profiler.lap("paddle")
 
+        previous_state = self.current_game_state
+        if previous_state not in {GameState.START, GameState.GAME_OVER, GameState.WIN}:
+            self.stats.frames += 1                              # time spent playing
         match self.current_game_state:
             case GameState.START:
                 self._update_start_state()
@@ -616,9 +879,18 @@ class BreakoutGame:
             case GameState.WIN:
                 self.sound.play_win_sound()
 
+        if self.current_game_state == GameState.RUNNING:
+            self.effects.expire_due()                           # runs after the state update, right before drawing
+        elif self.current_game_state != previous_state and self.current_game_state in {GameState.GAME_OVER, GameState.WIN}:
+            self._record_session()                              # the game just ended
+        self.profiler.lap("state")                              # rest of the state update
+
+        self.rt.end_frame()                                     # advances the clock
+
 # +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
     def _draw_start_state(self) -> None:
         """ Draw elements for START state """
+        import pyxel
         
                                                                 # game title
         pyxel.blt(
@@ -639,7 +911,7 @@ class BreakoutGame:
         # format: (bg, text)
         button_color_bg_text: tuple[int, int] = (pyxel.COLOR_RED, pyxel.COLOR_WHITE) 
         
-        if button_x <= pyxel.mouse_x <= button_x + button_width and button_y <= pyxel.mouse_y <= button_y + button_height: # if hovered over button
+        if button_x <= self.rt.mouse_x <= button_x + button_width and button_y <= self.rt.mouse_y <= button_y + button_height: # if hovered over button
             button_color_bg_text = (pyxel.COLOR_PURPLE, pyxel.COLOR_GRAY)
                                                                 # draw button background
         pyxel.rect(x=button_x, y=button_y, w=button_width, h=button_height, col=button_color_bg_text[0])
@@ -656,6 +928,7 @@ class BreakoutGame:
 
     def _draw_ready_state(self) -> None:
         """ Draws elements for READY state """
+        import pyxel
         self._draw_ui()                                         # draws the ui
 
 
@@ -676,7 +949,7 @@ class BreakoutGame:
         self._draw_game_elements()                              # draws the paddle, ball, and bricks, and (score objects if any)
 
                                                                 # adds blinking text instruction
-        if (pyxel.frame_count // 30) % 2 == 0:                  # toggles every 30 frames  
+        if (self.rt.frame_count // 30) % 2 == 0:                # toggles every 30 updates (same speed at any render rate)
             pyxel.text(
                 x=pyxel.width // 2 - 80,  
                 y=pyxel.height // 2,  
@@ -692,6 +965,7 @@ class BreakoutGame:
         
     def _draw_dropped_state(self) -> None:
         """Draws the DROPPED state screen."""
+        import pyxel
         pyxel.cls(col=pyxel.COLOR_LIGHT_BLUE)                   # background
 
         if self.dropped_timer == 0:                             # only plays sound the first frame it starts drawing
@@ -720,7 +994,10 @@ class BreakoutGame:
 
     def _draw_stage_transition_state(self) -> None:
         """ Draws elements for STAGE_TRANSITION state """
+        import pyxel
         pyxel.cls(col=pyxel.COLOR_BLACK)                        # background
+        if self.stage_prefetch is not None:
+            self.stage_prefetch.prerender()                     # renders the bricks built this frame off-screen
         message = f"Stage {self.current_stage}"
         pyxel.text(
             x=pyxel.width // 2 - len(message) * 2.5,  
@@ -732,6 +1009,7 @@ class BreakoutGame:
 
     def _draw_game_over_state(self) -> None:
         """ Draws the GAME_OVER state """
+        import pyxel
         
                                                                 # "GAME OVER" text
         pyxel.blt(x=139, y=80, img=0, u=48, v=32, w=176, h=16, colkey=pyxel.COLOR_LIGHT_BLUE, scale=2)
@@ -741,6 +1019,7 @@ class BreakoutGame:
     
     def _draw_win_state(self) -> None:
         """ Draws the WIN state """
+        import pyxel
                                                                 # "YOU WIN" text
         pyxel.blt(x=168, y=80, img=0, u=48, v=48, w=136, h=16, colkey=pyxel.COLOR_LIGHT_BLUE, scale=2)
         pyxel.text(x=175, y=130, s="Press Enter to Play Again.", col=pyxel.COLOR_BLACK, font=None)
@@ -754,24 +1033,19 @@ class BreakoutGame:
             width, height = 60, 6                               # dimensions of the timer bar         
 
                                                                 # draws Double Points Timer if active
-            if hasattr(self, "double_points_timer"):
-                remaining_time = max(0, self.double_points_timer)
-                if remaining_time > 0:                          
-                    self._draw_timer(x, y, width, height, remaining_time, self.g, "Double Points")
-                    y += 15                                     # space between timers
-                else:
-                    self._disable_double_points()
+            remaining_time = self.effects.remaining("double_points")
+            if remaining_time > 0:                          
+                self._draw_timer(x, y, width, height, remaining_time, self.g, "Double Points")
+                y += 15                                         # space between timers
 
                                                                 # draws Antigravity Timer if active
-            if hasattr(self, "antigravity_timer"):
-                remaining_time = max(0, self.antigravity_timer)
-                if remaining_time > 0:                  
-                    self._draw_timer(x, y, width, height, remaining_time, self.g, "Antigravity")
-                else:
-                    self._disable_antigravity()
+            remaining_time = self.effects.remaining("antigravity")
+            if remaining_time > 0:                  
+                self._draw_timer(x, y, width, height, remaining_time, self.g, "Antigravity")
 
     def _draw_timer(self, x: float, y: float, width: float, height: float, remaining_time: int, max_time: int, label: str) -> None:
         """ Draws a single timer bar with a label """
+        import pyxel
                                                                 # ensures the filled width is clamped between 0 and width
         filled_width = int((remaining_time / max_time) * width) if remaining_time > 0 else 0
         filled_width = min(width, filled_width)                 # ensures it never exceeds the bar width
@@ -796,33 +1070,47 @@ class BreakoutGame:
 
     def _draw_game_elements(self) -> None:
         """ Draws the paddle, ball/s, and bricks """
+        import pyxel
+                                                                # moving objects are drawn between the last two logic steps
+        alpha = self.loop.alpha if self.loop is not None and self.current_game_state == GameState.RUNNING else 1.0
         # checks if game state is RUNNING state
         if self.current_game_state == GameState.RUNNING:
                                                                 # draws paddle speed when game is in RUNNING
-            pyxel.text(x=10,y=pyxel.height - 10, s=f"Paddle Speed: {"%.2f" % self.paddle.speed}", col=pyxel.COLOR_BLACK, font=None) 
+            pyxel.text(x=10,y=pyxel.height - 10, s=f"Paddle Speed: {self.paddle.speed:.2f}", col=pyxel.COLOR_BLACK, font=None) 
                                                                 # draws streak
             self._draw_streak()
 
                                                                 # draws powerup timers (if applicable)
             self._draw_powerup_timers()
+        self.profiler.lap("draw.ui")
             
                                                                 # draws paddle
         self.paddle.draw()
+        self.profiler.lap("draw.paddle")
         
-                                                                # draws all bricks
-        for brick in self.bricks:
-            brick.draw()
+                                                                # draws all bricks (single blit of the cached layer)
+        self.brick_layer.draw(self.bricks, self.brick_grid)
+        self.profiler.lap("draw.bricks")
         
                                                                 # draws all score objects
-        for r in self.score_objects:
-            r.draw()
+        if isinstance(self.score_objects, list):
+            for r in self.score_objects:
+                r.draw(alpha)
+        else:
+            self.score_objects.draw(alpha)
+        self.profiler.lap("draw.rewards")
         
-                                                                # draws ball/s
+                                                                # draws ball/s (all trails in one pass, then the sprites)
+        if self.quality.draws_trails(self.rt.frame_count):
+            TRAIL_RENDERER.length = self.quality.settings.trail_length
+            TRAIL_RENDERER.draw([ball.trail for ball in self.balls], self.rt.frame_count)
         for ball in self.balls:
-            ball.draw()
+            ball._draw_ball(alpha)
+        self.profiler.lap("draw.balls")
 
     def _draw_ui(self) -> None:
         """ Draw UI elements like score and lives """
+        import pyxel
         heart_x: float = 10                                     # starting pos for hearts
         heart_y: float = 10  
         heart_spacing: float = 12                               # spacing between each heart
@@ -847,6 +1135,10 @@ class BreakoutGame:
     
     def _draw_background(self) -> None:
         """ Draws the background """
+        import pyxel
+        if self.quality.settings.cheap_background:
+            pyxel.cls(col=pyxel.COLOR_CYAN)                     # sky color of the background image, no scaled blit
+            return
         
                                                                 # draws background image
         pyxel.blt(
@@ -862,9 +1154,10 @@ class BreakoutGame:
     
     def _draw_streak(self) -> None:
         """ Draws impact of each score object received """
+        import pyxel
 
         points: int = self.P + ((self.streak_count - 1) * self.Q)
-        if hasattr(self, "double_points_timer"):                # checks if double points is active
+        if self.effects.active("double_points"):                # checks if double points is active
             points *= 2
         
         if self.streak_count > 1 and self.streak_timer > 0:
@@ -877,9 +1170,20 @@ class BreakoutGame:
                 font=None
             )
 
+    def _check_profiler_keys(self) -> None:
+        """ Debug keys of the profiler (read straight from pyxel, so they are never recorded in replays) """
+        import pyxel
+        if pyxel.btnp(pyxel.KEY_F1):
+            self.profiler.visible = not self.profiler.visible
+        if pyxel.btnp(pyxel.KEY_F2):
+            self.profiler.export_jsonl("profile.jsonl")
+
     def _draw(self) -> None:
         """ General drawing method """
+        import pyxel
+        self.profiler.begin_frame(self.rt.frame_count)          # a slot of its own (a tick may run 0 or several updates)
         self._draw_background()
+        self.profiler.lap("draw.background")
         match self.current_game_state:
             case GameState.START:
                 self._draw_start_state()
@@ -895,5 +1199,68 @@ class BreakoutGame:
                 self._draw_game_over_state()
             case GameState.WIN:
                 self._draw_win_state()
+        if self.rewinding and self.rewind:
+            pyxel.text(x=pyxel.width // 2 - 30, y=30, s=f"<< REWIND {len(self.rewind) / 60:.1f}s", col=pyxel.COLOR_RED, font=None)
+        self.profiler.lap("draw.ui")                            # ui and the screens of the other states
+
+        self._check_profiler_keys()
+        if self.profiler.visible:
+            self.profiler.draw(x=300, y=40)
+            self.quality.draw(x=300, y=168)                     # right below the profiler overlay
+        self.quality.end_frame()
         
-BreakoutGame() # game call
+if __name__ == "__main__":
+    import argparse
+    import atexit
+    from replay import Replay, ReplayRuntime, play_headless
+    from replay_pack import ReplayPack, ReplayPackRecorder, is_replay_pack
+
+    parser = argparse.ArgumentParser(description="CALCIFER'S COOKOUT")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the session (random if omitted)")
+    parser.add_argument("--record", metavar="FILE", help="records the session into a seekable replay file")
+    parser.add_argument("--replay", metavar="FILE", help="plays back a replay file")
+    parser.add_argument("--seek-stage", type=int, default=None, help="starts a seekable replay at the given stage")
+    parser.add_argument("--seek-frame", type=int, default=0, help="starts a seekable replay at the given frame")
+    parser.add_argument("--headless", action="store_true", help="fast-forwards the replay without a window")
+    parser.add_argument("--autopilot", action="store_true", help="lets the autopilot play (attract mode)")
+    parser.add_argument("--render-fps", type=int, default=60, help="render rate, e.g. 144 for high-refresh monitors (logic stays at 60)")
+    parser.add_argument("--stages", default="../src/stages.json", help="stages JSON file or compiled level pack")
+    parser.add_argument("--sessions", default="../src/sessions.ccsl", help="log the finished games are recorded into (empty to disable)")
+    args, _ = parser.parse_known_args()                         # ignores the arguments of `pyxel play`
+
+    pack = ReplayPack(args.replay) if args.replay and is_replay_pack(args.replay) else None
+    start = pack.stage_frame(args.seek_stage) if pack is not None and args.seek_stage else args.seek_frame
+
+    if args.replay and args.headless:
+        if pack is not None:
+            engine = pack.play_headless(start=start, stages_path=args.stages)    # checks the state at every keyframe
+        else:
+            engine = play_headless(Replay.load(args.replay), stages_path=args.stages)
+        print(f"frames: {engine.frame_count}, stage: {engine.game.current_stage}, "
+              f"state: {engine.game.current_game_state.name}, score: {engine.game.stats.score}")
+    elif args.replay:
+        BreakoutGame._init_pyxel(fps=args.render_fps)
+        replay = pack.to_replay() if pack is not None else Replay.load(args.replay)
+        game = BreakoutGame(runtime=ReplayRuntime(replay), stages_path=args.stages, render_fps=args.render_fps)
+        if pack is not None and start > 0:
+            pack.seek(game, start)                              # jumps straight to the frame
+        game.run(rewind=False)
+    else:
+        BreakoutGame._init_pyxel(fps=args.render_fps)
+        if args.autopilot:
+            from autopilot import AutopilotRuntime
+            runtime = AutopilotRuntime(seed=args.seed)
+        else:
+            runtime = PyxelRuntime(seed=args.seed)
+        game = BreakoutGame(runtime=runtime, stages_path=args.stages, render_fps=args.render_fps)
+        if args.sessions and not args.autopilot:                # attract mode games don't go on the leaderboard
+            from session_store import SessionStore
+            game.session_store = SessionStore(args.sessions)
+            atexit.register(game.session_store.close)
+        if args.autopilot:
+            runtime.game = game                                 # the autopilot reads the game it plays
+        if args.record:
+            runtime.recorder = ReplayPackRecorder(args.record, game)  # takes the first keyframe
+            atexit.register(runtime.recorder.close)
+        # rewinding is off while recording, since a rewound session can't be replayed from its input
+        game.run(rewind=not args.record) # game call
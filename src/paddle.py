@@ -8,7 +8,7 @@ Author: Josh Patiño
 Date: January 01, 2025
 """
 
-import pyxel
+from runtime import Runtime
 
 
 class Paddle:
@@ -17,6 +17,7 @@ class Paddle:
     A player-controlled paddle object used in the game.
 
     Attributes:
+        rt (Runtime):                           runtime providing the input and window size
         w (float):                              width of paddle sprite
         h (float):                              height of paddle sprite
         x (float):                              paddle's x-position
@@ -31,9 +32,12 @@ class Paddle:
         mark_v (int):                           marker v-coordinate
 
     Methods:
-        __init__(self) -> None:
+        __init__(self, runtime: Runtime) -> None:
             Initializes paddle with default position and attributes.
 
+            Args:
+                runtime (Runtime):              runtime providing the input and window size
+
         update(self) -> None:
             Updates paddle position based on input.
 
@@ -41,12 +45,13 @@ class Paddle:
             Renders paddle and marker sprites.
             
     """
-    def __init__(self) -> None:
+    def __init__(self, runtime: Runtime) -> None:
         """ Constructor for paddle """
+        self.rt: Runtime = runtime
         self.w: float = 72                                  # width of the paddle (based on sprite)
         self.h: float = 14                                  # height of the paddle (based on sprite)
-        self.x: float = pyxel.width // 2 - self.w // 2      # starts in the middle of the screen
-        self.y: float = pyxel.height - 30                   # positions it near the bottom
+        self.x: float = self.rt.width // 2 - self.w // 2      # starts in the middle of the screen
+        self.y: float = self.rt.height - 30                   # positions it near the bottom
         self.sprite_img : int = 1                           # the img bank where the paddle is located
         self.sprite_u : int = 0                             # the (u,v) of the paddle in the img (u=0, v=7)    
         self.sprite_v: int = 2
@@ -61,7 +66,7 @@ class Paddle:
 
     def update(self) -> None:
         """ Moves the paddle left and right based on the mouse location with constant velocity """
-        target_x: float = pyxel.mouse_x - self.w / 2        # centers the paddle on the mouse
+        target_x: float = self.rt.mouse_x - self.w / 2        # centers the paddle on the mouse
 
         if self.x < target_x:
             self.x += min(self.speed, target_x - self.x)    # moves right, but not beyond the target
@@ -69,12 +74,13 @@ class Paddle:
             self.x -= min(self.speed, self.x - target_x)    # moves left, but not beyond the target
         
                                                             # keeps the paddle within screen bounds
-        self.x = max(0, min(self.x, pyxel.width - self.w))
+        self.x = max(0, min(self.x, self.rt.width - self.w))
 
 # +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
 
     def draw(self) -> None:
         """ Draw method for paddle """
+        import pyxel
                                                             # draws the full paddle as one image
         pyxel.blt(
             x=self.x,                                       # x-position
@@ -88,8 +94,8 @@ class Paddle:
         )
 
                                                             # draws a vertical line as the mouse x-coordinate marker
-        pyxel.blt(x=pyxel.mouse_x - (5),                    # pointer of hand is shifted by 5
-                y=pyxel.height - self.mark_h,
+        pyxel.blt(x=self.rt.mouse_x - (5),                    # pointer of hand is shifted by 5
+                y=self.rt.height - self.mark_h,
                 img=self.sprite_img,
                 u=self.mark_u,
                 v=self.mark_v,
@@ -0,0 +1,152 @@
+"""
+Module Name: profiler.py
+
+Description:
+    Contains the frame profiler, which times every subsystem of the update and draw
+    steps into a fixed-size ring buffer of frames, shows p50/p99 per section in a
+    toggleable overlay, and exports the recorded frames as JSONL. Updates and draws each
+    open their own slot, since a render tick may run any number of updates (or none).
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import json
+from array import array
+from time import perf_counter
+
+                                                                # timed sections, in the order they run during a frame
+SECTIONS: tuple[str, ...] = (
+    "input",
+    "paddle",
+    "timers",
+    "balls",
+    "rewards",
+    "collision",
+    "state",
+    "draw.background",
+    "draw.paddle",
+    "draw.bricks",
+    "draw.rewards",
+    "draw.balls",
+    "draw.ui",
+)
+
+
+class FrameProfiler:
+    """
+
+    Lap-style profiler: each lap charges the time since the previous lap to a section.
+
+    Attributes:
+        enabled (bool):                             records laps if True
+        visible (bool):                             shows the overlay if True
+        capacity (int):                             no. of frames kept in the ring buffer
+        samples (dict[str, array]):                 seconds spent per section, one slot per frame
+        frames (array):                             frame no. stored in each slot
+        slot (int):                                 slot of the current frame
+        count (int):                                no. of slots filled so far
+        last (float):                               time of the previous lap
+        cached_stats (dict[str, tuple[float, float]]):  p50/p99 shown by the overlay
+        budget_ms (float):                          time available per rendered frame
+
+    Methods:
+        __init__(self, capacity: int = 600, budget_ms: float = 1000 / 60) -> None:
+            Initializes an empty profiler.
+
+            Args:
+                capacity (int):                     no. of frames kept in the ring buffer
+                budget_ms (float):                  time available per rendered frame
+
+        begin_frame(self, frame: int) -> None:
+            Moves to the next slot of the ring buffer and starts timing (once per update and once per draw).
+
+        lap(self, section: str) -> None:
+            Charges the time since the previous lap to a section.
+
+        percentiles(self, section: str) -> tuple[float, float]:
+            Returns the p50 and p99 (in ms) of a section over the recorded frames.
+
+        export_jsonl(self, path: str) -> None:
+            Writes one JSON line per recorded frame (times in ms).
+
+        draw(self, x: int = 300, y: int = 40) -> None:
+            Draws the p50/p99 overlay.
+
+    """
+    def __init__(self, capacity: int = 600, budget_ms: float = 1000 / 60) -> None:
+        """ Constructor """
+        self.budget_ms: float = budget_ms
+        self.enabled: bool = True
+        self.visible: bool = False
+        self.capacity: int = capacity
+        self.samples: dict[str, array] = {name: array("d", bytes(8 * capacity)) for name in SECTIONS}
+        self.frames: array = array("q", bytes(8 * capacity))
+        self.slot: int = -1
+        self.count: int = 0
+        self.last: float = perf_counter()
+        self.cached_stats: dict[str, tuple[float, float]] = {}
+
+# +++++++++++++++++++++++++++++++++ RECORDING METHODS +++++++++++++++++++++++++++++++++
+
+    def begin_frame(self, frame: int) -> None:
+        """ Moves to the next slot of the ring buffer """
+        if not self.enabled:
+            return
+        self.slot = (self.slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames[self.slot] = frame
+        for samples in self.samples.values():
+            samples[self.slot] = 0.0                            # clears the slot's previous frame
+        self.last = perf_counter()
+
+    def lap(self, section: str) -> None:
+        """ Charges the time since the previous lap to a section """
+        if not self.enabled or self.slot < 0:
+            return
+        now = perf_counter()
+        self.samples[section][self.slot] += now - self.last
+        self.last = now
+
+# +++++++++++++++++++++++++++++++++ REPORTING METHODS +++++++++++++++++++++++++++++++++
+
+    def percentiles(self, section: str) -> tuple[float, float]:
+        """ p50 and p99 (in ms) of a section, over the frames where it ran """
+        values = sorted(value for value in self.samples[section][:self.count] if value > 0)
+        if not values:
+            return 0.0, 0.0
+        p50 = values[len(values) // 2]
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        return p50 * 1000, p99 * 1000
+
+    def export_jsonl(self, path: str) -> None:
+        """ Writes the recorded frames (oldest first) as JSON lines """
+        start = (self.slot - self.count + 1) % self.capacity
+        with open(path, "w") as f:
+            for i in range(self.count):
+                slot = (start + i) % self.capacity
+                row = {"frame": self.frames[slot]}
+                row.update({name: round(samples[slot] * 1000, 4) for name, samples in self.samples.items()})
+                f.write(json.dumps(row) + "\n")
+
+# +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
+
+    def draw(self, x: int = 300, y: int = 40) -> None:
+        """ Draws p50/p99 per section (refreshed twice a second) """
+        import pyxel
+        if self.slot % 30 == 0 or not self.cached_stats:
+            self.cached_stats = {name: self.percentiles(name) for name in SECTIONS}
+
+        pyxel.rect(x - 2, y - 2, 148, 8 * (len(SECTIONS) + 2) + 2, pyxel.COLOR_BLACK)
+        pyxel.text(x, y, "section           p50    p99", pyxel.COLOR_WHITE)
+
+        total = 0.0
+        for i, name in enumerate(SECTIONS):
+            p50, p99 = self.cached_stats[name]
+            total += p99
+            col = pyxel.COLOR_RED if p99 > self.budget_ms / 4 else pyxel.COLOR_WHITE
+            pyxel.text(x, y + 8 * (i + 1), f"{name:<16}{p50:6.2f}{p99:7.2f}", col)
+
+                                                                # sum of p99s vs the frame budget
+        col = pyxel.COLOR_RED if total > self.budget_ms else pyxel.COLOR_LIME
+        pyxel.text(x, y + 8 * (len(SECTIONS) + 1), f"sum p99 {total:.2f}/{self.budget_ms:.1f} ms", col)
@@ -0,0 +1,143 @@
+"""
+Module Name: quality.py
+
+Description:
+    Contains the quality governor, which watches how long the recent frames took and steps
+    the cosmetic work down (shorter trails, then trails every other frame, then a plain
+    background) when frames run over budget, and back up once there is headroom again.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """
+
+    Cosmetic settings of a quality level.
+
+    Attributes:
+        trail_length (int):         max no. of trail particles drawn per ball
+        trail_interval (int):       trails are drawn every n-th frame
+        cheap_background (bool):    clears the screen instead of blitting the scaled background image
+
+    """
+    trail_length: int
+    trail_interval: int
+    cheap_background: bool
+
+                                                                # from full quality (0) to the cheapest (3)
+LEVELS: tuple[QualityLevel, ...] = (
+    QualityLevel(trail_length=10, trail_interval=1, cheap_background=False),
+    QualityLevel(trail_length=5, trail_interval=1, cheap_background=False),
+    QualityLevel(trail_length=5, trail_interval=2, cheap_background=False),
+    QualityLevel(trail_length=5, trail_interval=2, cheap_background=True),
+)
+
+
+class QualityGovernor:
+    """
+
+    Picks the quality level from a rolling window of frame times.
+
+    Attributes:
+        level (int):                        current quality level (index into LEVELS)
+        budget_ms (float):                  time available per frame
+        degrade_at (float):                 fraction of the budget above which quality is lowered
+        restore_at (float):                 fraction of the budget below which quality is raised again
+        samples (deque[float]):             work time of the recent frames (in ms)
+        frame_start (float | None):         time the current frame started
+        changes (int):                      no. of level changes so far
+
+    Methods:
+        __init__(self, budget_ms: float = 1000 / 60, window: int = 30, degrade_at: float = 0.9, restore_at: float = 0.6) -> None:
+            Initializes the governor at full quality.
+
+            Args:
+                budget_ms (float):          time available per frame
+                window (int):               no. of frames averaged before deciding
+                degrade_at (float):         fraction of the budget above which quality is lowered
+                restore_at (float):         fraction of the budget below which quality is raised again
+
+        settings(self) -> QualityLevel:
+            * property
+            Cosmetic settings of the current level.
+
+        average_ms(self) -> float:
+            * property
+            Average work time of the recent frames.
+
+        begin_frame(self) -> None:
+            Marks the start of a frame's work.
+
+        end_frame(self) -> None:
+            Marks the end of a frame's work, and changes the level if needed.
+
+        draws_trails(self, frame: int) -> bool:
+            Checks if trails are drawn on this frame.
+
+        draw(self, x: int, y: int) -> None:
+            Draws the debug readout.
+
+    """
+    def __init__(self, budget_ms: float = 1000 / 60, window: int = 30, degrade_at: float = 0.9, restore_at: float = 0.6) -> None:
+        """ Constructor """
+        self.level: int = 0
+        self.budget_ms: float = budget_ms
+        self.degrade_at: float = degrade_at
+        self.restore_at: float = restore_at
+        self.samples: deque[float] = deque(maxlen=window)
+        self.frame_start: float | None = None
+        self.changes: int = 0
+
+    @property
+    def settings(self) -> QualityLevel:
+        """ Cosmetic settings of the current level """
+        return LEVELS[self.level]
+
+    @property
+    def average_ms(self) -> float:
+        """ Average work time of the recent frames """
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def begin_frame(self) -> None:
+        """ Marks the start of a frame's work """
+        self.frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        """ Records the frame's work time and steps the level once a full window was measured """
+        if self.frame_start is None:
+            return                                              # not driven by the game loop (e.g. benchmarks)
+        self.samples.append((perf_counter() - self.frame_start) * 1000)
+        self.frame_start = None
+        if len(self.samples) < self.samples.maxlen:
+            return
+
+                                                                # the gap between both thresholds keeps the level from flickering
+        average = self.average_ms
+        if average > self.budget_ms * self.degrade_at and self.level < len(LEVELS) - 1:
+            self.level += 1
+        elif average < self.budget_ms * self.restore_at and self.level > 0:
+            self.level -= 1
+        else:
+            return
+        self.changes += 1
+        self.samples.clear()                                    # the new level gets a full window before the next change
+
+    def draws_trails(self, frame: int) -> bool:
+        """ Checks if trails are drawn on this frame """
+        return frame % self.settings.trail_interval == 0
+
+# +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
+
+    def draw(self, x: int, y: int) -> None:
+        """ Draws the current level and the average frame time """
+        import pyxel
+        col = pyxel.COLOR_WHITE if self.level == 0 else pyxel.COLOR_YELLOW
+        pyxel.rect(x - 2, y - 2, 148, 10, pyxel.COLOR_BLACK)
+        pyxel.text(x, y, f"quality {self.level}/{len(LEVELS) - 1}  avg {self.average_ms:.2f} ms", col)
@@ -0,0 +1,162 @@
+"""
+Module Name: replay.py
+
+Description:
+    Contains the replay recorder and player. A replay file stores the session seed and the
+    input of every frame, which is enough to re-run the session bit-for-bit, either in the
+    pyxel window at real speed or fast-forwarded headless.
+
+    File format:
+        header:     magic (4s) "CCRP", version (u16), seed (u64)
+        body:       zlib stream of frames, each frame is mouse_x (i16), mouse_y (i16), buttons (u8)
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+from runtime import FrameInput, PyxelRuntime
+
+MAGIC: bytes = b"CCRP"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sHQ")
+FRAME: struct.Struct = struct.Struct("<hhB")
+
+
+class ReplayRecorder:
+    """
+
+    Writes the input of every frame into a replay file while the game runs.
+
+    Attributes:
+        file (BinaryIO):                    replay file being written
+        compressor (zlib._Compress):        compresses the frames
+        buffer (bytearray):                 frames not yet written to the file
+        flush_interval (int):               no. of frames between writes to the file
+        frames (int):                       no. of frames recorded so far
+
+    Methods:
+        __init__(self, path: str, seed: int, flush_interval: int = 60) -> None:
+            Creates the replay file and writes its header.
+
+            Args:
+                path (str):                 path to the replay file
+                seed (int):                 seed of the session being recorded
+                flush_interval (int):       no. of frames between writes to the file
+
+        record(self, frame_input: FrameInput) -> None:
+            Stores the input of a frame.
+
+        flush(self) -> None:
+            Writes the buffered frames so they survive the window being closed.
+
+        close(self) -> None:
+            Finishes the zlib stream and closes the file.
+
+    """
+    def __init__(self, path: str, seed: int, flush_interval: int = 60) -> None:
+        """ Constructor """
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self.compressor = zlib.compressobj(level=9)
+        self.buffer: bytearray = bytearray()
+        self.flush_interval: int = flush_interval
+        self.frames: int = 0
+
+    def record(self, frame_input: FrameInput) -> None:
+        """ Stores the input of a frame """
+        self.buffer += FRAME.pack(frame_input.mouse_x, frame_input.mouse_y, frame_input.buttons)
+        self.frames += 1
+        if self.frames % self.flush_interval == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Writes the buffered frames (the file stays readable up to this point) """
+        if self.file.closed:
+            return
+        self.file.write(self.compressor.compress(bytes(self.buffer)))
+        self.file.write(self.compressor.flush(zlib.Z_SYNC_FLUSH))
+        self.file.flush()
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """ Finishes the replay file """
+        if self.file.closed:
+            return
+        self.file.write(self.compressor.compress(bytes(self.buffer)))
+        self.file.write(self.compressor.flush())
+        self.file.close()
+        self.buffer.clear()
+
+
+@dataclass
+class Replay:
+    """
+
+    A recorded session.
+
+    Attributes:
+        seed (int):                         seed of the session
+        frames (list[FrameInput]):          input of every frame
+
+    """
+    seed: int
+    frames: list[FrameInput] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        """ Reads a replay file (an unfinished recording is read up to its last flush) """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, seed = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a supported replay file")
+
+        body = zlib.decompressobj().decompress(data[HEADER.size:])
+        usable = len(body) - len(body) % FRAME.size
+        frames = [FrameInput(*values) for values in FRAME.iter_unpack(body[:usable])]
+        return cls(seed=seed, frames=frames)
+
+
+class ReplayRuntime(PyxelRuntime):
+    """
+
+    Pyxel runtime that plays back a replay at real speed instead of reading the mouse and keyboard.
+
+    Attributes:
+        replay (Replay):                    replay being played back
+
+    Methods:
+        __init__(self, replay: Replay) -> None:
+            Initializes the runtime with the replay's seed.
+
+        begin_frame(self) -> None:
+            Feeds the recorded input of the current frame (idle once the replay ends).
+
+    """
+    def __init__(self, replay: Replay) -> None:
+        """ Constructor """
+        super().__init__(seed=replay.seed)
+        self.replay: Replay = replay
+
+    def begin_frame(self) -> None:
+        """ Feeds the recorded input of the current frame """
+        if self.frame_count < len(self.replay.frames):
+            self.input = self.replay.frames[self.frame_count]
+        else:
+            self.input = FrameInput(mouse_x=self.input.mouse_x, mouse_y=self.input.mouse_y)
+
+
+def play_headless(replay: Replay, stages_path: str | None = None):
+    """ Fast-forwards a replay without a window and returns the HeadlessEngine at its last frame """
+    from headless import HeadlessEngine, STAGES_PATH            # imported here since headless imports the game
+
+    engine = HeadlessEngine(seed=replay.seed, stages_path=stages_path or STAGES_PATH)
+    for frame_input in replay.frames:
+        engine.step(frame_input)
+    return engine
@@ -0,0 +1,306 @@
+"""
+Module Name: replay_pack.py
+
+Description:
+    Contains the seekable replay format. A session is cut into chunks of a fixed no. of
+    frames, each compressed on its own and starting with a snapshot of the game (a keyframe),
+    so a viewer can jump to any frame or stage by reading a single chunk and simulating at
+    most one chunk's worth of frames. While streaming forward, the state reached at every
+    chunk is checked against the checksum of its keyframe, so a desync shows up right away.
+
+    File format (little-endian):
+        header:     magic (4s) "CCRS", version (u16), seed (u64), codec (u8, 0 zlib / 1 lzma), frames per chunk (u32)
+        chunks:     per chunk, first frame (u32), no. of frames (u32), keyframe crc32 (u32), compressed size (u32),
+                    then the compressed keyframe size (u32), keyframe (snapshot) and frames (replay.FRAME each)
+        index:      per chunk, offset of its header (u64)
+        markers:    per game state change, first frame in the new state (u32), stage (u16), game state (u8)
+        trailer:    index offset (u64), no. of chunks (u32), no. of markers (u32), magic (4s) "CCRI"
+
+    An unfinished recording (no trailer) is still readable, its chunks are found by scanning.
+
+    Usage:
+        python replay_pack.py info session.ccrs
+        python replay_pack.py verify session.ccrs
+        python replay_pack.py convert session.ccrp session.ccrs
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import lzma
+import struct
+import zlib
+from typing import TYPE_CHECKING, BinaryIO
+
+from replay import FRAME, Replay
+from runtime import FrameInput
+
+if TYPE_CHECKING:
+    from headless import HeadlessEngine
+    from main import BreakoutGame
+
+MAGIC: bytes = b"CCRS"
+TRAILER_MAGIC: bytes = b"CCRI"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sHQBI")
+CHUNK: struct.Struct = struct.Struct("<IIII")
+LENGTH: struct.Struct = struct.Struct("<I")
+INDEX_ENTRY: struct.Struct = struct.Struct("<Q")
+MARKER: struct.Struct = struct.Struct("<IHB")
+TRAILER: struct.Struct = struct.Struct("<QII4s")
+CODECS: tuple[str, ...] = ("zlib", "lzma")
+
+
+def is_replay_pack(path: str) -> bool:
+    """ True if the file starts with the seekable replay magic """
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class ReplayPackRecorder:
+    """
+
+    Writes a session into a seekable replay file while the game runs (set it as the runtime's recorder).
+
+    Attributes:
+        file (BinaryIO):                        replay file being written
+        game (BreakoutGame):                    game being recorded (keyframes are its snapshots)
+        codec (int):                            compression of the chunks (index into CODECS)
+        chunk_frames (int):                     no. of frames per chunk
+        keyframe (bytes):                       snapshot the current chunk starts from
+        first_frame (int):                      first frame of the current chunk
+        buffer (bytearray):                     frames of the current chunk
+        offsets (list[int]):                    offset of every chunk written so far
+        markers (list[tuple[int, int, int]]):   (frame, stage, game state) of every game state change
+        last_state (GameState):                 game state of the previous frame
+
+    Methods:
+        __init__(self, path: str, game: BreakoutGame, chunk_frames: int = 600, codec: str = "zlib") -> None:
+            Creates the replay file, writes its header and takes the first keyframe.
+
+            Args:
+                path (str):                     path to the replay file
+                game (BreakoutGame):            game being recorded (before its first update)
+                chunk_frames (int):             no. of frames per chunk (10 seconds by default)
+                codec (str):                    "zlib" (faster) or "lzma" (smaller)
+
+        record(self, frame_input: FrameInput) -> None:
+            Stores the input of a frame, and starts a new chunk once the current one is full.
+
+        close(self) -> None:
+            Writes the last chunk, the index and the trailer, and closes the file.
+
+    """
+    def __init__(self, path: str, game: "BreakoutGame", chunk_frames: int = 600, codec: str = "zlib") -> None:
+        """ Constructor """
+        self.file: BinaryIO = open(path, "wb")
+        self.game: "BreakoutGame" = game
+        self.codec: int = CODECS.index(codec)
+        self.chunk_frames: int = chunk_frames
+        self.file.write(HEADER.pack(MAGIC, VERSION, game.rt.seed, self.codec, chunk_frames))
+        self.keyframe: bytes = game.snapshot()
+        self.first_frame: int = game.rt.frame_count
+        self.buffer: bytearray = bytearray()
+        self.offsets: list[int] = []
+        self.last_state = game.current_game_state
+        self.markers: list[tuple[int, int, int]] = [(self.first_frame, game.current_stage, self.last_state.value)]
+
+    def _write_chunk(self) -> None:
+        """ Compresses and writes the current chunk """
+        payload = LENGTH.pack(len(self.keyframe)) + self.keyframe + self.buffer
+        data = zlib.compress(payload, 9) if CODECS[self.codec] == "zlib" else lzma.compress(payload)
+        self.offsets.append(self.file.tell())
+        frames = len(self.buffer) // FRAME.size
+        self.file.write(CHUNK.pack(self.first_frame, frames, zlib.crc32(self.keyframe), len(data)))
+        self.file.write(data)
+        self.file.flush()                                       # the file stays readable up to this chunk
+        self.buffer.clear()
+
+    def record(self, frame_input: FrameInput) -> None:
+        """ Stores the input of a frame (the game is already at the start of the next one) """
+        if self.file.closed:
+            return
+        self.buffer += FRAME.pack(frame_input.mouse_x, frame_input.mouse_y, frame_input.buttons)
+
+        frame = self.game.rt.frame_count
+        if self.game.current_game_state != self.last_state:     # state changes mark stages, drops, game overs...
+            self.last_state = self.game.current_game_state
+            self.markers.append((frame, self.game.current_stage, self.last_state.value))
+
+        if len(self.buffer) >= self.chunk_frames * FRAME.size:
+            self._write_chunk()
+            self.keyframe = self.game.snapshot()
+            self.first_frame = frame
+
+    def close(self) -> None:
+        """ Finishes the replay file """
+        if self.file.closed:
+            return
+        if self.buffer:
+            self._write_chunk()
+        index_offset = self.file.tell()
+        self.file.write(b"".join(INDEX_ENTRY.pack(offset) for offset in self.offsets))
+        self.file.write(b"".join(MARKER.pack(*marker) for marker in self.markers))
+        self.file.write(TRAILER.pack(index_offset, len(self.offsets), len(self.markers), TRAILER_MAGIC))
+        self.file.close()
+
+
+class ReplayPack:
+    """
+
+    Random-access reader of a seekable replay file.
+
+    Attributes:
+        path (str):                             path to the replay file
+        data (bytes):                           contents of the file
+        seed (int):                             seed of the session
+        codec (int):                            compression of the chunks (index into CODECS)
+        chunk_frames (int):                     no. of frames per chunk
+        offsets (list[int]):                    offset of every chunk
+        markers (list[tuple[int, int, int]]):   (frame, stage, game state) of every game state change
+        frames (int):                           no. of frames in the session
+
+    Methods:
+        __init__(self, path: str) -> None:
+            Reads the header and the index (or scans the chunks of an unfinished recording).
+
+            Args:
+                path (str):                     path to the replay file
+
+        read_chunk(self, chunk: int) -> tuple[int, bytes, list[FrameInput]]:
+            Decodes a chunk into its first frame, keyframe and frames.
+
+        stage_frame(self, stage: int) -> int:
+            First frame of a stage (its STAGE_TRANSITION screen).
+
+        to_replay(self) -> Replay:
+            Decodes the input of every frame (e.g. to play the session back in the window).
+
+        seek(self, game: BreakoutGame, frame: int) -> None:
+            Brings a game to the start of a frame (one chunk read, at most a chunk of frames simulated).
+
+        play_headless(self, start: int = 0, stages_path: str | None = None) -> HeadlessEngine:
+            Fast-forwards from a frame to the end, checking the state at every keyframe.
+
+    """
+    def __init__(self, path: str) -> None:
+        """ Constructor """
+        self.path: str = path
+        with open(path, "rb") as f:
+            self.data: bytes = f.read()
+
+        magic, version, self.seed, self.codec, self.chunk_frames = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a supported replay pack")
+
+        self.offsets: list[int] = []
+        self.markers: list[tuple[int, int, int]] = []
+        if self.data[-len(TRAILER_MAGIC):] == TRAILER_MAGIC:
+            index_offset, chunks, markers, _ = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+            self.offsets = [offset for (offset,) in INDEX_ENTRY.iter_unpack(self.data[index_offset:index_offset + chunks * INDEX_ENTRY.size])]
+            marker_offset = index_offset + chunks * INDEX_ENTRY.size
+            self.markers = list(MARKER.iter_unpack(self.data[marker_offset:marker_offset + markers * MARKER.size]))
+        else:                                                   # unfinished recording, no markers
+            offset = HEADER.size
+            while offset + CHUNK.size <= len(self.data):
+                size = CHUNK.unpack_from(self.data, offset)[3]
+                if offset + CHUNK.size + size > len(self.data):
+                    break                                       # chunk cut off mid-write
+                self.offsets.append(offset)
+                offset += CHUNK.size + size
+
+        self.frames: int = 0
+        if self.offsets:
+            first_frame, frames, _, _ = CHUNK.unpack_from(self.data, self.offsets[-1])
+            self.frames = first_frame + frames
+
+    def read_chunk(self, chunk: int) -> tuple[int, bytes, list[FrameInput]]:
+        """ Decodes a single chunk """
+        offset = self.offsets[chunk]
+        first_frame, frames, checksum, size = CHUNK.unpack_from(self.data, offset)
+        data = self.data[offset + CHUNK.size:offset + CHUNK.size + size]
+        payload = zlib.decompress(data) if CODECS[self.codec] == "zlib" else lzma.decompress(data)
+
+        (length,) = LENGTH.unpack_from(payload)
+        keyframe = payload[LENGTH.size:LENGTH.size + length]
+        if zlib.crc32(keyframe) != checksum:
+            raise ValueError(f"{self.path}: chunk {chunk} is corrupt")
+        inputs = [FrameInput(*values) for values in FRAME.iter_unpack(payload[LENGTH.size + length:])]
+        return first_frame, keyframe, inputs
+
+    def stage_frame(self, stage: int) -> int:
+        """ First frame of a stage """
+        from main import GameState                              # imported here since the game imports pyxel
+
+        for frame, marker_stage, state in self.markers:
+            if marker_stage == stage and state == GameState.STAGE_TRANSITION.value:
+                return frame
+        raise ValueError(f"stage {stage} is never reached in {self.path}")
+
+    def to_replay(self) -> Replay:
+        """ Decodes the input of every frame """
+        frames: list[FrameInput] = []
+        for chunk in range(len(self.offsets)):
+            frames += self.read_chunk(chunk)[2]
+        return Replay(seed=self.seed, frames=frames)
+
+    def _chunk_of(self, frame: int) -> int:
+        """ Chunk holding a frame (every chunk but the last is full) """
+        return max(0, min(frame // self.chunk_frames, len(self.offsets) - 1))
+
+    def seek(self, game: "BreakoutGame", frame: int) -> None:
+        """ Restores the keyframe before the frame, then simulates up to it """
+        first_frame, keyframe, inputs = self.read_chunk(self._chunk_of(frame))
+        game.restore(keyframe)
+        for frame_input in inputs[:frame - first_frame]:
+            game.rt.input = frame_input                         # same as HeadlessEngine.step (a replay runtime feeds the same input)
+            game._update()
+
+    def play_headless(self, start: int = 0, stages_path: str | None = None) -> "HeadlessEngine":
+        """ Fast-forwards to the end, raises RuntimeError on a desync """
+        from headless import HeadlessEngine, STAGES_PATH        # imported here since headless imports the game
+
+        engine = HeadlessEngine(seed=self.seed, stages_path=stages_path or STAGES_PATH)
+        if start > 0:
+            self.seek(engine.game, start)
+        for chunk in range(self._chunk_of(engine.frame_count), len(self.offsets)):
+            first_frame, keyframe, inputs = self.read_chunk(chunk)
+            if engine.frame_count == first_frame and zlib.crc32(engine.game.snapshot()) != zlib.crc32(keyframe):
+                raise RuntimeError(f"{self.path}: desync at frame {first_frame}")
+            for frame_input in inputs[engine.frame_count - first_frame:]:
+                engine.step(frame_input)
+        return engine
+
+
+if __name__ == "__main__":
+    import argparse
+    from headless import HeadlessEngine, STAGES_PATH
+
+    parser = argparse.ArgumentParser(description="Inspects, verifies or converts seekable replay files.")
+    parser.add_argument("command", choices=("info", "verify", "convert"))
+    parser.add_argument("source", help="replay file (a plain replay for convert)")
+    parser.add_argument("target", nargs="?", help="seekable replay to write (convert only)")
+    parser.add_argument("--codec", choices=CODECS, default="zlib", help="compression of the chunks (convert only)")
+    parser.add_argument("--stages", default=STAGES_PATH, help="stages JSON file or compiled level pack")
+    args = parser.parse_args()
+
+    if args.command == "convert":                               # re-simulates the plain replay to take the keyframes
+        replay = Replay.load(args.source)
+        engine = HeadlessEngine(seed=replay.seed, stages_path=args.stages)
+        engine.runtime.recorder = ReplayPackRecorder(args.target, engine.game, codec=args.codec)
+        for frame_input in replay.frames:
+            engine.step(frame_input)
+        engine.runtime.recorder.close()
+        print(f"{len(replay.frames)} frames written to {args.target}")
+    elif args.command == "info":
+        pack = ReplayPack(args.source)
+        print(f"seed {pack.seed}, {pack.frames} frames in {len(pack.offsets)} chunks ({CODECS[pack.codec]}), {len(pack.data):,} bytes")
+        for stage in sorted({stage for _, stage, _ in pack.markers}):
+            try:
+                print(f"stage {stage}: frame {pack.stage_frame(stage)}")
+            except ValueError:
+                pass                                            # stage 1 before START was left
+    else:
+        engine = ReplayPack(args.source).play_headless(stages_path=args.stages)
+        print(f"{engine.frame_count} frames verified, stage {engine.game.current_stage}, "
+              f"state {engine.game.current_game_state.name}, score {engine.game.stats.score}")
@@ -9,9 +9,11 @@ Author: Josh Patiño
 Date: January 01, 2025
 """
 
-import pyxel
 from paddle import Paddle
-from random import choice
+from runtime import Runtime
+
+                                                                # powerup types (the reward field stores code i + 1, 0 is none)
+POWERUP_TYPES: tuple[str, ...] = ("life_up", "antigravity", "paddle_speed", "double_points")
 
 
 class Reward:
@@ -19,6 +21,7 @@ class Reward:
     A falling reward object that can be collected by the paddle.
 
     Attributes:
+        rt (Runtime):                               runtime providing the randomness and window size
         x (float):                                  reward's x-position
         y (float):                                  reward's y-position
         w (int):                                    width of reward sprite
@@ -30,7 +33,7 @@ class Reward:
         sprites (dict[str, tuple[int, int]]):       the powerup type and its respective (u, v) values for its sprite
     
     Methods:
-        __init__(self, x: float, y: float, points: int, falling_accel: float, X: int, powerup_type: str ="") -> None:
+        __init__(self, x: float, y: float, points: int, falling_accel: float, X: int, runtime: Runtime, powerup_type: str ="") -> None:
             Initializes reward at given position.
 
             Args:
@@ -39,6 +42,7 @@ class Reward:
                 points (int):                       point contribution of reward
                 falling_accel (float):              the "gravity" of falling score object
                 X (int):                            the percent chance of a score object being a power up
+                runtime (Runtime):                  runtime providing the randomness and window size
                 powerup_type (str):                 the type of powerup, empty if not a powerup
 
         collides(self, paddle: Paddle) -> tuple[str | None, int]:
@@ -53,28 +57,32 @@ class Reward:
         update(self) -> None:
             Updates score object position.
 
-        draw(self) -> None:
+        draw(self, alpha: float = 1.0) -> None:
             Renders reward with the appropriate sprite.
 
+            Args:
+                alpha (float):                      how far between the previous and current position to draw it (0-1)
+
     """
     
-    def __init__(self, x: float, y: float, points: int, falling_accel: float, X: int, powerup_type: str = "") -> None:
+    def __init__(self, x: float, y: float, points: int, falling_accel: float, X: int, runtime: Runtime, powerup_type: str = "") -> None:
         """ Constructor for Score Object """
+        self.rt = runtime
         self.x = x
         self.y = y
         self.w = 8
         self.h = 10
         self.accel = falling_accel
-        self.speed_y: float = pyxel.rndf(0.5,0.75)              # initial speed
+        self.speed_y: float = self.rt.rndf(0.5,0.75)              # initial speed
         self.P = points
         self.powerup_type = powerup_type
 
                                                                 # determines if this reward is a power-up
-        self.is_powerup = pyxel.rndi(1, 100) <= X
+        self.is_powerup = self.rt.rndi(1, 100) <= X
         self.powerup_type = None
 
         if self.is_powerup:
-            self.powerup_type = choice(["life_up", "antigravity", "paddle_speed", "double_points"])
+            self.powerup_type = self.rt.choice(POWERUP_TYPES)
 
                                                                 # defines the powerup types
         self.sprites = {
@@ -89,7 +97,7 @@ class Reward:
     def collides(self, paddle: Paddle) -> tuple[str | None, int]:
         """ Method that deals with all collisions of score objects with game elements """
 
-        if self.y < pyxel.height:                               # still within the screen
+        if self.y < self.rt.height:                               # still within the screen
             if (
                 self.x < paddle.x + paddle.w and                # reward's left edge is to the left of paddle's right edge
                 self.x + self.w > paddle.x and                  # reward's right edge is to the right of paddle's left edge
@@ -115,8 +123,9 @@ class Reward:
 
 # +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
 
-    def draw(self) -> None:
+    def draw(self, alpha: float = 1.0) -> None:
         """ General Draw Method for Score Object """
+        import pyxel
                                                                 # draws the score object on the screen
         if self.is_powerup and self.powerup_type in self.sprites:
             u, v = self.sprites[self.powerup_type]
@@ -124,7 +133,7 @@ class Reward:
             u, v = 0, 83
         pyxel.blt(
             x=self.x,
-            y=self.y,
+            y=self.y - self.speed_y * (1 - alpha),              # previous position is exactly one speed_y above
             img=0,
             u=u,
             v=v,
@@ -0,0 +1,176 @@
+"""
+Module Name: reward_field.py
+
+Description:
+    Contains the "RewardField", an alternative to per-object "Reward" updates that keeps every
+    falling reward in packed NumPy arrays, moving and catching them all at once.
+    Requires NumPy.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import numpy as np
+from paddle import Paddle
+from reward import POWERUP_TYPES
+from runtime import Runtime
+
+                                                                # (u, v) of the sprite per powerup code
+SPRITES: tuple[tuple[int, int], ...] = (
+    (0, 83),                                                    # regular score object
+    (0, 115),                                                   # life_up
+    (8, 83),                                                    # antigravity
+    (8, 99),                                                    # paddle_speed
+    (0, 99),                                                    # double_points
+)
+
+
+class RewardField:
+    """
+
+    Packed storage for all falling rewards.
+
+    Attributes:
+        rt (Runtime):                               runtime providing the randomness and window size
+        w (int):                                    width of a reward sprite
+        h (int):                                    height of a reward sprite
+        count (int):                                no. of rewards in play
+        x (np.ndarray):                             x-pos of every reward
+        y (np.ndarray):                             y-pos of every reward
+        speed_y (np.ndarray):                       falling speed of every reward
+        accel (np.ndarray):                         falling acceleration of every reward
+        points (np.ndarray):                        score value of every reward
+        powerup (np.ndarray):                       powerup code of every reward (0 if not a powerup)
+
+    Methods:
+        __init__(self, runtime: Runtime, capacity: int = 64) -> None:
+            Initializes an empty field.
+
+            Args:
+                runtime (Runtime):                  runtime providing the randomness and window size
+                capacity (int):                     no. of rewards allocated up front
+
+        _grow(self) -> None:
+            Doubles the capacity of the arrays.
+
+        spawn(self, x: float, y: float, points: int, falling_accel: float, X: int) -> None:
+            Adds a reward (rolls its speed and powerup just like Reward).
+
+        clear(self) -> None:
+            Removes all rewards.
+
+        update(self) -> None:
+            Moves all rewards.
+
+        collect(self, paddle: Paddle) -> list[tuple[str, int, str | None]]:
+            Removes caught and missed rewards, and returns (collision type, points, powerup type) for each.
+
+        draw(self, alpha: float = 1.0) -> None:
+            Renders all rewards.
+
+            Args:
+                alpha (float):                      how far between the previous and current position to draw them (0-1)
+
+        __len__(self) -> int:
+            Returns the no. of rewards in play.
+
+    """
+    def __init__(self, runtime: Runtime, capacity: int = 64) -> None:
+        """ Constructor for reward field """
+        self.rt: Runtime = runtime
+        self.w: int = 8
+        self.h: int = 10
+        self.count: int = 0
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.speed_y = np.zeros(capacity, dtype=np.float64)
+        self.accel = np.zeros(capacity, dtype=np.float64)
+        self.points = np.zeros(capacity, dtype=np.int64)
+        self.powerup = np.zeros(capacity, dtype=np.int8)
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+    def _grow(self) -> None:
+        """ Doubles the capacity of every array """
+        for name in ("x", "y", "speed_y", "accel", "points", "powerup"):
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, x: float, y: float, points: int, falling_accel: float, X: int) -> None:
+        """ Adds a reward to the field """
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.accel[i] = falling_accel
+        self.speed_y[i] = self.rt.rndf(0.5, 0.75)              # initial speed
+        self.points[i] = points
+                                                                # rolls the powerup in the same order as Reward
+        self.powerup[i] = 0
+        if self.rt.rndi(1, 100) <= X:
+            self.powerup[i] = POWERUP_TYPES.index(self.rt.choice(POWERUP_TYPES)) + 1
+        self.count += 1
+
+    def clear(self) -> None:
+        """ Removes all rewards """
+        self.count = 0
+
+    def collect(self, paddle: Paddle) -> list[tuple[str, int, str | None]]:
+        """ Removes rewards that hit the paddle or the bottom of the window, latest spawned first """
+        n = self.count
+        if n == 0:
+            return []
+        x, y = self.x[:n], self.y[:n]
+
+        in_screen = y < self.rt.height
+        caught = in_screen & (                                  # same overlap check as Reward.collides
+            (x < paddle.x + paddle.w) &
+            (x + self.w > paddle.x) &
+            (y < paddle.y + paddle.h) &
+            (y + self.h > paddle.y)
+        )
+        done = caught | ~in_screen
+        if not done.any():
+            return []
+
+        results: list[tuple[str, int, str | None]] = []
+        for i in np.flatnonzero(done)[::-1].tolist():           # same order as the reversed list scan
+            if caught[i]:
+                code = int(self.powerup[i])
+                results.append(("paddle", int(self.points[i]), POWERUP_TYPES[code - 1] if code else None))
+            else:
+                results.append(("bottom", 0, None))
+
+                                                                # compacts the remaining rewards in bulk
+        keep = ~done
+        m = int(keep.sum())
+        for arr in (self.x, self.y, self.speed_y, self.accel, self.points, self.powerup):
+            arr[:m] = arr[:n][keep]
+        self.count = m
+        return results
+
+# +++++++++++++++++++++++++++++++++ UPDATE METHODS +++++++++++++++++++++++++++++++++
+
+    def update(self) -> None:
+        """ Moves all rewards down """
+        n = self.count
+        self.speed_y[:n] += self.accel[:n]
+        self.y[:n] += self.speed_y[:n]
+
+# +++++++++++++++++++++++++++++++++ DRAW METHODS +++++++++++++++++++++++++++++++++
+
+    def draw(self, alpha: float = 1.0) -> None:
+        """ Draws all rewards (interpolated back towards their previous positions) """
+        import pyxel
+        n = self.count
+        y = self.y[:n] - self.speed_y[:n] * (1 - alpha)         # previous position is exactly one speed_y above
+        for x, y, code in zip(self.x[:n].tolist(), y.tolist(), self.powerup[:n].tolist()):
+            u, v = SPRITES[code]
+            pyxel.blt(x=x, y=y, img=0, u=u, v=v, w=self.w, h=self.h, colkey=pyxel.COLOR_PEACH)
+
+    def __len__(self) -> int:
+        """ Returns the no. of rewards in play """
+        return self.count
@@ -0,0 +1,147 @@
+"""
+Module Name: rewind.py
+
+Description:
+    Contains the rewind buffer, which keeps the snapshots of the last few seconds of play so
+    the game can be scrubbed backwards frame by frame. Every n-th frame is kept as a keyframe,
+    and the frames in between only keep their difference to it (the XOR of both snapshots,
+    compressed), which is tiny since most of the state doesn't change within a second.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import struct
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+
+LENGTH: struct.Struct = struct.Struct("<I")                     # size of the snapshot a delta decodes to
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    """ XOR of two byte strings (the shorter one is padded with zeros) """
+    n = max(len(a), len(b))
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+@dataclass
+class Segment:
+    """
+
+    A keyframe and the frames that follow it.
+
+    Attributes:
+        key (bytes):                    compressed snapshot of the first frame
+        deltas (list[bytes]):           compressed differences to the keyframe of the following frames
+
+    """
+    key: bytes
+    deltas: list[bytes] = field(default_factory=list)
+
+
+class RewindBuffer:
+    """
+
+    Bounded history of snapshots (oldest frames are dropped a whole segment at a time).
+
+    Attributes:
+        capacity (int):                 no. of frames kept (at least)
+        keyframe_interval (int):        no. of frames per segment
+        segments (deque[Segment]):      stored frames, oldest first
+        key_blob (bytes | None):        decompressed keyframe of the newest segment
+        frames (int):                   no. of frames stored
+        nbytes (int):                   no. of bytes stored
+
+    Methods:
+        __init__(self, seconds: float = 60, keyframe_interval: int = 60, fps: int = 60) -> None:
+            Initializes an empty buffer.
+
+            Args:
+                seconds (float):        how far back the game can be rewound
+                keyframe_interval (int): no. of frames per keyframe
+                fps (int):              no. of frames per second
+
+        push(self, blob: bytes) -> None:
+            Stores the snapshot of the newest frame.
+
+        latest(self) -> bytes | None:
+            Returns the snapshot of the newest frame (None if empty).
+
+        pop(self) -> None:
+            Forgets the newest frame.
+
+        clear(self) -> None:
+            Forgets every frame.
+
+        __len__(self) -> int:
+            Returns the no. of frames stored.
+
+    """
+    def __init__(self, seconds: float = 60, keyframe_interval: int = 60, fps: int = 60) -> None:
+        """ Constructor """
+        self.capacity: int = int(seconds * fps)
+        self.keyframe_interval: int = keyframe_interval
+        self.segments: deque[Segment] = deque()
+        self.key_blob: bytes | None = None
+        self.frames: int = 0
+        self.nbytes: int = 0
+
+    def push(self, blob: bytes) -> None:
+        """ Stores a snapshot, as a keyframe or as a delta to the last keyframe """
+        last = self.segments[-1] if self.segments else None
+        if last is None or len(last.deltas) + 1 >= self.keyframe_interval:
+            segment = Segment(zlib.compress(blob, 1))
+            self.segments.append(segment)
+            self.key_blob = blob
+            self.nbytes += len(segment.key)
+        else:
+            if self.key_blob is None:
+                self.key_blob = zlib.decompress(last.key)       # dropped by a pop that emptied the newer segment
+            delta = LENGTH.pack(len(blob)) + zlib.compress(_xor(blob, self.key_blob), 1)
+            last.deltas.append(delta)
+            self.nbytes += len(delta)
+        self.frames += 1
+
+                                                                # drops the oldest segment once it is no longer needed
+        while self.frames - (len(self.segments[0].deltas) + 1) >= self.capacity:
+            oldest = self.segments.popleft()
+            self.frames -= len(oldest.deltas) + 1
+            self.nbytes -= len(oldest.key) + sum(len(delta) for delta in oldest.deltas)
+
+    def latest(self) -> bytes | None:
+        """ Decodes the snapshot of the newest frame """
+        if not self.segments:
+            return None
+        last = self.segments[-1]
+        if self.key_blob is None:
+            self.key_blob = zlib.decompress(last.key)
+        if not last.deltas:
+            return self.key_blob
+        delta = last.deltas[-1]
+        (length,) = LENGTH.unpack_from(delta)
+        return _xor(zlib.decompress(delta[LENGTH.size:]), self.key_blob)[:length]
+
+    def pop(self) -> None:
+        """ Forgets the newest frame """
+        if not self.segments:
+            return
+        last = self.segments[-1]
+        if last.deltas:
+            self.nbytes -= len(last.deltas.pop())
+        else:
+            self.segments.pop()
+            self.nbytes -= len(last.key)
+            self.key_blob = None                                # decoded again from the segment before
+        self.frames -= 1
+
+    def clear(self) -> None:
+        """ Forgets every frame """
+        self.segments.clear()
+        self.key_blob = None
+        self.frames = 0
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        """ Returns the no. of frames stored """
+        return self.frames
@@ -0,0 +1,73 @@
+"""
+Module Name: rng.py
+
+Description:
+    Contains the seedable random number service used by the game, so that a session
+    can be reproduced from its seed and inputs.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from random import Random
+from typing import Any, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class GameRNG:
+    """
+
+    A seeded random number generator with the same helpers as pyxel (rndi, rndf) plus choice.
+
+    Attributes:
+        seed (int):                     seed the generator started from
+        random (Random):                underlying generator
+
+    Methods:
+        __init__(self, seed: int) -> None:
+            Initializes the generator with a seed.
+
+            Args:
+                seed (int):             seed of the generator
+
+        rndi(self, a: int, b: int) -> int:
+            Random integer within [a, b].
+
+        rndf(self, a: float, b: float) -> float:
+            Random float within [a, b].
+
+        choice(self, seq: Sequence[T]) -> T:
+            Random element of a sequence.
+
+        getstate(self) -> Any:
+            Returns the internal state of the generator.
+
+        setstate(self, state: Any) -> None:
+            Restores a state returned by getstate.
+
+    """
+    def __init__(self, seed: int) -> None:
+        """ Constructor """
+        self.seed: int = seed
+        self.random: Random = Random(seed)
+
+    def rndi(self, a: int, b: int) -> int:
+        """ Random integer within [a, b] """
+        return self.random.randint(a, b)
+
+    def rndf(self, a: float, b: float) -> float:
+        """ Random float within [a, b] """
+        return self.random.uniform(a, b)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """ Random element of a sequence """
+        return self.random.choice(seq)
+
+    def getstate(self) -> Any:
+        """ Returns the internal state of the generator """
+        return self.random.getstate()
+
+    def setstate(self, state: Any) -> None:
+        """ Restores a state returned by getstate """
+        self.random.setstate(state)
@@ -0,0 +1,278 @@
+"""
+Module Name: runtime.py
+
+Description:
+    Contains the runtimes that feed the game logic its input, clock, randomness, and audio.
+    The pyxel runtime drives the actual window, while the headless runtime lets the game
+    logic run as a plain Python object without a display. pyxel is only imported by the
+    pyxel runtime, since loading it needs SDL (which boxes without a display may lack).
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from dataclasses import dataclass
+from time import time_ns
+from typing import Protocol, Sequence, TypeVar
+from rng import GameRNG
+
+T = TypeVar("T")
+
+                                                                # pyxel codes of the keys/buttons read by the game logic
+MOUSE_BUTTON_LEFT: int = 11004                                  # pyxel.MOUSE_BUTTON_LEFT
+KEY_SPACE: int = 32                                             # pyxel.KEY_SPACE
+KEY_RETURN: int = 13                                            # pyxel.KEY_RETURN
+
+                                                                # keys/buttons read by the game logic (bit i of FrameInput.buttons)
+TRACKED_KEYS: tuple[int, ...] = (
+    MOUSE_BUTTON_LEFT,                                          # launch, play button
+    KEY_SPACE,                                                  # launch
+    KEY_RETURN,                                                 # new game
+)
+
+@dataclass
+class FrameInput:
+    """
+
+    The input read by the game logic during a single frame.
+
+    Attributes:
+        mouse_x (int):          mouse x-pos
+        mouse_y (int):          mouse y-pos
+        buttons (int):          bitmask of the TRACKED_KEYS pressed this frame
+
+    """
+    mouse_x: int = 0
+    mouse_y: int = 0
+    buttons: int = 0
+
+    @classmethod
+    def from_keys(cls, mouse_x: int, mouse_y: int, keys: Sequence[int] = ()) -> "FrameInput":
+        """ Builds a frame input out of the pressed keys """
+        buttons = 0
+        for key in keys:
+            buttons |= 1 << TRACKED_KEYS.index(key)
+        return cls(mouse_x=mouse_x, mouse_y=mouse_y, buttons=buttons)
+
+class InputRecorder(Protocol):
+    """ Anything that stores the input of every frame (e.g. replay.ReplayRecorder), called once the clock moved on """
+    def record(self, frame_input: FrameInput) -> None: ...
+
+class Runtime:
+    """
+
+    Base runtime shared by the pyxel and headless runtimes.
+
+    Attributes:
+        width (int):                    width of the play area
+        height (int):                   height of the play area
+        frame_count (int):              no. of updates done so far
+        input (FrameInput):             input for the current frame
+        seed (int):                     seed of the session
+        rng (GameRNG):                  randomness used by the game logic
+        recorder (InputRecorder | None): stores the input of every frame (if recording)
+
+    Methods:
+        __init__(self, width: int, height: int, seed: int) -> None:
+            Initializes the runtime with the size of the play area and the session seed.
+
+        mouse_x(self) -> int:
+            * property
+            Mouse x-pos for the current frame.
+
+        mouse_y(self) -> int:
+            * property
+            Mouse y-pos for the current frame.
+
+        btnp(self, key: int) -> bool:
+            Checks if a tracked key was pressed this frame.
+
+        poll(self) -> None:
+            Collects the input of a rendered frame (which may run zero or several updates).
+
+        begin_frame(self) -> None:
+            Prepares the input for the upcoming update.
+
+        end_frame(self) -> None:
+            Records the frame's input (if recording) and advances the clock.
+
+        rndi(self, a: int, b: int) -> int:
+            Random integer within [a, b].
+
+        rndf(self, a: float, b: float) -> float:
+            Random float within [a, b].
+
+        choice(self, seq: Sequence[T]) -> T:
+            Random element of a sequence.
+
+        play(self, ch: int, snd: int) -> None:
+            Plays a sound on a channel.
+
+        is_playing(self, ch: int) -> bool:
+            Checks if a channel is still playing.
+
+        playm(self, msc: int, loop: bool = False) -> None:
+            Plays a music track.
+
+        stop(self, ch: int | None = None) -> None:
+            Stops a channel (or all channels).
+
+        mouse(self, visible: bool) -> None:
+            Shows or hides the mouse cursor.
+
+    """
+    def __init__(self, width: int, height: int, seed: int) -> None:
+        """ Constructor """
+        self.width: int = width
+        self.height: int = height
+        self.frame_count: int = 0
+        self.input: FrameInput = FrameInput()
+        self.seed: int = seed
+        self.rng: GameRNG = GameRNG(seed)
+        self.recorder: InputRecorder | None = None
+
+    @property
+    def mouse_x(self) -> int:
+        """ Mouse x-pos for the current frame """
+        return self.input.mouse_x
+
+    @property
+    def mouse_y(self) -> int:
+        """ Mouse y-pos for the current frame """
+        return self.input.mouse_y
+
+    def btnp(self, key: int) -> bool:
+        """ Checks if a tracked key was pressed this frame """
+        return bool(self.input.buttons & (1 << TRACKED_KEYS.index(key)))
+
+    def poll(self) -> None:
+        """ Collects the input of a rendered frame """
+
+    def begin_frame(self) -> None:
+        """ Prepares the input for the upcoming update """
+
+    def end_frame(self) -> None:
+        """ Advances the clock and records the input of the frame after an update """
+        self.frame_count += 1
+        if self.recorder is not None:
+            self.recorder.record(self.input)                    # game state is now the one the next frame starts from
+
+    def rndi(self, a: int, b: int) -> int:
+        """ Random integer within [a, b] """
+        return self.rng.rndi(a, b)
+
+    def rndf(self, a: float, b: float) -> float:
+        """ Random float within [a, b] """
+        return self.rng.rndf(a, b)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """ Random element of a sequence """
+        return self.rng.choice(seq)
+
+    def play(self, ch: int, snd: int) -> None:
+        """ Plays a sound on a channel """
+
+    def is_playing(self, ch: int) -> bool:
+        """ Checks if a channel is still playing """
+        return False
+
+    def playm(self, msc: int, loop: bool = False) -> None:
+        """ Plays a music track """
+
+    def stop(self, ch: int | None = None) -> None:
+        """ Stops a channel (or all channels) """
+
+    def mouse(self, visible: bool) -> None:
+        """ Shows or hides the mouse cursor """
+
+class PyxelRuntime(Runtime):
+    """
+
+    Runtime backed by the pyxel window (pyxel.init must be called beforehand).
+
+    Attributes:
+        pending_buttons (int):          tracked keys pressed since the last update
+        polled_frame (int):             last pyxel frame whose keys were collected
+
+    Methods:
+        __init__(self, seed: int | None = None) -> None:
+            Initializes the runtime with the size of the pyxel window.
+
+            Args:
+                seed (int | None):      seed of the session, picked from the clock if None
+
+        poll(self) -> None:
+            Collects the tracked keys pressed during the current pyxel frame (once per frame).
+
+        begin_frame(self) -> None:
+            Reads the mouse and the tracked keys from pyxel.
+
+    """
+    def __init__(self, seed: int | None = None) -> None:
+        """ Constructor """
+        import pyxel
+        if seed is None:
+            seed = time_ns() & 0xFFFFFFFF                       # new session, new seed
+        super().__init__(width=pyxel.width, height=pyxel.height, seed=seed)
+        self.pending_buttons: int = 0
+        self.polled_frame: int = -1
+
+    def poll(self) -> None:
+        """ Collects the keys pressed this pyxel frame, so a press is never lost or seen twice """
+        import pyxel
+        if self.polled_frame == pyxel.frame_count:
+            return                                              # several updates in the same pyxel frame
+        self.polled_frame = pyxel.frame_count
+        for i, key in enumerate(TRACKED_KEYS):
+            if pyxel.btnp(key):
+                self.pending_buttons |= 1 << i
+
+    def begin_frame(self) -> None:
+        """ Reads the input for this update from pyxel """
+        import pyxel
+        self.poll()
+        self.input = FrameInput(mouse_x=pyxel.mouse_x, mouse_y=pyxel.mouse_y, buttons=self.pending_buttons)
+        self.pending_buttons = 0
+
+    def play(self, ch: int, snd: int) -> None:
+        import pyxel
+        pyxel.play(ch, snd)
+
+    def is_playing(self, ch: int) -> bool:
+        import pyxel
+        return pyxel.play_pos(ch) is not None
+
+    def playm(self, msc: int, loop: bool = False) -> None:
+        import pyxel
+        pyxel.playm(msc, loop=loop)
+
+    def stop(self, ch: int | None = None) -> None:
+        import pyxel
+        if ch is None:
+            pyxel.stop()
+        else:
+            pyxel.stop(ch)
+
+    def mouse(self, visible: bool) -> None:
+        import pyxel
+        pyxel.mouse(visible)
+
+class HeadlessRuntime(Runtime):
+    """
+
+    Runtime without a display: input is injected, the clock only moves when the game is
+    stepped, and audio is muted.
+
+    Methods:
+        __init__(self, width: int = 450, height: int = 200, seed: int = 0) -> None:
+            Initializes the runtime.
+
+            Args:
+                width (int):            width of the play area (same as the pyxel window)
+                height (int):           height of the play area (same as the pyxel window)
+                seed (int):             seed of the random number generator
+
+    """
+    def __init__(self, width: int = 450, height: int = 200, seed: int = 0) -> None:
+        """ Constructor """
+        super().__init__(width=width, height=height, seed=seed)
@@ -0,0 +1,458 @@
+"""
+Module Name: session_store.py
+
+Description:
+    Contains the session store, an append-only local log of finished games (score, stage
+    reached, lives, duration and powerups collected) with an on-disk index by score and by
+    date for leaderboards and analytics. Games are handed to a background writer thread, so
+    recording one never blocks a frame. Every record carries a CRC, so a write torn by a crash
+    or power loss is detected and cut off when the store is opened again.
+
+    The index covers the log up to a record count and is rebuilt from the records appended
+    after that point (kept in memory meanwhile) once enough of them pile up. It is written to
+    a temporary file and swapped in atomically, and rebuilt from the log if it is ever missing
+    or damaged. Requires NumPy.
+
+    Format of the log (little-endian):
+        header:     magic (4s) "CCSL", version (u16)
+        records:    RECORD followed by the CRC32 of its bytes (u32), fixed size
+
+    Format of the index (little-endian):
+        header:     magic (4s) "CCSX", version (u16), no. of log records covered (u64), no. of entries (u64)
+        by score:   sort keys (i64, stage then score descending), record no. (i64) per entry
+        by date:    timestamps (f64, ascending), record no. (i64) per entry
+        trailer:    CRC32 of everything before it (u32)
+
+    Usage:
+        python session_store.py sessions.ccsl top -n 10 [--stage 2]
+        python session_store.py sessions.ccsl stats
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from reward import POWERUP_TYPES
+
+if TYPE_CHECKING:
+    from main import GameStats
+
+MAGIC: bytes = b"CCSL"
+INDEX_MAGIC: bytes = b"CCSX"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sH")
+RECORD: struct.Struct = struct.Struct(f"<dqIHhB{len(POWERUP_TYPES)}HQ")   # timestamp, score, frames, stage, lives, won, powerups, seed
+CRC: struct.Struct = struct.Struct("<I")
+RECORD_SIZE: int = RECORD.size + CRC.size
+RECORD_DTYPE: np.dtype = np.dtype([                             # same layout as RECORD + CRC, for reading in bulk
+    ("timestamp", "<f8"), ("score", "<i8"), ("frames", "<u4"), ("stage", "<u2"), ("lives", "<i2"), ("won", "u1"),
+    ("powerups", "<u2", (len(POWERUP_TYPES),)), ("seed", "<u8"), ("crc", "<u4"),
+])
+INDEX_HEADER: struct.Struct = struct.Struct("<4sHQQ")
+STAGE_SHIFT: int = 47                                           # sort key = stage << STAGE_SHIFT | (SCORE_MASK - score)
+SCORE_MASK: int = (1 << STAGE_SHIFT) - 1
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """
+
+    A finished game.
+
+    Attributes:
+        score (int):                        final score
+        stage (int):                        stage reached (1-indexed)
+        lives (int):                        lives left
+        frames (int):                       no. of updates played (menus excluded)
+        won (bool):                         True if the last stage was cleared
+        powerups (tuple[int, ...]):         no. of powerups collected of each type (in POWERUP_TYPES order)
+        seed (int):                         seed of the session (to find its replay)
+        timestamp (float):                  when the game ended (seconds since the epoch)
+
+    Methods:
+        from_stats(cls, stats: GameStats, won: bool, seed: int, timestamp: float | None = None) -> SessionRecord:
+            * class method
+            Makes a record out of the stats of a finished game.
+
+        duration(self) -> float:
+            * property
+            Length of the game in seconds (at 60 fps).
+
+    """
+    score: int
+    stage: int
+    lives: int
+    frames: int
+    won: bool
+    powerups: tuple[int, ...]
+    seed: int
+    timestamp: float
+
+    @classmethod
+    def from_stats(cls, stats: "GameStats", won: bool, seed: int, timestamp: float | None = None) -> "SessionRecord":
+        """ Makes a record out of the stats of a finished game """
+        return cls(
+            score=stats.score, stage=stats.stage, lives=stats.lives, frames=stats.frames, won=won,
+            powerups=tuple(stats.powerups.get(name, 0) for name in POWERUP_TYPES), seed=seed,
+            timestamp=time.time() if timestamp is None else timestamp,
+        )
+
+    @property
+    def duration(self) -> float:
+        """ Length of the game in seconds """
+        return self.frames / 60
+
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+def _pack_record(record: SessionRecord) -> bytes:
+    body = RECORD.pack(record.timestamp, record.score, record.frames, record.stage, record.lives, record.won,
+                       *record.powerups, record.seed & (2 ** 64 - 1))
+    return body + CRC.pack(zlib.crc32(body))
+
+def _unpack_record(data: bytes | memoryview) -> SessionRecord | None:
+    """ Decodes a record (None if its CRC doesn't match, e.g. a torn write) """
+    body = data[:RECORD.size]
+    (crc,) = CRC.unpack_from(data, RECORD.size)
+    if zlib.crc32(body) != crc:
+        return None
+    timestamp, score, frames, stage, lives, won, *rest = RECORD.unpack(body)
+    return SessionRecord(score=score, stage=stage, lives=lives, frames=frames, won=bool(won),
+                         powerups=tuple(rest[:-1]), seed=rest[-1], timestamp=timestamp)
+
+def _fsync_dir(path: str) -> None:
+    """ Makes a rename inside a directory durable (not supported on every OS) """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SessionStore:
+    """
+
+    Append-only log of finished games, indexed by score and by date.
+
+    Attributes:
+        path (str):                         path to the log (the index is kept next to it as path + ".idx")
+        compact_every (int):                min. no. of unindexed records before the index is rebuilt
+        lock (threading.Lock):              guards the index and the unindexed records between threads
+        covered (int):                      no. of log records covered by the index
+        score_keys (np.ndarray):            sort keys of the score index (stage, then score descending)
+        score_recs (np.ndarray):            record no. of every score index entry
+        stage_bounds (dict[int, tuple[int, int]]): [lo, hi) of every stage in the score index
+        date_keys (np.ndarray):             timestamps of the date index (ascending)
+        date_recs (np.ndarray):             record no. of every date index entry
+        tail (list[tuple[int, SessionRecord]]): records appended after the index was built (record no., record)
+        count (int):                        no. of records written to the log
+        pending (queue.Queue):              records waiting for the writer thread
+        writer (threading.Thread):          appends the queued records in the background
+
+    Methods:
+        __init__(self, path: str, compact_every: int = 4096) -> None:
+            Opens (or creates) a store, cutting off a torn last write, and starts the writer.
+
+            Args:
+                path (str):                 path to the log
+                compact_every (int):        min. no. of unindexed records before the index is rebuilt
+
+        append(self, record: SessionRecord) -> None:
+            Queues a record for writing (never blocks).
+
+        flush(self) -> None:
+            Waits until every queued record is on disk.
+
+        close(self) -> None:
+            Writes the queued records and stops the writer.
+
+        top(self, n: int = 10, stage: int | None = None) -> list[SessionRecord]:
+            Highest scores, overall or among the games that reached the given stage.
+
+        between(self, start: float, end: float, limit: int | None = None) -> list[SessionRecord]:
+            Games that ended within [start, end), oldest first.
+
+        stage_counts(self) -> dict[int, int]:
+            No. of games per stage reached.
+
+        __len__(self) -> int:
+            Returns the no. of records written.
+
+    """
+    def __init__(self, path: str, compact_every: int = 4096) -> None:
+        """ Constructor """
+        self.path: str = path
+        self.index_path: str = path + ".idx"
+        self.compact_every: int = compact_every
+        self.lock: threading.Lock = threading.Lock()
+        self.covered: int = 0
+        self.score_keys: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.score_recs: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.stage_bounds: dict[int, tuple[int, int]] = {}
+        self.date_keys: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.date_recs: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.tail: list[tuple[int, SessionRecord]] = []
+
+        self._open_log()
+        self.reader = open(self.path, "rb")
+        if not self._load_index():
+            self.covered = 0                                    # rebuilt from the whole log
+        records = self._verify(self.covered)
+        if len(records) >= self.compact_every:                  # indexes them right away
+            self._merge(self.covered, records)
+        else:
+            self.tail = [(self.covered + i, _unpack_record(row.tobytes())) for i, row in enumerate(records)]
+
+        self.pending: queue.Queue[SessionRecord | None] = queue.Queue()
+        self.writer: threading.Thread = threading.Thread(target=self._write_loop, name="session-store", daemon=True)
+        self.writer.start()
+
+# +++++++++++++++++++++++++++++++++ LOG METHODS +++++++++++++++++++++++++++++++++
+
+    def _open_log(self) -> None:
+        """ Creates the log, or checks its header and cuts off a partial last record """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size:
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION))
+                f.flush()
+                os.fsync(f.fileno())
+            _fsync_dir(self.path)
+        with open(self.path, "rb") as f:
+            magic, version = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a supported session log")
+        size = os.path.getsize(self.path)
+        self.count: int = (size - HEADER.size) // RECORD_SIZE
+        if HEADER.size + self.count * RECORD_SIZE != size:      # torn write of the last record
+            self._truncate(self.count)
+        self.log = open(self.path, "ab")
+
+    def _truncate(self, count: int) -> None:
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER.size + count * RECORD_SIZE)
+            f.flush()
+            os.fsync(f.fileno())
+        self.count = count
+
+    def _verify(self, start: int) -> np.ndarray:
+        """ Checks the records from `start` on, cuts the log off at the first damaged one, and returns the good ones """
+        self.reader.seek(HEADER.size + start * RECORD_SIZE)
+        data = self.reader.read((self.count - start) * RECORD_SIZE)
+        view = memoryview(data)
+        crcs = np.frombuffer(data, dtype=RECORD_DTYPE)["crc"].tolist()
+        for i, crc in enumerate(crcs):
+            if zlib.crc32(view[i * RECORD_SIZE:i * RECORD_SIZE + RECORD.size]) != crc:
+                self.log.close()
+                self._truncate(start + i)                       # nothing after a torn write can be trusted
+                self.log = open(self.path, "ab")
+                data = data[:i * RECORD_SIZE]
+                break
+        return np.frombuffer(data, dtype=RECORD_DTYPE)
+
+    def _read(self, rec: int) -> SessionRecord:
+        with self.lock:
+            self.reader.seek(HEADER.size + rec * RECORD_SIZE)
+            data = self.reader.read(RECORD_SIZE)
+        record = _unpack_record(data)
+        if record is None:
+            raise ValueError(f"record {rec} of {self.path} is damaged")
+        return record
+
+    def _write_loop(self) -> None:
+        """ Writes queued records in batches (one fsync per batch) """
+        while True:
+            batch = [self.pending.get()]
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            if records:
+                self.log.write(b"".join(_pack_record(record) for record in records))
+                self.log.flush()
+                os.fsync(self.log.fileno())
+                with self.lock:
+                    self.tail.extend(enumerate(records, start=self.count))
+                    self.count += len(records)
+                if len(self.tail) >= max(self.compact_every, self.covered // 64):  # rewrites the index less often as the log grows
+                    self._compact()
+            for _ in batch:
+                self.pending.task_done()
+            if len(records) < len(batch):                       # close was called
+                return
+
+# +++++++++++++++++++++++++++++++++ INDEX METHODS +++++++++++++++++++++++++++++++++
+
+    def _set_index(self, covered: int, score_keys: np.ndarray, score_recs: np.ndarray,
+                   date_keys: np.ndarray, date_recs: np.ndarray) -> None:
+        stages = (score_keys >> STAGE_SHIFT).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, stages[1:] != stages[:-1]]) if len(stages) else np.zeros(0, dtype=np.int64)
+        ends = np.r_[starts[1:], len(stages)]
+        bounds = {int(stages[lo]): (int(lo), int(hi)) for lo, hi in zip(starts, ends)}
+        with self.lock:
+            self.covered = covered
+            self.score_keys, self.score_recs, self.stage_bounds = score_keys, score_recs, bounds
+            self.date_keys, self.date_recs = date_keys, date_recs
+
+    def _load_index(self) -> bool:
+        """ Loads the index (False if it is missing, damaged or ahead of the log) """
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        if len(data) < INDEX_HEADER.size + CRC.size:
+            return False
+        (crc,) = CRC.unpack_from(data, len(data) - CRC.size)
+        if zlib.crc32(data[:-CRC.size]) != crc:
+            return False
+        magic, version, covered, n = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != VERSION or covered > self.count or len(data) != INDEX_HEADER.size + n * 32 + CRC.size:
+            return False
+        arrays = np.frombuffer(data, dtype=np.int64, count=4 * n, offset=INDEX_HEADER.size).reshape(4, n)
+        self._set_index(covered, arrays[0].copy(), arrays[1].copy(), arrays[2].view(np.float64).copy(), arrays[3].copy())
+        return True
+
+    def _merge(self, start: int, records: np.ndarray) -> None:
+        """ Merges records [start, start + len(records)) into the index and writes it (atomically) next to the log """
+        with self.lock:
+            score_keys, score_recs, date_keys, date_recs = self.score_keys, self.score_recs, self.date_keys, self.date_recs
+        covered = start + len(records)
+        recs = np.arange(start, covered, dtype=np.int64)
+        stages = records["stage"].astype(np.int64)
+        keys = stages << STAGE_SHIFT | (SCORE_MASK - np.clip(records["score"], 0, SCORE_MASK))
+        times = records["timestamp"].astype(np.float64)
+
+                                                                # both indexes are sorted already, so the new entries are
+                                                                # inserted in place (after equal keys, older games first)
+        order = np.lexsort((recs, keys))
+        at = np.searchsorted(score_keys, keys[order], side="right")
+        score_keys, score_recs = np.insert(score_keys, at, keys[order]), np.insert(score_recs, at, recs[order])
+        order = np.argsort(times, kind="stable")
+        at = np.searchsorted(date_keys, times[order], side="right")
+        date_keys, date_recs = np.insert(date_keys, at, times[order]), np.insert(date_recs, at, recs[order])
+
+        payload = (INDEX_HEADER.pack(INDEX_MAGIC, VERSION, covered, len(score_keys)) + score_keys.tobytes() +
+                   score_recs.tobytes() + date_keys.tobytes() + date_recs.tobytes())
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload + CRC.pack(zlib.crc32(payload)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)                   # the old index stays valid until this point
+        _fsync_dir(self.index_path)
+
+        self._set_index(covered, score_keys, score_recs, date_keys, date_recs)
+        with self.lock:
+            self.tail = [(rec, record) for rec, record in self.tail if rec >= covered]
+
+    def _compact(self) -> None:
+        """ Indexes the records appended since the index was last written """
+        with self.lock:
+            tail = list(self.tail)
+        if not tail:
+            return
+        records = np.frombuffer(b"".join(_pack_record(record) for _, record in tail), dtype=RECORD_DTYPE)
+        self._merge(tail[0][0], records)
+
+# +++++++++++++++++++++++++++++++++ WRITE METHODS +++++++++++++++++++++++++++++++++
+
+    def append(self, record: SessionRecord) -> None:
+        """ Queues a record (written by the background thread) """
+        self.pending.put_nowait(record)
+
+    def flush(self) -> None:
+        """ Waits until every queued record is on disk """
+        self.pending.join()
+
+    def close(self) -> None:
+        """ Writes the queued records and stops the writer """
+        if not self.writer.is_alive():
+            return
+        self.pending.put(None)
+        self.writer.join()
+        self.log.close()
+        self.reader.close()
+
+# +++++++++++++++++++++++++++++++++ QUERY METHODS +++++++++++++++++++++++++++++++++
+
+    def top(self, n: int = 10, stage: int | None = None) -> list[SessionRecord]:
+        """ Highest scores (ties: older games first), overall or among the games that reached the stage """
+        with self.lock:
+            keys, recs, bounds, tail = self.score_keys, self.score_recs, self.stage_bounds, list(self.tail)
+        candidates: list[tuple[int, int, SessionRecord | None]] = []
+        for s, (lo, hi) in bounds.items():                      # the best n of every stage block at most
+            if stage is None or s == stage:
+                head = slice(lo, min(hi, lo + n))
+                candidates += zip((SCORE_MASK - (keys[head] & SCORE_MASK)).tolist(), recs[head].tolist(), [None] * (head.stop - lo))
+        candidates += [(r.score, rec, r) for rec, r in tail if stage is None or r.stage == stage]
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        return [record if record is not None else self._read(rec) for _, rec, record in candidates[:n]]
+
+    def between(self, start: float, end: float, limit: int | None = None) -> list[SessionRecord]:
+        """ Games that ended within [start, end), oldest first """
+        with self.lock:
+            keys, recs, tail = self.date_keys, self.date_recs, list(self.tail)
+        lo, hi = np.searchsorted(keys, [start, end])
+        found: list[tuple[float, int, SessionRecord | None]] = list(zip(keys[lo:hi].tolist(), recs[lo:hi].tolist(), [None] * int(hi - lo)))
+        found += [(r.timestamp, rec, r) for rec, r in tail if start <= r.timestamp < end]
+        found.sort(key=lambda f: (f[0], f[1]))
+        if limit is not None:
+            found = found[:limit]
+        return [record if record is not None else self._read(rec) for _, rec, record in found]
+
+    def stage_counts(self) -> dict[int, int]:
+        """ No. of games per stage reached """
+        with self.lock:
+            counts = {s: hi - lo for s, (lo, hi) in self.stage_bounds.items()}
+            for _, r in self.tail:
+                counts[r.stage] = counts.get(r.stage, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def __len__(self) -> int:
+        """ Returns the no. of records written """
+        return self.count
+
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Queries a session log.")
+    parser.add_argument("path", help="session log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    top_parser = sub.add_parser("top", help="prints the leaderboard")
+    top_parser.add_argument("-n", type=int, default=10, help="no. of games")
+    top_parser.add_argument("--stage", type=int, default=None, help="only games that reached this stage")
+    sub.add_parser("stats", help="prints the no. of games per stage reached")
+    args = parser.parse_args()
+
+    store = SessionStore(args.path)
+    try:
+        if args.command == "top":
+            for rank, record in enumerate(store.top(args.n, stage=args.stage), start=1):
+                ended = datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M")
+                result = "won" if record.won else f"stage {record.stage}"
+                print(f"{rank:>3}. {record.score:>8}  {result:<8} {record.duration:>7.1f}s  {ended}")
+        else:
+            print(f"{len(store)} games")
+            for stage, count in store.stage_counts().items():
+                print(f"  stage {stage}: {count}")
+    finally:
+        store.close()
@@ -0,0 +1,299 @@
+"""
+Module Name: shard_runner.py
+
+Description:
+    Contains the "ShardedRunner", which splits a batch of games across worker processes, each
+    one stepping its shard as a BreakoutVecEnv (pinned to its own core where the OS allows it).
+    Actions, observations, rewards and done flags live in a single shared memory block that
+    every process maps, so a step only sends a few bytes of command over each pipe instead
+    of pickling game state. Steps can be synchronous (step) or split in two (step_async and
+    step_wait) so the caller can work while the workers simulate.
+    Requires NumPy.
+
+    Layout of the shared block (each array covers all N games, a worker only touches its rows):
+        actions (f64), rewards (f32), dones, won and truncated (bool), final score (i64),
+        then every observation array of BreakoutVecEnv (f32)
+
+    Usage:
+        python shard_runner.py --envs 4096 --workers 4 --steps 2000
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import multiprocessing as mp
+import os
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from vec_env import STAGES_PATH, BreakoutVecEnv
+
+                                                                # commands sent to the workers (raw bytes, nothing is pickled)
+STEP: bytes = b"s"
+RESET: bytes = b"r"
+CLOSE: bytes = b"c"
+DONE: bytes = b"k"
+
+                                                                # (name, dtype) of the per-game arrays besides the observations
+RESULTS: tuple[tuple[str, type], ...] = (
+    ("actions", np.float64),
+    ("rewards", np.float32),
+    ("dones", np.bool_),
+    ("won", np.bool_),
+    ("truncated", np.bool_),
+    ("final_score", np.int64),
+)
+
+
+def _layout(n: int, obs_shapes: dict[str, tuple[int, ...]]) -> tuple[list[tuple[str, tuple[int, ...], np.dtype, int]], int]:
+    """ (name, shape, dtype, offset) of every array in the shared block, and the size of the block """
+    fields = [(name, (n,), np.dtype(dtype)) for name, dtype in RESULTS]
+    fields += [(f"obs_{name}", (n, *shape), np.dtype(np.float32)) for name, shape in obs_shapes.items()]
+    layout, offset = [], 0
+    for name, shape, dtype in fields:
+        offset = -(-offset // 64) * 64                          # aligned to cache lines
+        layout.append((name, shape, dtype, offset))
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return layout, max(offset, 1)
+
+def _map(shm: SharedMemory, layout: list[tuple[str, tuple[int, ...], np.dtype, int]]) -> dict[str, np.ndarray]:
+    """ NumPy views of every array in the shared block """
+    return {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset) for name, shape, dtype, offset in layout}
+
+def _worker(conn: Connection, shm_name: str, layout: list, lo: int, hi: int, core: int | None, env_kwargs: dict) -> None:
+    """ Steps the games [lo, hi) whenever the runner asks, reading and writing the shared block """
+    if core is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {core})                     # pins the worker to a single core
+        except OSError:
+            pass
+    shm = SharedMemory(name=shm_name)                         # workers share the runner's resource tracker, so only
+                                                                # the runner's unlink releases the block
+    arrays = _map(shm, layout)
+    env = BreakoutVecEnv(hi - lo, **env_kwargs)
+    env.obs = {name[4:]: arr[lo:hi] for name, arr in arrays.items() if name.startswith("obs_")}   # observations go straight into the block
+    actions, rewards, dones = arrays["actions"][lo:hi], arrays["rewards"][lo:hi], arrays["dones"][lo:hi]
+    won, truncated, final_score = arrays["won"][lo:hi], arrays["truncated"][lo:hi], arrays["final_score"][lo:hi]
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == STEP:
+                _, rewards[:], dones[:], info = env.step(actions)
+                won[:], truncated[:], final_score[:] = info["won"], info["truncated"], info["final_score"]
+            elif command == RESET:
+                env.reset()
+                rewards[:], dones[:] = 0, False
+            elif command == CLOSE:
+                break
+            conn.send_bytes(DONE)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        env.obs = {}                                            # releases the views before unmapping
+        del actions, rewards, dones, won, truncated, final_score, arrays
+        shm.close()
+
+
+class ShardedRunner:
+    """
+
+    Steps N games split across worker processes, exchanging everything through shared memory.
+    The returned arrays are views of the shared block and are overwritten by the next step.
+
+    Attributes:
+        n (int):                                    no. of games
+        shards (list[tuple[int, int]]):             [lo, hi) range of games of every worker
+        shm (SharedMemory):                         block shared with the workers
+        arrays (dict[str, np.ndarray]):             views of every array in the block
+        obs (dict[str, np.ndarray]):                observation views (same keys as BreakoutVecEnv.obs)
+        conns (list[Connection]):                   command pipe of every worker
+        processes (list[BaseProcess]):              worker processes
+        waiting (bool):                             True between step_async and step_wait
+
+    Methods:
+        __init__(self, n: int, workers: int | None = None, seed: int = 0, stages_path: str = STAGES_PATH,
+                 pin_cores: bool = True, start_method: str | None = None, **env_kwargs) -> None:
+            Creates the shared block and starts the workers.
+
+            Args:
+                n (int):                            no. of games
+                workers (int | None):               no. of worker processes (one per core if None)
+                seed (int):                         seed of the first shard (shard i uses seed + i)
+                stages_path (str):                  stages JSON file or compiled level pack
+                pin_cores (bool):                   pins worker i to core i (modulo the cores available)
+                start_method (str | None):          multiprocessing start method (platform default if None)
+                **env_kwargs:                       passed on to every BreakoutVecEnv
+
+        _broadcast(self, command: bytes) -> None:
+            Sends a command to every worker.
+
+        _gather(self) -> None:
+            Waits until every worker has finished its command.
+
+        reset(self) -> dict[str, np.ndarray]:
+            Starts a new episode in every game and returns the observations.
+
+        step_async(self, actions: np.ndarray) -> None:
+            Hands the actions to the workers and returns right away.
+
+        step_wait(self) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+            Waits for the step started by step_async and returns its results.
+
+        step(self, actions: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+            Steps every game and waits for the results (same results as BreakoutVecEnv.step).
+
+        close(self) -> None:
+            Stops the workers and frees the shared block.
+
+    """
+    def __init__(self, n: int, workers: int | None = None, seed: int = 0, stages_path: str = STAGES_PATH,
+                 pin_cores: bool = True, start_method: str | None = None, **env_kwargs) -> None:
+        """ Constructor """
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+        workers = min(n, workers or len(cores))
+        self.n: int = n
+        bounds = np.linspace(0, n, workers + 1).astype(int).tolist()
+        self.shards: list[tuple[int, int]] = list(zip(bounds[:-1], bounds[1:]))
+
+                                                                # observation shapes are read off a single game
+        probe = BreakoutVecEnv(1, stages_path=stages_path, **env_kwargs)
+        layout, size = _layout(n, {name: arr.shape[1:] for name, arr in probe.obs.items()})
+        self.shm: SharedMemory = SharedMemory(create=True, size=size)
+        self.arrays: dict[str, np.ndarray] = _map(self.shm, layout)
+        self.obs: dict[str, np.ndarray] = {name[4:]: arr for name, arr in self.arrays.items() if name.startswith("obs_")}
+
+        context = mp.get_context(start_method)
+        self.conns: list[Connection] = []
+        self.processes: list = []
+        for i, (lo, hi) in enumerate(self.shards):
+            parent, child = context.Pipe()
+            kwargs = dict(env_kwargs, seed=seed + i, stages_path=stages_path)
+            process = context.Process(
+                target=_worker, args=(child, self.shm.name, layout, lo, hi, cores[i % len(cores)] if pin_cores else None, kwargs),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+        self.waiting: bool = False
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+    def _broadcast(self, command: bytes) -> None:
+        """ Sends a command to every worker """
+        for conn in self.conns:
+            conn.send_bytes(command)
+
+    def _gather(self) -> None:
+        """ Waits for every worker to acknowledge its command """
+        for conn in self.conns:
+            if conn.recv_bytes() != DONE:
+                raise RuntimeError("unexpected reply from a worker")
+
+    def _results(self) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        """ Views of the results of the last step """
+        a = self.arrays
+        return self.obs, a["rewards"], a["dones"], {"won": a["won"], "truncated": a["truncated"], "final_score": a["final_score"]}
+
+# +++++++++++++++++++++++++++++++++ STEP METHODS +++++++++++++++++++++++++++++++++
+
+    def reset(self) -> dict[str, np.ndarray]:
+        """ Starts a new episode in every game """
+        if self.waiting:
+            self.step_wait()
+        self._broadcast(RESET)
+        self._gather()
+        return self.obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """ Hands the actions to the workers without waiting for them """
+        if self.waiting:
+            raise RuntimeError("step_async called twice without step_wait")
+        self.arrays["actions"][:] = actions
+        self._broadcast(STEP)
+        self.waiting = True
+
+    def step_wait(self) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        """ Waits for the step started by step_async """
+        if not self.waiting:
+            raise RuntimeError("step_wait called without step_async")
+        self._gather()
+        self.waiting = False
+        return self._results()
+
+    def step(self, actions: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        """ Steps every game and waits for the results """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        """ Stops the workers and frees the shared block """
+        if self.shm is None:
+            return
+        if self.waiting:
+            self.step_wait()
+        for conn in self.conns:
+            try:
+                conn.send_bytes(CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.conns:
+            conn.close()
+        self.arrays, self.obs = {}, {}                          # releases the views before unmapping
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+
+if __name__ == "__main__":
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Steps games across worker processes and reports the throughput.")
+    parser.add_argument("--envs", type=int, default=4096, help="no. of games")
+    parser.add_argument("--workers", type=int, default=None, help="no. of worker processes (one per core if omitted)")
+    parser.add_argument("--steps", type=int, default=2000, help="no. of batched steps")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="tallies the last step while the workers run the next one")
+    parser.add_argument("--stages", default=STAGES_PATH, help="stages JSON file or compiled level pack")
+    args = parser.parse_args()
+
+    runner = ShardedRunner(args.envs, workers=args.workers, stages_path=args.stages)
+    try:
+        obs = runner.reset()
+        rows = np.arange(args.envs)
+
+        def policy(obs: dict[str, np.ndarray]) -> np.ndarray:
+            """ Follows the lowest ball in play """
+            balls = obs["balls"]
+            lowest = np.argmax(np.where(balls[..., 4] > 0, balls[..., 1], -np.inf), axis=1)
+            return balls[rows, lowest, 0] + 4
+
+        episodes = 0
+        start = perf_counter()
+        if args.use_async:
+            runner.step_async(policy(obs))
+            for _ in range(args.steps - 1):
+                obs, rewards, dones, info = runner.step_wait()
+                dones = dones.copy()                            # the workers overwrite the block during the next step
+                runner.step_async(policy(obs))
+                episodes += int(dones.sum())
+            obs, rewards, dones, info = runner.step_wait()
+            episodes += int(dones.sum())
+        else:
+            for _ in range(args.steps):
+                obs, rewards, dones, info = runner.step(policy(obs))
+                episodes += int(dones.sum())
+        elapsed = perf_counter() - start
+    finally:
+        runner.close()
+
+    steps = args.envs * args.steps
+    print(f"{len(runner.shards)} workers, {steps} env-steps in {elapsed:.2f}s ({steps / elapsed:,.0f} env-steps/s)")
+    print(f"episodes finished {episodes}")
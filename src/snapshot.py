@@ -0,0 +1,255 @@
+"""
+Module Name: snapshot.py
+
+Description:
+    Contains the snapshot codec, which packs the whole simulation state of a game (stats,
+    stage, balls, bricks, score objects, powerup timers, streak and the random number
+    generator) into a compact binary blob, and restores a game from it exactly, so a
+    restored game plays on bit-for-bit like the original would have.
+
+    Format (little-endian):
+        header:     magic (4s) "CCSS", version (u16), frame count (u32)
+        game:       state, stage, stats, paddle, indicator, timers, streak, dropped screen and sound flags (GAME)
+        stats:      stage reached, frames played and no. of powerups collected of each type (STATS)
+        counts:     no. of collision events of each type (u32 each, in EventType order)
+        effects:    clock, last expired frame, count (EFFECTS), then per effect its key (as a Python
+                    literal), expiry, duration and the name of its expiry callback (EFFECT plus the
+                    utf-8 strings)
+        rng:        version, gauss_next (RNG) and the Mersenne Twister state (625 u32) of the
+                    game logic's generator
+        balls:      count (u16), then per ball BALL and its trail (f64 pairs, oldest first)
+        bricks:     count (u16), then per brick BRICK (current stage)
+        prefetch:   whether a stage is being prefetched (PREFETCH), then its bricks like above
+        rewards:    count (u16), then per score object REWARD
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import struct
+from array import array
+from ast import literal_eval
+from typing import TYPE_CHECKING, Hashable
+
+from brick import Brick
+from brick_grid import BrickGrid
+from events import EventType
+from reward import POWERUP_TYPES, Reward
+from rng import GameRNG
+
+if TYPE_CHECKING:
+    from main import BreakoutGame
+
+MAGIC: bytes = b"CCSS"
+VERSION: int = 4
+HEADER: struct.Struct = struct.Struct("<4sHI")
+GAME: struct.Struct = struct.Struct("<BHiidddddddiibb??ii")
+STATS: struct.Struct = struct.Struct(f"<HI{len(POWERUP_TYPES)}I")
+COUNTS: struct.Struct = struct.Struct(f"<{len(EventType)}I")
+EFFECTS: struct.Struct = struct.Struct("<iiB")
+EFFECT: struct.Struct = struct.Struct("<BiiB")                  # key length, expiry, duration, callback name length
+RNG: struct.Struct = struct.Struct("<B?d")
+MT_STATE: int = 625                                             # words of a Mersenne Twister state (incl. its position)
+COUNT: struct.Struct = struct.Struct("<H")
+BALL: struct.Struct = struct.Struct("<dddddddbbBBi??H")
+BRICK: struct.Struct = struct.Struct("<hhBbBB")
+PREFETCH: struct.Struct = struct.Struct("<?")
+REWARD: struct.Struct = struct.Struct("<ddddiB")
+
+
+# +++++++++++++++++++++++++++++++++ HELPER METHODS +++++++++++++++++++++++++++++++++
+
+def _pack_rng(rng: GameRNG) -> bytes:
+    version, words, gauss_next = rng.getstate()
+    return RNG.pack(version, gauss_next is not None, gauss_next or 0.0) + array("I", words).tobytes()
+
+def _unpack_rng(rng: GameRNG, view: memoryview, offset: int) -> int:
+    version, has_gauss, gauss_next = RNG.unpack_from(view, offset)
+    offset += RNG.size
+    words = array("I")
+    words.frombytes(view[offset:offset + MT_STATE * words.itemsize])
+    rng.setstate((version, tuple(words), gauss_next if has_gauss else None))
+    return offset + MT_STATE * words.itemsize
+
+def _pack_key(key: Hashable) -> bytes:
+    """ Effect key as a Python literal (e.g. "antigravity" or ("slow", 3)), read back with literal_eval """
+    literal = repr(key)
+    try:
+        if literal_eval(literal) == key:
+            return literal.encode("utf-8")
+    except (ValueError, SyntaxError):
+        pass
+    raise ValueError(f"effect key {literal} is not a literal (str, int, tuples of them...) and can't be snapshotted")
+
+def _pack_bricks(bricks: list[Brick]) -> bytes:
+    return COUNT.pack(len(bricks)) + b"".join(
+        BRICK.pack(int(b.x), int(b.y), b.brick_type, b.health, b.skin_index, b.K) for b in bricks
+    )
+
+def _unpack_bricks(game: "BreakoutGame", view: memoryview, offset: int) -> tuple[list[Brick], int]:
+    (count,) = COUNT.unpack_from(view, offset)
+    offset += COUNT.size
+    bricks: list[Brick] = []
+    for x, y, brick_type, health, skin_index, K in BRICK.iter_unpack(view[offset:offset + count * BRICK.size]):
+        brick = Brick(x, y, brick_type, K=K, rng=game.rt.rng)   # random draws are undone when the rng is restored
+        brick.health = health
+        brick.skin_index = skin_index
+        bricks.append(brick)
+    return bricks, offset + count * BRICK.size
+
+
+# +++++++++++++++++++++++++++++++++ SNAPSHOT METHODS +++++++++++++++++++++++++++++++++
+
+def take_snapshot(game: "BreakoutGame") -> bytes:
+    """ Packs the simulation state of a game into a blob """
+    rt, sound, effects = game.rt, game.sound, game.effects
+    parts: list[bytes] = [
+        HEADER.pack(MAGIC, VERSION, rt.frame_count),
+        GAME.pack(
+            game.current_game_state.value, game.current_stage, game.stats.score, game.stats.lives,
+            game.paddle.x, game.paddle.speed, game.angle, game.angle_direction, game.angle_cycle_speed,
+            game.dropped_timer, game.transition_timer, game.streak_count, game.streak_timer,
+            game.calcifer_sprites.index(game.chosen_skin), game.dropped_msgs.index(game.chosen_msg),
+            sound.game_over_played, sound.win_played, sound.game_over_framestamp, sound.win_framestamp,
+        ),
+        STATS.pack(game.stats.stage, game.stats.frames, *(game.stats.powerups.get(name, 0) for name in POWERUP_TYPES)),
+        COUNTS.pack(*(game.collision_counts.counts[event_type] for event_type in EventType)),
+        EFFECTS.pack(effects.clock, effects.expired_through, len(effects)),
+    ]
+
+    for key, expiry in effects.expiry.items():
+        callback = effects.callbacks.get(key)
+        name = (callback.__name__ if callback is not None else "").encode("utf-8")    # callbacks are methods of the game
+        key_bytes = _pack_key(key)
+        parts.append(EFFECT.pack(len(key_bytes), expiry, effects.duration[key], len(name)) + key_bytes + name)
+
+    parts.append(_pack_rng(rt.rng))
+
+    parts.append(COUNT.pack(len(game.balls)))
+    for ball in game.balls:
+        trail = ball.trail.latest(ball.trail.capacity)[::-1]    # oldest first
+        parts.append(BALL.pack(
+            ball.x, ball.y, ball.prev_x, ball.prev_y, ball.speed_x, ball.speed_y, ball.gravity,
+            ball.direction_x, ball.direction_y, ball.sprite_u, ball.sprite_v, ball.last_sprite_change,
+            ball.out_of_bounds, ball.destroy_brick, len(trail),
+        ))
+        parts.append(array("d", [c for point in trail for c in point]).tobytes())
+
+    parts.append(_pack_bricks(game.bricks))
+    prefetch = game.stage_prefetch
+    parts.append(PREFETCH.pack(prefetch is not None))
+    parts.append(_pack_bricks(prefetch.bricks if prefetch is not None else []))
+
+    if isinstance(game.score_objects, list):
+        rewards = [
+            (r.x, r.y, r.speed_y, r.accel, r.P, POWERUP_TYPES.index(r.powerup_type) + 1 if r.powerup_type else 0)
+            for r in game.score_objects
+        ]
+    else:
+        field, n = game.score_objects, game.score_objects.count
+        rewards = zip(field.x[:n].tolist(), field.y[:n].tolist(), field.speed_y[:n].tolist(), field.accel[:n].tolist(),
+                      field.points[:n].tolist(), field.powerup[:n].tolist())
+    reward_bytes = b"".join(REWARD.pack(*reward) for reward in rewards)
+    parts.append(COUNT.pack(len(reward_bytes) // REWARD.size) + reward_bytes)
+    return b"".join(parts)
+
+def restore_snapshot(game: "BreakoutGame", blob: bytes) -> None:
+    """ Restores the simulation state of a game from a blob made by take_snapshot """
+    view = memoryview(blob)
+    magic, version, frame_count = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a supported snapshot")
+    offset = HEADER.size
+    rt, sound, effects = game.rt, game.sound, game.effects
+    rt.frame_count = frame_count
+
+    (state, game.current_stage, game.stats.score, game.stats.lives,
+     game.paddle.x, game.paddle.speed, game.angle, game.angle_direction, game.angle_cycle_speed,
+     game.dropped_timer, game.transition_timer, game.streak_count, game.streak_timer,
+     skin, msg, sound.game_over_played, sound.win_played, sound.game_over_framestamp, sound.win_framestamp,
+     ) = GAME.unpack_from(view, offset)
+    offset += GAME.size
+    game.current_game_state = type(game.current_game_state)(state)
+    game.chosen_skin = game.calcifer_sprites[skin]
+    game.chosen_msg = game.dropped_msgs[msg]
+
+    game.stats.stage, game.stats.frames, *powerups = STATS.unpack_from(view, offset)
+    game.stats.powerups = {name: count for name, count in zip(POWERUP_TYPES, powerups) if count}
+    offset += STATS.size
+
+    for event_type, count in zip(EventType, COUNTS.unpack_from(view, offset)):
+        game.collision_counts.counts[event_type] = count
+    offset += COUNTS.size
+
+    effects.clock, effects.expired_through, count = EFFECTS.unpack_from(view, offset)
+    offset += EFFECTS.size
+    effects.expiry.clear()
+    effects.duration.clear()
+    effects.callbacks.clear()
+    effects.wheel.clear()
+    for _ in range(count):
+        key_len, expiry, duration, name_len = EFFECT.unpack_from(view, offset)
+        offset += EFFECT.size
+        key = literal_eval(bytes(view[offset:offset + key_len]).decode("utf-8"))
+        name = bytes(view[offset + key_len:offset + key_len + name_len]).decode("utf-8")
+        offset += key_len + name_len
+        effects.expiry[key] = expiry
+        effects.duration[key] = duration
+        effects.wheel.setdefault(expiry, set()).add(key)
+        if name:
+            effects.callbacks[key] = getattr(game, name)
+
+    rng_offset = offset                                         # restored last, see below
+    offset += RNG.size + MT_STATE * 4
+
+    (count,) = COUNT.unpack_from(view, offset)
+    offset += COUNT.size
+    while len(game.balls) > count:                              # matches the no. of balls first
+        ball = game.balls.pop()
+        if game.ball_pool is not None:
+            game.ball_pool.release(ball)
+    while len(game.balls) < count:
+        game.balls.append(game._make_ball())
+    for ball in game.balls:
+        (ball.x, ball.y, ball.prev_x, ball.prev_y, ball.speed_x, ball.speed_y, ball.gravity,
+         ball.direction_x, ball.direction_y, ball.sprite_u, ball.sprite_v, ball.last_sprite_change,
+         ball.out_of_bounds, ball.destroy_brick, trail_len,
+         ) = BALL.unpack_from(view, offset)
+        offset += BALL.size
+        trail = array("d")
+        trail.frombytes(view[offset:offset + trail_len * 2 * trail.itemsize])
+        offset += trail_len * 2 * trail.itemsize
+        ball.trail.clear()
+        for i in range(0, len(trail), 2):
+            ball.trail.push(trail[i], trail[i + 1])
+
+    game.bricks, offset = _unpack_bricks(game, view, offset)
+    game.brick_grid = BrickGrid(game.bricks)
+    (has_prefetch,) = PREFETCH.unpack_from(view, offset)
+    prefetched, offset = _unpack_bricks(game, view, offset + PREFETCH.size)
+    game.stage_prefetch = None
+    if has_prefetch:
+        game._prefetch_stage()                                  # same stage and batch size, then the built bricks
+        game.stage_prefetch.bricks = prefetched
+        game.stage_prefetch.grid = BrickGrid(prefetched)
+    game.brick_layer.invalidate_all()                           # rendering cache is re-rendered from the bricks
+
+    (count,) = COUNT.unpack_from(view, offset)
+    offset += COUNT.size
+    game.score_objects.clear()
+    for x, y, speed_y, accel, points, code in REWARD.iter_unpack(view[offset:offset + count * REWARD.size]):
+        powerup_type = POWERUP_TYPES[code - 1] if code else None
+        if isinstance(game.score_objects, list):
+            reward = Reward(x=x, y=y, points=points, falling_accel=accel, X=0, runtime=rt)
+            reward.speed_y = speed_y
+            reward.is_powerup = powerup_type is not None
+            reward.powerup_type = powerup_type
+            game.score_objects.append(reward)
+        else:
+            field = game.score_objects
+            field.spawn(x=x, y=y, points=points, falling_accel=accel, X=0)
+            field.speed_y[field.count - 1] = speed_y
+            field.powerup[field.count - 1] = code
+
+    _unpack_rng(rt.rng, view, rng_offset)                      # the constructors above drew random numbers
+    sound.channels.reset()                                      # sounds were timed on the clock that was just rewound
@@ -0,0 +1,92 @@
+"""
+Module Name: sound_channels.py
+
+Description:
+    Contains the sound channel manager, which spreads sound effects over the pyxel channels
+    not used by the music. A request goes to a free channel if there is one, otherwise it
+    may only cut off a sound of lower (or equal) priority, and a sound requested again
+    within a few frames of being played is merged into the one already playing.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from runtime import Runtime
+
+
+class SoundChannels:
+    """
+
+    Allocates the sound effect channels by priority.
+
+    Attributes:
+        rt (Runtime):                               runtime the sounds are played through
+        channels (tuple[int, ...]):                 channels available to sound effects (channel 0 plays the music)
+        window (int):                               no. of frames within which repeats of a sound are merged
+        playing (dict[int, tuple[int, int]]):       sound and priority last started on each channel
+        last_played (dict[int, int]):               frame each sound was last started on
+        played (int):                               no. of sounds played so far (across games)
+        suppressed (int):                           no. of sounds dropped or merged so far (across games)
+
+    Methods:
+        __init__(self, runtime: Runtime, channels: tuple[int, ...] = (1, 2, 3), window: int = 4) -> None:
+            Initializes the manager with every channel free.
+
+            Args:
+                runtime (Runtime):                  runtime the sounds are played through
+                channels (tuple[int, ...]):         channels available to sound effects
+                window (int):                       no. of frames within which repeats of a sound are merged
+
+        play(self, snd: int, priority: int) -> bool:
+            Plays a sound on the best channel, returns False if it was suppressed.
+
+            Args:
+                snd (int):                          sound to play
+                priority (int):                     importance of the sound (higher cuts off lower)
+
+        reset(self) -> None:
+            Forgets the playing sounds (the counters keep adding up over the session).
+
+    """
+    def __init__(self, runtime: Runtime, channels: tuple[int, ...] = (1, 2, 3), window: int = 4) -> None:
+        """ Constructor """
+        self.rt: Runtime = runtime
+        self.channels: tuple[int, ...] = channels
+        self.window: int = window
+        self.playing: dict[int, tuple[int, int]] = {}
+        self.last_played: dict[int, int] = {}
+        self.played: int = 0
+        self.suppressed: int = 0
+
+    def _pick_channel(self, priority: int) -> int | None:
+        """ Picks a free channel, else the one playing the least important sound (None if all are more important) """
+        victim = None
+        for ch in self.channels:
+            if ch not in self.playing or not self.rt.is_playing(ch):
+                return ch
+            if self.playing[ch][1] <= priority and (victim is None or self.playing[ch][1] < self.playing[victim][1]):
+                victim = ch
+        return victim
+
+    def play(self, snd: int, priority: int) -> bool:
+        """ Plays a sound on the best channel """
+        frame = self.rt.frame_count
+        if snd in self.last_played and frame - self.last_played[snd] < self.window:
+            self.suppressed += 1                                # merged into the same sound started moments ago
+            return False
+
+        ch = self._pick_channel(priority)
+        if ch is None:
+            self.suppressed += 1                                # every channel plays something more important
+            return False
+
+        self.rt.play(ch, snd)
+        self.playing[ch] = (snd, priority)
+        self.last_played[snd] = frame
+        self.played += 1
+        return True
+
+    def reset(self) -> None:
+        """ Forgets the playing sounds, but keeps the counters """
+        self.playing.clear()
+        self.last_played.clear()
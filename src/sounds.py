@@ -8,7 +8,8 @@ Author: Josh Patiño
 Date: January 01, 2025
 """
 
-import pyxel
+from runtime import Runtime
+from sound_channels import SoundChannels
 
 
 class Sounds:
@@ -17,6 +18,12 @@ class Sounds:
     A sound player that controls the sounds played.
 
     Attributes:
+        rt (Runtime):                           runtime the sounds are played through
+        channels (SoundChannels):               allocates the sound effect channels
+        HIT_PRIORITY (int):                     priority of frequent in-game sounds (hits)
+        REWARD_PRIORITY (int):                  priority of reward sounds
+        UI_PRIORITY (int):                      priority of launch, button and dropped sounds
+        CUE_PRIORITY (int):                     priority of the win and game over cues (never cut off)
         GAME_OVER_SOUND_TIMEOUT (int):          no. of frames game over sound is displayed
         WIN_SOUND_TIMEOUT (int):                no. of frames win sound is displayed
         game_over_framestamp (int):             tracks game over sound frames
@@ -25,8 +32,11 @@ class Sounds:
         win_played (bool):                      flag to check if win sound is played
     
     Methods:
-        __init__(self) -> None:
+        __init__(self, runtime: Runtime) -> None:
             Initializes the sound player.
+
+            Args:
+                runtime (Runtime):              runtime the sounds are played through
         
         play_ball_hit_sound(self) -> None:
             Plays the sound when a ball hits an object.
@@ -54,9 +64,15 @@ class Sounds:
     GAME_OVER_SOUND_TIMEOUT = 120 # 2 seconds
     WIN_SOUND_TIMEOUT = 120 # 2 seconds
 
-    def __init__(self) -> None:
+    HIT_PRIORITY = 0
+    REWARD_PRIORITY = 1
+    UI_PRIORITY = 2
+    CUE_PRIORITY = 3
+
+    def __init__(self, runtime: Runtime) -> None:
         """ Constructor """
-                                                # channel 1 for other sounds
+        self.rt = runtime
+        self.channels = SoundChannels(runtime)  # channel 0 is left to the music
         self.game_over_framestamp = 0
         self.win_framestamp = 0
         self.game_over_played = False                   
@@ -64,34 +80,34 @@ class Sounds:
 
     def play_ball_hit_sound(self) -> None:
         """ Plays a sound when the ball hits a game element (paddle/bricks)"""
-        pyxel.play(1, 3)
+        self.channels.play(3, self.HIT_PRIORITY)
 
     def play_reward_sound(self) -> None:
         """ Plays a sound for capturing a reward with the paddle """
-        pyxel.play(1, 4)
+        self.channels.play(4, self.REWARD_PRIORITY)
 
     def play_dropped_sound(self) -> None:
         """ Plays a sound for the dropped screen """
-        pyxel.play(1, 2)
+        self.channels.play(2, self.UI_PRIORITY)
 
     def play_launch_sound(self) -> None:
         """ Plays a sound when the ball is launched """
-        pyxel.play(1,7) 
+        self.channels.play(7, self.UI_PRIORITY) 
 
     def play_clicked_button_sound(self) -> None:
         """ PLays a sound when a button is clicked """
-        pyxel.play(1,8)
+        self.channels.play(8, self.UI_PRIORITY)
 
     def play_win_sound(self) -> None:
         """ Plays sound on win screen """
         if self.win_played:
             return                              # exits if sound has already been played
         
-        current_frame = pyxel.frame_count
+        current_frame = self.rt.frame_count
         if current_frame - self.win_framestamp >= self.WIN_SOUND_TIMEOUT:
             self.win_played = True
             self.win_framestamp_framestamp = current_frame
-            pyxel.play(1, 6)
+            self.channels.play(6, self.CUE_PRIORITY)
 
     def play_game_over_sound(self) -> None:
         """ Plays sound on game over screen """
@@ -99,8 +115,8 @@ class Sounds:
         if self.game_over_played:
             return                              # exits if sound has already been played
         
-        current_frame = pyxel.frame_count
+        current_frame = self.rt.frame_count
         if current_frame - self.game_over_framestamp >= self.GAME_OVER_SOUND_TIMEOUT:
             self.game_over_played = True  
             self.game_over_framestamp = current_frame
-            pyxel.play(1, 5)
\ No newline at end of file
+            self.channels.play(5, self.CUE_PRIORITY)
\ No newline at end of file
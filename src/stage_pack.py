@@ -0,0 +1,132 @@
+"""
+Module Name: stage_pack.py
+
+Description:
+    Contains the stage compiler and the binary level pack reader. The compiler turns a
+    stages JSON file into a compact pack, and the game memory-maps the pack and decodes
+    only the stage it loads, so startup time and memory don't grow with the pack size.
+
+    File format (little-endian):
+        header:     magic (4s) "CCSP", version (u16), P (i32), G (i32), X (i32), Q (i32), stage count (u32)
+        index:      per stage, offset of its first record (u32) and no. of bricks (u32)
+        records:    per brick, x (i16), y (i16), brick_type (u8)
+
+    Usage:
+        python stage_pack.py stages.json stages.ccsp
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import json
+import mmap
+import struct
+
+MAGIC: bytes = b"CCSP"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sHiiiiI")
+INDEX_ENTRY: struct.Struct = struct.Struct("<II")
+RECORD: struct.Struct = struct.Struct("<hhB")
+
+
+def compile_stages(json_path: str, pack_path: str) -> int:
+    """ Compiles a stages JSON file into a level pack and returns the no. of stages written """
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    stages = data["stages"]
+
+    index = bytearray()
+    records = bytearray()
+    offset = HEADER.size + INDEX_ENTRY.size * len(stages)      # records start right after the index
+    for stage in stages:
+        bricks = stage["bricks"]
+        index += INDEX_ENTRY.pack(offset + len(records), len(bricks))
+        for brick in bricks:
+            records += RECORD.pack(brick["x"], brick["y"], brick["brick_type"])
+
+    with open(pack_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, data["P"], data["G"], data["X"], data["Q"], len(stages)))
+        f.write(index)
+        f.write(records)
+    return len(stages)
+
+def is_stage_pack(path: str) -> bool:
+    """ True if the file starts with the level pack magic """
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class StagePack:
+    """
+
+    Read-only, memory-mapped level pack that behaves like the list of stages of a JSON file.
+
+    Attributes:
+        file (BinaryIO):                    the open pack file
+        data (mmap.mmap):                   memory map of the pack
+        P (int):                            Points Contribution
+        G (int):                            Power-Up Duration (in seconds)
+        X (int):                            Power-Up Drop Chance (in %)
+        Q (int):                            Streak Increment
+        count (int):                        no. of stages in the pack
+
+    Methods:
+        __init__(self, path: str) -> None:
+            Maps the pack and reads its header.
+
+            Args:
+                path (str):                 path to the pack
+
+        __len__(self) -> int:
+            Returns the no. of stages.
+
+        __getitem__(self, stage_index: int) -> dict[str, list[dict[str, int]]]:
+            Decodes a single stage, in the same shape as a stage of the JSON file.
+
+            Args:
+                stage_index (int):          stage no. (0-indexed)
+
+        close(self) -> None:
+            Unmaps and closes the pack.
+
+    """
+    def __init__(self, path: str) -> None:
+        """ Constructor """
+        self.file = open(path, "rb")
+        self.data: mmap.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.P, self.G, self.X, self.Q, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a supported level pack")
+
+    def __len__(self) -> int:
+        """ Returns the no. of stages """
+        return self.count
+
+    def __getitem__(self, stage_index: int) -> dict[str, list[dict[str, int]]]:
+        """ Decodes only the requested stage """
+        if not 0 <= stage_index < self.count:
+            raise IndexError(f"stage {stage_index} is out of range")
+        offset, brick_count = INDEX_ENTRY.unpack_from(self.data, HEADER.size + INDEX_ENTRY.size * stage_index)
+        end = offset + RECORD.size * brick_count
+        return {"bricks": [
+            {"x": x, "y": y, "brick_type": brick_type}
+            for x, y, brick_type in RECORD.iter_unpack(self.data[offset:end])
+        ]}
+
+    def close(self) -> None:
+        """ Unmaps and closes the pack """
+        self.data.close()
+        self.file.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compiles a stages JSON file into a binary level pack.")
+    parser.add_argument("source", help="stages JSON file")
+    parser.add_argument("target", help="level pack to write")
+    args = parser.parse_args()
+
+    print(f"{compile_stages(args.source, args.target)} stages written to {args.target}")
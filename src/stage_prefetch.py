@@ -0,0 +1,90 @@
+"""
+Module Name: stage_prefetch.py
+
+Description:
+    Contains the stage prefetcher, which builds the bricks, spatial index and brick layer of
+    the next stage a few bricks per frame (e.g. while the stage transition screen is shown),
+    so that swapping the stage in is instant.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from math import ceil
+
+from brick import Brick
+from brick_grid import BrickGrid
+from brick_layer import BrickLayer
+from runtime import Runtime
+
+
+class StagePrefetch:
+    """
+
+    A stage being built incrementally. Bricks are built in stage order with the same random
+    draws as a direct load, so prefetching never changes a seeded session.
+
+    Attributes:
+        rt (Runtime):                                   runtime providing the randomness
+        records (list[dict[str, int]]):                 bricks of the stage, as read from the stages file
+        bricks (list[Brick]):                           bricks built so far
+        grid (BrickGrid):                               spatial index of the bricks built so far
+        layer (BrickLayer):                             layer the bricks are pre-rendered into
+        per_step (int):                                 no. of bricks built per step
+
+    Methods:
+        __init__(self, stage: dict[str, list[dict[str, int]]], runtime: Runtime, layer: BrickLayer, steps: int = 1) -> None:
+            Prepares an empty stage.
+
+            Args:
+                stage (dict[str, list[dict[str, int]]]):    stage to build
+                runtime (Runtime):                      runtime providing the randomness
+                layer (BrickLayer):                     layer the bricks are pre-rendered into
+                steps (int):                            no. of steps the building is spread over
+
+        done(self) -> bool:
+            * property
+            True once every brick is built.
+
+        step(self) -> None:
+            Builds the next batch of bricks.
+
+        finish(self) -> "StagePrefetch":
+            Builds every remaining brick.
+
+        prerender(self) -> None:
+            Renders the bricks built so far into the layer (needs the pyxel window, so it runs from the draw step).
+
+    """
+    def __init__(self, stage: dict[str, list[dict[str, int]]], runtime: Runtime, layer: BrickLayer, steps: int = 1) -> None:
+        """ Constructor """
+        self.rt: Runtime = runtime
+        self.records: list[dict[str, int]] = stage["bricks"]
+        self.bricks: list[Brick] = []
+        self.grid: BrickGrid = BrickGrid(self.bricks)
+        self.layer: BrickLayer = layer
+        self.layer.invalidate_all()                             # the layer is re-rendered from scratch
+        self.per_step: int = max(1, ceil(len(self.records) / steps))
+
+    @property
+    def done(self) -> bool:
+        """ True once every brick is built """
+        return len(self.bricks) == len(self.records)
+
+    def step(self) -> None:
+        """ Builds the next batch of bricks """
+        start = len(self.bricks)
+        for record in self.records[start:start + self.per_step]:
+            brick = Brick(record["x"], record["y"], record["brick_type"], K=self.rt.rndi(a=2,b=4), rng=self.rt.rng)
+            self.bricks.append(brick)
+            self.grid.insert(brick)
+
+    def finish(self) -> "StagePrefetch":
+        """ Builds every remaining brick """
+        while not self.done:
+            self.step()
+        return self
+
+    def prerender(self) -> None:
+        """ Renders the newly built bricks into the layer """
+        self.layer.prerender(self.bricks)
@@ -0,0 +1,78 @@
+"""
+Module Name: timestep.py
+
+Description:
+    Contains the fixed-timestep loop. The game logic always advances in steps of 1/60 s, no
+    matter how often pyxel calls update: a slow frame runs several steps to catch up (up to
+    a cap), and a fast frame (e.g. uncapped rendering) may run none, in which case drawing
+    interpolates between the last two steps.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from time import perf_counter
+from typing import Callable
+
+
+class FixedStepLoop:
+    """
+
+    Accumulates real time and spends it on fixed simulation steps.
+
+    Attributes:
+        step (Callable[[], None]):          runs a single simulation step
+        dt (float):                         length of a simulation step (in seconds)
+        max_steps (int):                    cap on the steps run per tick (avoids a spiral of death)
+        clock (Callable[[], float]):        returns the current time (in seconds)
+        accumulator (float):                real time not yet simulated
+        last_time (float | None):           time of the previous tick
+        alpha (float):                      how far (0-1) the render time is between the last two steps
+        skipped (int):                      total no. of steps dropped because of the cap
+
+    Methods:
+        __init__(self, step: Callable[[], None], dt: float = 1 / 60, max_steps: int = 5, clock: Callable[[], float] = perf_counter) -> None:
+            Initializes the loop.
+
+            Args:
+                step (Callable[[], None]):      runs a single simulation step
+                dt (float):                     length of a simulation step
+                max_steps (int):                cap on the steps run per tick
+                clock (Callable[[], float]):    returns the current time
+
+        tick(self) -> int:
+            Runs the steps that are due and returns how many ran.
+
+    """
+    def __init__(self, step: Callable[[], None], dt: float = 1 / 60, max_steps: int = 5, clock: Callable[[], float] = perf_counter) -> None:
+        """ Constructor """
+        self.step: Callable[[], None] = step
+        self.dt: float = dt
+        self.max_steps: int = max_steps
+        self.clock: Callable[[], float] = clock
+        self.accumulator: float = 0
+        self.last_time: float | None = None
+        self.alpha: float = 1.0
+        self.skipped: int = 0
+
+    def tick(self) -> int:
+        """ Runs the simulation steps that are due """
+        now = self.clock()
+        if self.last_time is None:
+            self.accumulator = self.dt                          # the first tick always runs a step
+        else:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self.step()
+            self.accumulator -= self.dt
+            steps += 1
+
+        if self.accumulator >= self.dt:                         # too far behind, the game slows down instead
+            self.skipped += int(self.accumulator // self.dt)
+            self.accumulator %= self.dt
+
+        self.alpha = self.accumulator / self.dt
+        return steps
@@ -0,0 +1,149 @@
+"""
+Module Name: trails.py
+
+Description:
+    Contains the trail system of the balls. Each ball keeps its past positions in a
+    fixed-capacity ring buffer, and a shared renderer draws the shimmering particles of
+    all trails at once, using jitter and color tables precomputed at startup and cycled
+    by frame index instead of calling the random number generator per particle.
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+from rng import GameRNG
+
+TRAIL_COLORS: tuple[int, ...] = (9, 8, 10)                    # pyxel orange, red and yellow
+
+
+class TrailBuffer:
+    """
+
+    Fixed-capacity ring buffer of a ball's past positions.
+
+    Attributes:
+        capacity (int):                         max no. of positions kept
+        xs (list[float]):                       x-pos of each slot
+        ys (list[float]):                       y-pos of each slot
+        head (int):                             slot the next position is written to
+        size (int):                             no. of positions currently kept
+
+    Methods:
+        __init__(self, capacity: int) -> None:
+            Initializes an empty trail.
+
+            Args:
+                capacity (int):                 max no. of positions kept
+
+        push(self, x: float, y: float) -> None:
+            Stores a position, overwriting the oldest one once full.
+
+        clear(self) -> None:
+            Forgets every position.
+
+        resize(self, capacity: int) -> None:
+            Changes the capacity, keeping the newest positions.
+
+        latest(self, limit: int) -> list[tuple[float, float]]:
+            Returns up to `limit` positions, newest first.
+
+        __len__(self) -> int:
+            Returns the no. of positions kept.
+
+    """
+    def __init__(self, capacity: int) -> None:
+        """ Constructor """
+        self.capacity: int = capacity
+        self.xs: list[float] = [0.0] * capacity
+        self.ys: list[float] = [0.0] * capacity
+        self.head: int = 0
+        self.size: int = 0
+
+    def push(self, x: float, y: float) -> None:
+        """ Stores a position in O(1) """
+        self.xs[self.head] = x
+        self.ys[self.head] = y
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def clear(self) -> None:
+        """ Forgets every position (the slots are reused) """
+        self.head = 0
+        self.size = 0
+
+    def resize(self, capacity: int) -> None:
+        """ Changes the capacity, keeping the newest positions """
+        points = self.latest(capacity)[::-1]                # oldest first
+        self.__init__(capacity)
+        for x, y in points:
+            self.push(x, y)
+
+    def latest(self, limit: int) -> list[tuple[float, float]]:
+        """ Up to `limit` positions, newest first """
+        xs, ys, cap, head = self.xs, self.ys, self.capacity, self.head
+        return [(xs[(head - i) % cap], ys[(head - i) % cap]) for i in range(1, min(limit, self.size) + 1)]
+
+    def __len__(self) -> int:
+        """ Returns the no. of positions kept """
+        return self.size
+
+
+class TrailRenderer:
+    """
+
+    Draws the trails of every ball in a single pass.
+
+    Attributes:
+        margin (int):                           how far a particle is jittered from its position at most
+        length (int):                           max no. of positions drawn per trail (can be lower than their capacity)
+        jitter_x (list[int]):                   precomputed horizontal offsets
+        jitter_y (list[int]):                   precomputed vertical offsets
+        colors (list[int]):                     precomputed particle colors
+        TABLE_SIZE (int):                       no. of entries in each table (a power of 2)
+
+    Methods:
+        __init__(self, margin: int = 3, length: int = 10, seed: int = 0) -> None:
+            Precomputes the jitter and color tables.
+
+            Args:
+                margin (int):                   how far a particle is jittered at most
+                length (int):                   max no. of positions drawn per trail
+                seed (int):                     seed used to fill the tables
+
+        draw(self, trails: list[TrailBuffer], frame: int) -> None:
+            Draws the particles of all trails.
+
+            Args:
+                trails (list[TrailBuffer]):     trails to draw
+                frame (int):                    current frame no. (picks the table entries)
+
+    """
+    TABLE_SIZE: int = 256
+
+    def __init__(self, margin: int = 3, length: int = 10, seed: int = 0) -> None:
+        """ Constructor """
+        self.margin: int = margin
+        self.length: int = length
+                                                            # same ranges as the old per-particle rndi/choice calls
+        rng = GameRNG(seed)
+        self.jitter_x: list[int] = [rng.rndi(-margin, margin + 1) for _ in range(self.TABLE_SIZE)]
+        self.jitter_y: list[int] = [rng.rndi(0, margin + 1) for _ in range(self.TABLE_SIZE)]
+        self.colors: list[int] = [rng.choice(TRAIL_COLORS) for _ in range(self.TABLE_SIZE)]
+
+    def draw(self, trails: list[TrailBuffer], frame: int) -> None:
+        """ Draws the shimmering particles of all trails """
+        import pyxel
+        circb = pyxel.circb                                 # local lookups for the hot loop
+        jitter_x, jitter_y, colors = self.jitter_x, self.jitter_y, self.colors
+        mask = self.TABLE_SIZE - 1
+        length = self.length
+
+        for t, trail in enumerate(trails):
+            k = frame * 37 + t * 101                        # each frame and trail reads a different stretch of the tables
+            for trail_x, trail_y in trail.latest(length):
+                k = (k + 1) & mask
+                circb(int(trail_x) + jitter_x[k], int(trail_y) + jitter_y[k], 0.5, colors[k])
+
+
+TRAIL_RENDERER: TrailRenderer = TrailRenderer()             # shared by every ball
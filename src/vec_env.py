@@ -0,0 +1,573 @@
+"""
+Module Name: vec_env.py
+
+Description:
+    Contains the "BreakoutVecEnv", a gym-style environment that steps N independent games in
+    lockstep for training paddle agents. Instead of looping N BreakoutGame objects, the state
+    of every game lives in (N, ...) NumPy arrays and each rule of the RUNNING state (paddle,
+    balls, bricks, score objects, powerups, streaks, lives and stages) is applied to all games
+    at once. Menus and waiting screens are skipped: a ball is launched right away at a random
+    indicator angle, after a drop or a stage clear alike.
+    Requires NumPy.
+
+    Usage:
+        python vec_env.py --envs 1024 --steps 2000      (reports the env-steps per second)
+
+Author: Josh Patiño
+Date: October 17, 2026
+"""
+
+import numpy as np
+import os
+
+from ball import Ball
+from brick import BrickType
+from main import BreakoutGame
+from paddle import Paddle
+from reward import POWERUP_TYPES
+from runtime import HeadlessRuntime
+
+STAGES_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stages.json")
+
+                                                                # powerup codes (index + 1 in POWERUP_TYPES, 0 is none)
+LIFE_UP, ANTIGRAVITY, PADDLE_SPEED, DOUBLE_POINTS = (POWERUP_TYPES.index(name) + 1 for name in
+                                                     ("life_up", "antigravity", "paddle_speed", "double_points"))
+
+
+class BreakoutVecEnv:
+    """
+
+    N games stepped together, with the game rules batched across them.
+
+    Observations are a dict of float32 arrays, overwritten in place by every step and reset:
+        "paddle":   (N, 2)      x-pos and speed of the paddle
+        "balls":    (N, B, 5)   x-pos, y-pos, x-speed, y-speed and whether the slot is in play
+        "bricks":   (N, M, 4)   x-pos, y-pos, type (0 if the slot is empty) and health (0 once destroyed)
+        "rewards":  (N, R, 5)   x-pos, y-pos, falling speed, powerup code and whether the slot is in play
+        "stats":    (N, 4)      score, lives, stage no. and streak
+
+    Attributes:
+        n (int):                                    no. of games
+        max_balls (int):                            ball slots per game (extra balls from ball makers are lost)
+        max_rewards (int):                          score object slots per game (extra ones are lost)
+        max_frames (int | None):                    episodes are cut off after this many frames (never if None)
+        launch_angles (tuple[int, int]):            range of the launch angle (degrees, even like the indicator)
+        rng (np.random.Generator):                  randomness of every game
+        width (int):                                width of the play area
+        height (int):                               height of the play area
+        P, G, X, Q (int):                           game parameters from the stages file
+        gravity (float):                            gravity felt by balls and score objects
+        stage_bricks (np.ndarray):                  (S, M, 3) x-pos, y-pos and type of the bricks of every stage
+        score, lives, stage, streak (np.ndarray):   stats of every game (stage is 0-indexed)
+        frames (np.ndarray):                        no. of frames of the current episode of every game
+        clock (np.ndarray):                         powerup clock of every game
+        antigravity_until (np.ndarray):             frame the antigravity powerup expires on (-1 if inactive)
+        double_until (np.ndarray):                  frame the double points powerup expires on (-1 if inactive)
+        paddle_x, paddle_speed (np.ndarray):        paddle of every game
+        ball_* (np.ndarray):                        (N, B) ball state, in play balls packed first like the game's list
+        brick_* (np.ndarray):                       (N, M) brick state of the current stage
+        reward_* (np.ndarray):                      (N, R) score object state, reward_seq orders them by spawn
+        obs (dict[str, np.ndarray]):                observation buffers
+
+    Methods:
+        __init__(self, n: int, seed: int = 0, stages_path: str = STAGES_PATH, max_balls: int = 8, max_rewards: int = 64,
+                 max_frames: int | None = None, launch_angles: tuple[int, int] = (30, 150)) -> None:
+            Initializes N games, all waiting for reset.
+
+            Args:
+                n (int):                            no. of games
+                seed (int):                         seed of the random number generator
+                stages_path (str):                  stages JSON file or compiled level pack
+                max_balls (int):                    ball slots per game
+                max_rewards (int):                  score object slots per game
+                max_frames (int | None):            episodes are cut off after this many frames
+                launch_angles (tuple[int, int]):    range of the launch angle (degrees)
+
+        reset(self, seed: int | None = None) -> dict[str, np.ndarray]:
+            Starts a new episode in every game and returns the observations.
+
+        step(self, actions: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+            Simulates one frame of every game. Finished games are reset right away.
+
+            Args:
+                actions (np.ndarray):               (N,) x-pos each paddle heads to (like the mouse)
+
+            Returns:
+                (observations, rewards (score gained), dones, info with "won", "truncated" and "final_score")
+
+    """
+    def __init__(self, n: int, seed: int = 0, stages_path: str = STAGES_PATH, max_balls: int = 8, max_rewards: int = 64,
+                 max_frames: int | None = None, launch_angles: tuple[int, int] = (30, 150)) -> None:
+        """ Constructor """
+        self.n: int = n
+        self.max_balls: int = max_balls
+        self.max_rewards: int = max_rewards
+        self.max_frames: int | None = max_frames
+        self.launch_angles: tuple[int, int] = launch_angles
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+                                                                # sizes and constants are read from the game objects
+        rt = HeadlessRuntime(seed=seed)
+        paddle, ball = Paddle(rt), Ball(0.0, rt)
+        self.width: int = rt.width
+        self.height: int = rt.height
+        self.paddle_w: float = paddle.w
+        self.paddle_h: float = paddle.h
+        self.paddle_y: float = paddle.y
+        self.paddle_start_x: float = paddle.x
+        self.paddle_base_speed: float = paddle.speed
+        self.r: int = ball.r
+        self.velocity_increase: float = ball.VELOCITY_INCREASE
+        self.max_speed: float = ball.MAX_SPEED
+        self.launch_speed: float = 2.5
+        self.gravity: float = 0.010
+        self.reward_w, self.reward_h = 8, 10
+
+        self.P, self.G, self.X, self.Q, stages = BreakoutGame._load_stages(stages_path)
+        self.g: int = self.G * 60                                # powerup duration (60 fps)
+        records = [stages[i]["bricks"] for i in range(len(stages))]
+        m = max(len(bricks) for bricks in records)
+        self.stage_bricks: np.ndarray = np.zeros((len(records), m, 3), dtype=np.float64)
+        for i, bricks in enumerate(records):
+            for j, record in enumerate(bricks):
+                self.stage_bricks[i, j] = record["x"], record["y"], record["brick_type"]
+        types = np.arange(max(BrickType) + 1)                   # per type lookup tables (type 0 is an empty slot)
+        self.type_w = np.array([BrickType[t].w if t else 0 for t in types], dtype=np.float64)
+        self.type_h = np.array([BrickType[t].h if t else 0 for t in types], dtype=np.float64)
+        self.type_health = np.array([BrickType[t].health if t else 0 for t in types], dtype=np.int8)
+
+        b, r = max_balls, max_rewards
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.zeros(n, dtype=np.int64)
+        self.stage = np.zeros(n, dtype=np.int64)
+        self.streak = np.zeros(n, dtype=np.int64)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.clock = np.zeros(n, dtype=np.int64)
+        self.antigravity_until = np.full(n, -1, dtype=np.int64)
+        self.double_until = np.full(n, -1, dtype=np.int64)
+        self.paddle_x = np.zeros(n, dtype=np.float64)
+        self.paddle_speed = np.zeros(n, dtype=np.float64)
+
+        self.ball_x = np.zeros((n, b), dtype=np.float64)
+        self.ball_y = np.zeros((n, b), dtype=np.float64)
+        self.ball_speed_x = np.zeros((n, b), dtype=np.float64)
+        self.ball_speed_y = np.zeros((n, b), dtype=np.float64)
+        self.ball_gravity = np.zeros((n, b), dtype=np.float64)
+        self.ball_direction_x = np.ones((n, b), dtype=np.int8)
+        self.ball_direction_y = np.ones((n, b), dtype=np.int8)
+        self.ball_active = np.zeros((n, b), dtype=np.bool_)
+        self.ball_out = np.zeros((n, b), dtype=np.bool_)
+
+        self.brick_x = np.zeros((n, m), dtype=np.float64)
+        self.brick_y = np.zeros((n, m), dtype=np.float64)
+        self.brick_type = np.zeros((n, m), dtype=np.int8)
+        self.brick_health = np.zeros((n, m), dtype=np.int8)
+        self.brick_K = np.zeros((n, m), dtype=np.int8)
+
+        self.reward_x = np.zeros((n, r), dtype=np.float64)
+        self.reward_y = np.zeros((n, r), dtype=np.float64)
+        self.reward_speed_y = np.zeros((n, r), dtype=np.float64)
+        self.reward_powerup = np.zeros((n, r), dtype=np.int8)
+        self.reward_active = np.zeros((n, r), dtype=np.bool_)
+        self.reward_seq = np.zeros((n, r), dtype=np.int64)
+        self.next_seq = np.zeros(n, dtype=np.int64)
+
+        self.obs: dict[str, np.ndarray] = {
+            "paddle": np.zeros((n, 2), dtype=np.float32),
+            "balls": np.zeros((n, b, 5), dtype=np.float32),
+            "bricks": np.zeros((n, m, 4), dtype=np.float32),
+            "rewards": np.zeros((n, r, 5), dtype=np.float32),
+            "stats": np.zeros((n, 4), dtype=np.float32),
+        }
+
+# +++++++++++++++++++++++++++++++++ STAGE MANAGEMENT +++++++++++++++++++++++++++++++++
+
+    def _load_stage(self, rows: np.ndarray) -> None:
+        """ Loads the current stage of the given games (rolls K per brick like StagePrefetch) """
+        bricks = self.stage_bricks[self.stage[rows]]
+        self.brick_x[rows] = bricks[..., 0]
+        self.brick_y[rows] = bricks[..., 1]
+        types = bricks[..., 2].astype(np.int8)
+        self.brick_type[rows] = types
+        self.brick_health[rows] = self.type_health[types]
+        self.brick_K[rows] = self.rng.integers(2, 5, size=types.shape)
+
+    def _reset_ball(self, rows: np.ndarray) -> None:
+        """ Puts a single ball on the paddle and launches it at a random indicator angle """
+        low, high = self.launch_angles
+        angle = np.radians(self.rng.integers(low // 2, high // 2 + 1, size=len(rows)) * 2)
+        self.ball_active[rows] = False
+        self.ball_out[rows] = False
+        self.ball_active[rows, 0] = True
+        self.ball_x[rows, 0] = self.paddle_x[rows] + self.paddle_w / 2 - self.r
+        self.ball_y[rows, 0] = self.paddle_y - 2 * self.r
+        self.ball_speed_x[rows, 0] = np.cos(angle) * self.launch_speed
+        self.ball_speed_y[rows, 0] = -np.sin(angle) * self.launch_speed
+                                                                # the remaining ball keeps feeling antigravity
+        self.ball_gravity[rows, 0] = np.where(self.antigravity_until[rows] >= 0, 0.0, self.gravity)
+
+    def _expire(self, rows: np.ndarray) -> None:
+        """ Expires every powerup of the given games (restores gravity) """
+        anti = rows[self.antigravity_until[rows] >= 0]
+        self.ball_gravity[anti] = self.gravity
+        self.antigravity_until[rows] = -1
+        self.double_until[rows] = -1
+
+    def _reset_games(self, rows: np.ndarray) -> None:
+        """ Starts a new episode in the given games """
+        self.score[rows] = 0
+        self.lives[rows] = 3
+        self.stage[rows] = 0
+        self.streak[rows] = 0
+        self.frames[rows] = 0
+        self.clock[rows] = 0
+        self.antigravity_until[rows] = -1
+        self.double_until[rows] = -1
+        self.paddle_x[rows] = self.paddle_start_x
+        self.paddle_speed[rows] = self.paddle_base_speed
+        self.reward_active[rows] = False
+        self._load_stage(rows)
+        self._reset_ball(rows)
+
+# +++++++++++++++++++++++++++++++++ COLLISION METHODS +++++++++++++++++++++++++++++++++
+
+    def _collide(self, x, y, speed_x, speed_y, direction_x, direction_y, ox, oy, ow, oh, is_paddle: bool):
+        """ Ball.detect_collision against one object per ball, returns the new x, y, speeds and the hit mask """
+        d = 2 * self.r
+        left, top = x + speed_x, y + speed_y                    # ball's bounding box at its next position
+        right, bottom = left + d, top + d
+        obj_right, obj_bottom = ox + ow, oy + oh
+        hit = (right >= ox) & (left <= obj_right) & (bottom >= oy) & (top <= obj_bottom)
+        if not hit.any():
+            return x, y, speed_x, speed_y, hit
+
+        contact_x = np.maximum(ox, np.minimum(right, obj_right))
+        contact_y = np.maximum(oy, np.minimum(bottom, obj_bottom))
+        overlap_x = np.minimum(np.abs(right - ox), np.abs(left - obj_right))
+        overlap_y = np.minimum(np.abs(bottom - oy), np.abs(top - obj_bottom))
+
+        vertical = hit & (overlap_y < overlap_x)                # same side checks as the game, in the same order
+        on_top = vertical & (bottom >= oy) & (oy > top)
+        on_bottom = vertical & ~on_top & (top <= obj_bottom) & (obj_bottom < bottom)
+        horizontal = hit & ~(overlap_y < overlap_x)
+        on_right = horizontal & (left <= obj_right) & (obj_right < right)
+        on_left = horizontal & ~on_right & (right >= ox) & (ox > left)
+
+        y = np.where(on_top, y - overlap_y * 0.9, np.where(on_bottom, y + overlap_y * 0.9, y))
+        x = np.where(on_right, x + overlap_x * 0.9, np.where(on_left, x - overlap_x * 0.9, x))
+
+                                                                # deflection angle (Ball._handle_collisions)
+        is_x = on_top | on_bottom
+        contact = np.where(is_x, contact_x, contact_y)
+        center = np.where(is_x, ox + ow / 2, oy + oh / 2)
+        max_offset = np.where(is_x, ow / 2, oh / 2)
+        scale = np.abs((contact - center) / np.where(max_offset == 0, 1, max_offset))
+        small = scale < 0.05
+        from_left, from_below = direction_x == 1, direction_y == -1
+        angle = np.where(on_top, np.where(small, 90, np.where(from_left, 90 + scale * (20 - 90), 90 - scale * (20 - 90))), 0.0)
+        if is_paddle:
+            angle = np.where(on_bottom, 270, angle)
+        else:
+            angle = np.where(on_bottom, np.where(small, 270, np.where(from_left, 270 + scale * (340 - 270), 270 - scale * (340 - 270))), angle)
+        angle = np.where(on_left, np.where(small, 180, np.where(from_below, 180 - scale * (180 - 110), 180 + scale * (250 - 180))), angle)
+        angle = np.where(on_right, np.where(small, 360, np.where(from_below, (360 + scale * 50) % 360, 360 - scale * 110)), angle)
+
+        deflected = is_x | on_left | on_right
+        magnitude = np.sqrt(speed_x ** 2 + speed_y ** 2)
+        radians = np.radians(angle)
+        speed_x = np.where(deflected, magnitude * np.cos(radians), speed_x)
+        speed_y = np.where(deflected, -magnitude * np.sin(radians), speed_y)
+        straight = deflected & ((angle == 90) | (angle == 270))  # keeps the ball from bouncing straight up forever
+        speed_x = np.where(straight, speed_x + np.where(direction_x == -1, -0.1, 0.1), speed_x)
+
+                                                                # applies speed cap and proportional increase
+        magnitude = np.sqrt(speed_x ** 2 + speed_y ** 2)
+        ratio = np.minimum(magnitude + self.velocity_increase, self.max_speed) / np.where(magnitude == 0, 1, magnitude)
+        speed_x = np.where(hit, speed_x * ratio, speed_x)
+        speed_y = np.where(hit, speed_y * ratio, speed_y)
+        return x, y, speed_x, speed_y, hit
+
+    def _collide_slot(self, slot: int, rows: np.ndarray) -> None:
+        """ Collides one ball slot of the given games with the paddle, then with the latest loaded brick it touches """
+        x, y = self.ball_x[rows, slot], self.ball_y[rows, slot]
+        speed_x, speed_y = self.ball_speed_x[rows, slot], self.ball_speed_y[rows, slot]
+        direction_x, direction_y = self.ball_direction_x[rows, slot], self.ball_direction_y[rows, slot]
+
+        x, y, speed_x, speed_y, _ = self._collide(x, y, speed_x, speed_y, direction_x, direction_y, self.paddle_x[rows],
+                                                  self.paddle_y, self.paddle_w, self.paddle_h, is_paddle=True)
+
+        d = 2 * self.r
+        left, top = (x + speed_x)[:, None], (y + speed_y)[:, None]
+        bx, by, types = self.brick_x[rows], self.brick_y[rows], self.brick_type[rows]
+        touching = ((self.brick_health[rows] != 0) & (left + d >= bx) & (left <= bx + self.type_w[types])
+                    & (top + d >= by) & (top <= by + self.type_h[types]))
+        has_brick = touching.any(axis=1)
+        if has_brick.any():
+            sub = np.flatnonzero(has_brick)
+            m = touching.shape[1]
+            j = m - 1 - np.argmax(touching[sub, ::-1], axis=1)  # latest loaded first, like BrickGrid.query
+            brick_types = types[sub, j]
+            x[sub], y[sub], speed_x[sub], speed_y[sub], _ = self._collide(
+                x[sub], y[sub], speed_x[sub], speed_y[sub], direction_x[sub], direction_y[sub],
+                bx[sub, j], by[sub, j], self.type_w[brick_types], self.type_h[brick_types], is_paddle=False)
+            self._hit_bricks(rows[sub], j)
+
+        self.ball_x[rows, slot], self.ball_y[rows, slot] = x, y
+        self.ball_speed_x[rows, slot], self.ball_speed_y[rows, slot] = speed_x, speed_y
+
+    def _hit_bricks(self, rows: np.ndarray, j: np.ndarray) -> None:
+        """ Takes a hit off each brick (indestructible ones are unaffected), then handles the destroyed ones """
+        health = self.brick_health[rows, j]
+        damaged = health > 0
+        health = np.where(damaged, health - 1, health)
+        self.brick_health[rows, j] = health
+        destroyed = damaged & (health == 0)
+        if not destroyed.any():
+            return
+        rows, j = rows[destroyed], j[destroyed]
+        types = self.brick_type[rows, j]
+        bx, by = self.brick_x[rows, j], self.brick_y[rows, j]
+
+        makers = types == 5                                     # ball makers add a ball at their center
+        if makers.any():
+            self._spawn_balls(rows[makers], bx[makers] + self.type_w[5] / 2, by[makers] + self.type_h[5] / 2)
+        others = ~makers
+        if others.any():
+            self._spawn_rewards(rows[others], bx[others], by[others], self.brick_K[rows[others], j[others]])
+
+    def _spawn_balls(self, rows: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        """ Adds a ball with a random direction and speed behind the balls of each game """
+        angle = np.radians(self.rng.integers(0, 361, size=len(rows)))
+        speed = self.rng.uniform(1, self.max_speed, size=len(rows))
+        slot = self.ball_active[rows].sum(axis=1)               # balls are packed, so this is the first free slot
+        room = slot < self.max_balls
+        rows, slot = rows[room], slot[room]
+        self.ball_active[rows, slot] = True
+        self.ball_out[rows, slot] = False
+        self.ball_x[rows, slot], self.ball_y[rows, slot] = x[room], y[room]
+        self.ball_speed_x[rows, slot] = speed[room] * np.cos(angle[room])
+        self.ball_speed_y[rows, slot] = -speed[room] * np.sin(angle[room])
+        self.ball_gravity[rows, slot] = self.gravity            # new balls never start with antigravity, like the game's
+        self.ball_direction_x[rows, slot] = 1
+        self.ball_direction_y[rows, slot] = -1
+
+    def _spawn_rewards(self, rows: np.ndarray, bx: np.ndarray, by: np.ndarray, K: np.ndarray) -> None:
+        """ Spawns K score objects within each destroyed brick (same layout as the game) """
+        offsets = ((2, 2), (10, 2), (2, 22), (10, 22))
+        for k, (dx, dy) in enumerate(offsets[:int(K.max())]):
+            sub = np.flatnonzero(K > k)
+            r = rows[sub]
+            speed = self.rng.uniform(0.5, 0.75, size=len(r))
+            powerup = np.where(self.rng.integers(1, 101, size=len(r)) <= self.X,
+                               self.rng.integers(1, len(POWERUP_TYPES) + 1, size=len(r)), 0)
+            free = ~self.reward_active[r]
+            slot = np.argmax(free, axis=1)
+            room = free[np.arange(len(r)), slot]
+            r, slot, sub = r[room], slot[room], sub[room]
+            self.reward_active[r, slot] = True
+            self.reward_x[r, slot] = bx[sub] + dx
+            self.reward_y[r, slot] = by[sub] + dy
+            self.reward_speed_y[r, slot] = speed[room]
+            self.reward_powerup[r, slot] = powerup[room]
+            self.reward_seq[r, slot] = self.next_seq[r]
+            self.next_seq[r] += 1
+
+# +++++++++++++++++++++++++++++++++ UPDATE METHODS +++++++++++++++++++++++++++++++++
+
+    def _move_balls(self) -> None:
+        """ Moves every ball and bounces them off the walls (BallPool.update for all games) """
+        x, y, speed_x, speed_y = self.ball_x, self.ball_y, self.ball_speed_x, self.ball_speed_y
+        d = 2 * self.r
+        speed_y += self.ball_gravity
+        np.minimum(speed_y, 5, out=speed_y)
+        x += speed_x
+        y += speed_y
+        self.ball_direction_x[...] = np.where(speed_x > 0, 1, -1)
+        self.ball_direction_y[...] = np.where(speed_y > 0, 1, -1)
+
+        left = x <= 0
+        right = ~left & (x + d >= self.width)
+        x[left] = 0
+        x[right] = self.width - d
+        speed_x[left | right] *= -1
+        top = y <= 0
+        bottom = ~top & (y + d >= self.height)
+        y[top] = 0
+        speed_y[top] *= -1
+        y[bottom] = self.height - d
+        self.ball_out |= bottom & self.ball_active
+
+    def _collect_rewards(self) -> None:
+        """ Removes caught and missed score objects, then scores them latest spawned first (like the game) """
+        x, y = self.reward_x, self.reward_y
+        paddle_x = self.paddle_x[:, None]
+        in_screen = y < self.height
+        caught = self.reward_active & in_screen & (x < paddle_x + self.paddle_w) & (x + self.reward_w > paddle_x) \
+            & (y < self.paddle_y + self.paddle_h) & (y + self.reward_h > self.paddle_y)
+        done = caught | (self.reward_active & ~in_screen)
+        if not done.any():
+            return
+        self.reward_active &= ~done
+
+        rows, slots = np.nonzero(done)
+        order = np.lexsort((-self.reward_seq[rows, slots], rows))
+        rows, slots = rows[order], slots[order]
+        first = np.r_[0, np.flatnonzero(np.diff(rows)) + 1]
+        rank = np.arange(len(rows)) - np.repeat(first, np.diff(np.r_[first, len(rows)]))
+        for k in range(int(rank.max()) + 1):                    # k-th event of every game at once (games are unique)
+            pick = rank == k
+            r, s = rows[pick], slots[pick]
+            hit = caught[r, s]
+            missed = r[~hit]
+            self.streak[missed] = 0
+            r, s = r[hit], s[hit]
+            if len(r) == 0:
+                continue
+            self.streak[r] += 1
+            added = self.P + (self.streak[r] - 1) * self.Q
+            self._apply_powerups(r, self.reward_powerup[r, s])
+            added = np.where(self.double_until[r] >= 0, added * 2, added)
+            self.score[r] += added
+
+    def _apply_powerups(self, rows: np.ndarray, codes: np.ndarray) -> None:
+        """ Applies the powerup of each caught score object (timed ones stack) """
+        self.lives[rows[codes == LIFE_UP]] += 1
+        self.paddle_speed[rows[codes == PADDLE_SPEED]] += 0.20
+        anti = rows[codes == ANTIGRAVITY]
+        self.ball_gravity[anti] = 0
+        until = self.antigravity_until[anti]
+        self.antigravity_until[anti] = np.where(until >= 0, until + self.g, self.clock[anti] + self.g)
+        double = rows[codes == DOUBLE_POINTS]
+        until = self.double_until[double]
+        self.double_until[double] = np.where(until >= 0, until + self.g, self.clock[double] + self.g)
+
+    def _drop_balls(self) -> np.ndarray:
+        """ Removes out of bounds balls (keeping the rest packed in order), returns the games that lost their last ball """
+        out = self.ball_out & self.ball_active
+        rows = np.flatnonzero(out.any(axis=1))
+        if len(rows) == 0:
+            return rows
+        keep = self.ball_active[rows] & ~out[rows]
+        dropped = rows[~keep.any(axis=1)]
+        rows, keep = rows[keep.any(axis=1)], keep[keep.any(axis=1)]
+        if len(rows):
+            order = np.argsort(~keep, axis=1, kind="stable")
+            for arr in (self.ball_x, self.ball_y, self.ball_speed_x, self.ball_speed_y, self.ball_gravity,
+                        self.ball_direction_x, self.ball_direction_y, self.ball_out):
+                arr[rows] = np.take_along_axis(arr[rows], order, axis=1)
+            self.ball_active[rows] = np.take_along_axis(keep, order, axis=1)
+        return dropped
+
+    def step(self, actions: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        """ Simulates one frame of every game (same order as BreakoutGame._update in RUNNING) """
+        score_before = self.score.copy()
+
+                                                                # moves the paddles towards the actions (Paddle.update)
+        target = np.asarray(actions, dtype=np.float64) - self.paddle_w / 2
+        delta = np.clip(target - self.paddle_x, -self.paddle_speed, self.paddle_speed)
+        self.paddle_x = np.clip(self.paddle_x + delta, 0, self.width - self.paddle_w)
+
+        self.clock += 1                                         # powerup time
+        self.frames += 1
+        self._move_balls()
+        self.reward_speed_y += self.gravity * self.reward_active
+        self.reward_y += self.reward_speed_y
+
+        for slot in range(self.max_balls):                      # one slot at a time, so a brick can't be hit twice
+            rows = np.flatnonzero(self.ball_active[:, slot])
+            if len(rows) == 0:
+                break                                           # balls are packed, later slots are empty too
+            self._collide_slot(slot, rows)
+        self._collect_rewards()
+
+                                                                # stage cleared once only indestructible bricks and no score objects are left
+        cleared = ~((self.brick_health != 0) & (self.brick_type != 4)).any(axis=1) & ~self.reward_active.any(axis=1)
+        cleared_rows = np.flatnonzero(cleared)
+        self._expire(cleared_rows)
+        won = cleared & (self.stage == len(self.stage_bricks) - 1)
+
+        dropped = self._drop_balls()
+        self.lives[dropped] -= 1
+        lost = np.zeros(self.n, dtype=np.bool_)
+        lost[dropped] = self.lives[dropped] <= 0
+
+                                                                # expires the powerups that are due
+        due = (self.antigravity_until >= 0) & (self.antigravity_until <= self.clock)
+        self.ball_gravity[due] = self.gravity
+        self.antigravity_until[due] = -1
+        self.double_until[(self.double_until >= 0) & (self.double_until <= self.clock)] = -1
+
+        truncated = np.zeros(self.n, dtype=np.bool_)
+        if self.max_frames is not None:
+            truncated = self.frames >= self.max_frames
+        dones = won | lost | truncated
+        rewards = (self.score - score_before).astype(np.float32)
+        info = {"won": won & ~lost, "truncated": truncated & ~won & ~lost, "final_score": np.where(dones, self.score, 0)}
+
+        next_stage = np.flatnonzero(cleared & ~dones)
+        if len(next_stage):
+            self.stage[next_stage] += 1
+            self.streak[next_stage] = 0
+            self._load_stage(next_stage)
+            self._reset_ball(next_stage)
+        relaunch = np.setdiff1d(dropped, np.concatenate((next_stage, np.flatnonzero(dones))), assume_unique=True)
+        if len(relaunch):
+            self._reset_ball(relaunch)
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            self._reset_games(finished)                         # auto-reset, the observation is of the new episode
+        return self._observe(), rewards, dones, info
+
+    def reset(self, seed: int | None = None) -> dict[str, np.ndarray]:
+        """ Starts a new episode in every game """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_games(np.arange(self.n))
+        return self._observe()
+
+# +++++++++++++++++++++++++++++++++ OBSERVATION METHODS +++++++++++++++++++++++++++++++++
+
+    def _observe(self) -> dict[str, np.ndarray]:
+        """ Writes the state of every game into the observation buffers """
+        obs = self.obs
+        fields = {
+            "paddle": (self.paddle_x, self.paddle_speed),
+            "balls": (self.ball_x, self.ball_y, self.ball_speed_x, self.ball_speed_y, self.ball_active),
+            "bricks": (self.brick_x, self.brick_y, self.brick_type, self.brick_health),
+            "rewards": (self.reward_x, self.reward_y, self.reward_speed_y, self.reward_powerup, self.reward_active),
+            "stats": (self.score, self.lives, self.stage + 1, self.streak),
+        }
+        for name, arrays in fields.items():
+            buffer = obs[name]
+            for i, arr in enumerate(arrays):
+                buffer[..., i] = arr                            # casts to float32 in place
+        return obs
+
+
+if __name__ == "__main__":
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Steps a batch of games with a ball-following policy and reports the throughput.")
+    parser.add_argument("--envs", type=int, default=1024, help="no. of games stepped together")
+    parser.add_argument("--steps", type=int, default=2000, help="no. of batched steps")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random number generator")
+    parser.add_argument("--stages", default=STAGES_PATH, help="stages JSON file or compiled level pack")
+    args = parser.parse_args()
+
+    env = BreakoutVecEnv(args.envs, seed=args.seed, stages_path=args.stages)
+    obs = env.reset()
+    episodes = wins = 0
+    start = perf_counter()
+    for _ in range(args.steps):
+        balls = obs["balls"]                                    # follows the lowest ball in play
+        lowest = np.argmax(np.where(balls[..., 4] > 0, balls[..., 1], -np.inf), axis=1)
+        actions = balls[np.arange(args.envs), lowest, 0] + env.r
+        obs, rewards, dones, info = env.step(actions)
+        episodes += int(dones.sum())
+        wins += int(info["won"].sum())
+    elapsed = perf_counter() - start
+
+    steps = args.envs * args.steps
+    print(f"{steps} env-steps in {elapsed:.2f}s ({steps / elapsed:,.0f} env-steps/s)")
+    print(f"episodes finished {episodes}, won {wins}, mean score {env.score.mean():.0f}")